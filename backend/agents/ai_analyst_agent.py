@@ -1,10 +1,12 @@
 import json
-from datetime import datetime, timedelta
+from datetime import timedelta
 from core.schemas import TradingState, GPTInsight
 from model.model import model
 from utils.logger import log_info, log_error
 from state.shared_state import SharedState  # 🧠 Persistent caching and memory
 
+INSIGHT_CACHE_TTL = timedelta(hours=3)
+
 
 def ai_analyst_agent(state: TradingState) -> TradingState:
     """
@@ -27,20 +29,18 @@ def ai_analyst_agent(state: TradingState) -> TradingState:
         raise ValueError("[AIAnalystAgent] Missing required fields: price_data or raw_news.")
 
     symbol = (state.symbol or "").upper().strip()
-    memory = SharedState()
+    memory = SharedState.get_instance()
 
     # ============================================================
     # 1️⃣ — Use Cached Insights (if within 3 hours)
     # ============================================================
     cache_key = f"insight:{symbol}"
-    cached = memory.get(cache_key)
+    cached = memory.cache_get(cache_key)
     if cached:
         try:
-            last_updated = datetime.fromisoformat(cached.get("timestamp"))
-            if datetime.utcnow() - last_updated < timedelta(hours=3):
-                log_info(f"[AIAnalystAgent] Using cached Gemini insight for {symbol}.")
-                state.gpt_insight = GPTInsight(**cached.get("data"))
-                return state
+            log_info(f"[AIAnalystAgent] Using cached Gemini insight for {symbol}.")
+            state.gpt_insight = GPTInsight(**cached)
+            return state
         except Exception as e:
             log_error(f"[AIAnalystAgent] Cache read error: {e}")
 
@@ -109,10 +109,7 @@ Respond ONLY in strict JSON format:
         log_info(f"[AIAnalystAgent] ✅ Gemini insight successfully parsed for {symbol}.")
 
         # --- Save to Persistent Memory ---
-        memory.set(cache_key, {
-            "timestamp": datetime.utcnow().isoformat(),
-            "data": insight.dict(),
-        })
+        memory.cache_set(cache_key, insight.dict(), ttl=INSIGHT_CACHE_TTL)
 
         return state
 
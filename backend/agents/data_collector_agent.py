@@ -1,9 +1,12 @@
-from core.schemas import TradingState
+from core.schemas import TradingState, NewsArticle
+from core.price_series import PriceSeries
 from nodes.news_analyst_node import news_analyst_node
 from nodes.price_analyst_node import price_analyst_node
 from state.shared_state import SharedState
 from utils.logger import log_info, log_error
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+DATA_CACHE_TTL = timedelta(hours=2)
 
 
 def data_collector_agent(state: TradingState) -> TradingState:
@@ -30,22 +33,20 @@ def data_collector_agent(state: TradingState) -> TradingState:
         state.raw_news, state.price_data = [], None
         return state
 
-    memory = SharedState()
+    memory = SharedState.get_instance()
 
     # ============================================================
     # 1️⃣ — Try Cached Data (valid for 2 hours)
     # ============================================================
     cache_key = f"data:{symbol}"
-    cached = memory.get(cache_key)
+    cached = memory.cache_get(cache_key)
     if cached:
         try:
-            last_updated = datetime.fromisoformat(cached.get("timestamp"))
-            if datetime.utcnow() - last_updated < timedelta(hours=2):
-                log_info(f"[DataCollectorAgent] Using cached data for {symbol}.")
-                cached_data = cached.get("data", {})
-                state.raw_news = cached_data.get("raw_news", [])
-                state.price_data = cached_data.get("price_data")
-                return state
+            log_info(f"[DataCollectorAgent] Using cached data for {symbol}.")
+            state.raw_news = [NewsArticle(**n) for n in cached.get("raw_news", [])]
+            price_data = cached.get("price_data")
+            state.price_data = PriceSeries.coerce(price_data) if price_data is not None else None
+            return state
         except Exception as e:
             log_error(f"[DataCollectorAgent] Cache read failed: {e}")
 
@@ -73,13 +74,13 @@ def data_collector_agent(state: TradingState) -> TradingState:
     # 4️⃣ — Cache Combined Result
     # ============================================================
     try:
-        memory.set(cache_key, {
-            "timestamp": datetime.utcnow().isoformat(),
-            "data": {
-                "raw_news": [n.dict() if hasattr(n, "dict") else n for n in (state.raw_news or [])],
-                "price_data": state.price_data,
-            },
-        })
+        memory.cache_set(cache_key, {
+            "raw_news": [n.dict() if hasattr(n, "dict") else n for n in (state.raw_news or [])],
+            "price_data": (
+                PriceSeries.coerce(state.price_data).to_payload()
+                if state.price_data is not None else None
+            ),
+        }, ttl=DATA_CACHE_TTL)
         log_info(f"[DataCollectorAgent] ✅ Cached fresh data for {symbol}.")
     except Exception as e:
         log_error(f"[DataCollectorAgent] Cache write failed: {e}")
@@ -35,14 +35,14 @@ def trading_agent(state: TradingState) -> TradingState:
         state.user_response = "⚠️ No valid symbol available for trading."
         return state
 
-    memory = SharedState()
+    memory = SharedState.get_instance()
     log_info(f"[TradingAgent] 🚀 Starting global trade cycle for {symbol}.")
 
     # -----------------------------------------------------------
     # 2️⃣ Load last known state from memory (if any)
     # -----------------------------------------------------------
     try:
-        last_state = memory.get(f"trade:{symbol}")
+        last_state = memory.get_global(f"trade:{symbol}")
         if last_state:
             log_info(f"[TradingAgent] 🔁 Found previous trade state for {symbol}.")
             state.last_trade = last_state.get("executed_trade")
@@ -82,7 +82,7 @@ def trading_agent(state: TradingState) -> TradingState:
     # 5️⃣ Persist trade details
     # -----------------------------------------------------------
     try:
-        memory.set(f"trade:{symbol}", {
+        memory.set_global(f"trade:{symbol}", {
             "timestamp": datetime.utcnow().isoformat(),
             "executed_trade": state.executed_trade.dict() if state.executed_trade else None,
             "trade_signal": state.trade_signal.dict() if state.trade_signal else None
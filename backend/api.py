@@ -1,12 +1,23 @@
 import uuid
 from datetime import datetime, timezone
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect, Request
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from graphs.dual_pipeline import build_dual_pipeline
-from core.schemas import TradingState
+from core.schemas import ScanMatch, TradingState
+from utils.analysis_cache import analysis_cache_stats
+from utils.bar_store import bar_store_stats
+from utils.benchmark import benchmark_stats
+from utils.http_client import close_sessions, http_stats
+from utils.async_http import aclose_async_client
+from utils.indicator_state import indicator_state_stats
+from utils.quota import flush as flush_quota_counters, quota_snapshot
+from utils.rate_limiter import budget_snapshot
+from utils.scanner import CONDITIONS, scan
+from utils.single_flight import single_flight_stats
 
 # --- App ---
 app = FastAPI(
@@ -31,6 +42,14 @@ app.add_middleware(
 pipeline = build_dual_pipeline()
 
 
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Release pooled provider connections and persist quota counters."""
+    close_sessions()
+    flush_quota_counters()
+    await aclose_async_client()
+
+
 # --- Error Handling Middleware ---
 @app.middleware("http")
 async def add_error_handling(request: Request, call_next):
@@ -64,7 +83,7 @@ async def chat_endpoint(request: ChatRequest):
         timestamp=datetime.now(timezone.utc),
     )
 
-    raw = pipeline.invoke(initial_state)
+    raw = await run_in_threadpool(pipeline.invoke, initial_state)
     final_state = TradingState(**raw)
 
     return ChatResponse(response=final_state.user_response or "")
@@ -91,7 +110,7 @@ async def websocket_chat(websocket: WebSocket):
                 timestamp=datetime.now(timezone.utc),
             )
 
-            raw = pipeline.invoke(initial_state)
+            raw = await run_in_threadpool(pipeline.invoke, initial_state)
             final_state = TradingState(**raw)
 
             # --- Stream response ---
@@ -111,7 +130,57 @@ async def websocket_chat(websocket: WebSocket):
         await websocket.close()
 
 
+# --- Technical Scan ---
+class ScanResponse(BaseModel):
+    conditions: list[str]
+    matches: list[ScanMatch]
+
+
+@app.get("/scan", response_model=ScanResponse)
+async def technical_scan(conditions: str = "oversold", symbols: str | None = None,
+                         limit: int = Query(20, ge=1, le=200)):
+    """
+    Rank the scan universe (or `symbols`, comma-separated) by technical
+    conditions, e.g. /scan?conditions=oversold,macd_bullish&limit=10.
+    Available conditions are listed by GET /scan/conditions.
+    """
+    names = [c.strip().lower() for c in conditions.split(",") if c.strip()]
+    tickers = [s.strip().upper() for s in symbols.split(",") if s.strip()] if symbols else None
+    try:
+        matches = await run_in_threadpool(scan, names, tickers, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ScanResponse(conditions=names, matches=matches)
+
+
+@app.get("/scan/conditions")
+async def scan_conditions():
+    return {name: description for name, (description, _) in CONDITIONS.items()}
+
+
 # --- Health Check ---
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+# --- Provider Budgets / Connection Stats ---
+@app.get("/metrics/providers")
+async def provider_metrics():
+    return {
+        "rate_budgets": budget_snapshot(),
+        "daily_quotas": quota_snapshot(),
+        "http": http_stats(),
+        "single_flight": single_flight_stats(),
+    }
+
+
+# --- Market Data / Analysis Cache Stats ---
+@app.get("/metrics/caches")
+async def cache_metrics():
+    return {
+        "bar_store": bar_store_stats(),
+        "indicator_state": indicator_state_stats(),
+        "technical_analysis": analysis_cache_stats(),
+        "benchmarks": benchmark_stats(),
+    }
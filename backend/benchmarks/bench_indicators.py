@@ -0,0 +1,83 @@
+"""
+📊 Technical indicators: per-symbol pandas vs. the vectorized engine.
+
+Builds a (symbols × bars) matrix of random-walk closes and computes
+RSI(14), MACD(12/26/9), Bollinger(20) and the 50/200-day moving
+averages, once symbol by symbol with the pandas calculations
+technical_analysis_node used, and once with `compute_indicators`.
+
+Run from the backend directory:
+    python -B -m benchmarks.bench_indicators [--symbols 500] [--bars 252]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import compute_indicators
+
+
+def _closes(symbols: int, bars: int) -> np.ndarray:
+    rng = np.random.default_rng(42)
+    returns = rng.normal(0.0003, 0.02, size=(symbols, bars))
+    return 100.0 * np.exp(np.cumsum(returns, axis=1))
+
+
+def _pandas_one(close: pd.Series) -> dict:
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14).mean()
+    loss = -delta.clip(upper=0).rolling(14).mean()
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    sma = close.rolling(20).mean()
+    std = close.rolling(20).std()
+    return {
+        "rsi": float((100 - 100 / (1 + gain / loss)).iloc[-1]),
+        "macd": float(macd.iloc[-1]),
+        "macd_signal": float(signal.iloc[-1]),
+        "bb_upper": float((sma + 2 * std).iloc[-1]),
+        "bb_lower": float((sma - 2 * std).iloc[-1]),
+        "ma_50": float(close.rolling(50).mean().iloc[-1]),
+        "ma_200": float(close.rolling(200).mean().iloc[-1]),
+    }
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=252)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    matrix = _closes(args.symbols, args.bars)
+    series = [pd.Series(row) for row in matrix]
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+
+    baseline = [_pandas_one(s) for s in series]
+    table = compute_indicators(matrix, symbols)
+    worst = max(
+        abs(ref[k] - table[k][i]) for i, ref in enumerate(baseline) for k in ref
+    )
+
+    t_pandas = _best(lambda: [_pandas_one(s) for s in series], args.repeat)
+    t_engine = _best(lambda: compute_indicators(matrix, symbols), args.repeat)
+
+    print(f"{args.symbols} symbols × {args.bars} bars (max abs diff vs pandas: {worst:.2e})\n")
+    print(f"{'method':>18} {'time (ms)':>10} {'symbols/s':>12}")
+    for name, seconds in (("pandas per symbol", t_pandas), ("vectorized engine", t_engine)):
+        print(f"{name:>18} {seconds * 1000:>10.1f} {args.symbols / seconds:>12,.0f}")
+    print(f"\nspeed-up: {t_pandas / t_engine:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+📆 OHLCV resampling: per-symbol pandas vs. the vectorized engine.
+
+Builds random daily bars for a universe and derives weekly and
+monthly OHLCV, once symbol by symbol with `DataFrame.resample`
+and once with `resample_many` over all symbols together.
+
+Run from the backend directory:
+    python -B -m benchmarks.bench_resample [--symbols 500] [--bars 504]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.bar_store import frame_to_bars
+from utils.resample import resample_many
+
+_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+_PANDAS_RULES = {"1wk": "W-MON", "1mo": "MS"}
+
+
+def _frames(symbols: int, bars: int) -> dict:
+    rng = np.random.default_rng(42)
+    index = pd.bdate_range("2024-01-01", periods=bars, tz="America/New_York")
+    frames = {}
+    for i in range(symbols):
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, bars)))
+        frames[f"SYM{i}"] = pd.DataFrame({
+            "Open": close * (1 + rng.normal(0, 0.005, bars)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(1_000, 1_000_000, bars).astype(float),
+        }, index=index)
+    return frames
+
+
+def _pandas(frames: dict, rule: str) -> dict:
+    return {
+        s: f.resample(_PANDAS_RULES[rule], label="left", closed="left").agg(_AGG).dropna()
+        for s, f in frames.items()
+    }
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=504)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = _frames(args.symbols, args.bars)
+    bars = {s: frame_to_bars(f) for s, f in frames.items()}
+
+    print(f"{args.symbols} symbols × {args.bars} daily bars\n")
+    print(f"{'rule':>5} {'method':>18} {'time (ms)':>10} {'symbols/s':>12}")
+    for rule in ("1wk", "1mo"):
+        reference, engine = _pandas(frames, rule), resample_many(bars, rule)
+        for s in frames:
+            ref, got = reference[s], engine[s]
+            assert len(ref) == len(got) and np.allclose(ref["Close"], got["close"]), s
+
+        t_pandas = _best(lambda: _pandas(frames, rule), args.repeat)
+        t_engine = _best(lambda: resample_many(bars, rule), args.repeat)
+        for name, seconds in (("pandas per symbol", t_pandas), ("vectorized engine", t_engine)):
+            print(f"{rule:>5} {name:>18} {seconds * 1000:>10.1f} {args.symbols / seconds:>12,.0f}")
+        print(f"{'':>5} speed-up: {t_pandas / t_engine:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+⚖️ Risk metrics: per-symbol `statistics` loops vs. the vectorized engine.
+
+Builds a (symbols × bars) matrix of random-walk closes and computes
+volatility and Sharpe ratio the way risk_analysis_node used to (a
+returns list comprehension plus `statistics.stdev` / `mean` for each
+metric), then the full metric set of `compute_risk` (adding Sortino,
+drawdown, historical and parametric VaR / CVaR) for all symbols at once.
+
+Run from the backend directory:
+    python -B -m benchmarks.bench_risk [--symbols 500] [--bars 252]
+"""
+import argparse
+import math
+import time
+from statistics import mean, stdev
+
+import numpy as np
+
+from utils.risk import compute_risk
+
+
+def _closes(symbols: int, bars: int) -> np.ndarray:
+    rng = np.random.default_rng(42)
+    returns = rng.normal(0.0003, 0.02, size=(symbols, bars))
+    return 100.0 * np.exp(np.cumsum(returns, axis=1))
+
+
+def _legacy_one(prices: list) -> tuple:
+    returns = [(prices[i + 1] - prices[i]) / prices[i] for i in range(len(prices) - 1) if prices[i] > 0]
+    volatility = stdev(returns) * math.sqrt(252)
+    returns = [(prices[i + 1] - prices[i]) / prices[i] for i in range(len(prices) - 1) if prices[i] > 0]
+    excess = [r - (0.03 / 252) for r in returns]
+    sharpe = mean(excess) / stdev(returns) * math.sqrt(252)
+    return volatility, sharpe
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=252)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    matrix = _closes(args.symbols, args.bars)
+    lists = [row.tolist() for row in matrix]
+
+    t_legacy = _best(lambda: [_legacy_one(p) for p in lists], args.repeat)
+    t_engine = _best(lambda: compute_risk(matrix), args.repeat)
+
+    print(f"{args.symbols} symbols × {args.bars} bars\n")
+    print(f"{'method':>30} {'time (ms)':>10} {'symbols/s':>12}")
+    for name, seconds in (("statistics (vol + Sharpe only)", t_legacy), ("vectorized engine (all)", t_engine)):
+        print(f"{name:>30} {seconds * 1000:>10.1f} {args.symbols / seconds:>12,.0f}")
+    print(f"\nspeed-up: {t_legacy / t_engine:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
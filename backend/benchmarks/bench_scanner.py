@@ -0,0 +1,70 @@
+"""
+📡 Universe-wide technical scan over locally stored bars.
+
+Writes a year and a bit of random daily bars per symbol into a
+temporary bar store, then times `scan()` end to end: freshness
+check of every stored file, loading the closes, the vectorized
+indicator pass, condition masks and ranking.
+
+Run from the backend directory:
+    python -B -m benchmarks.bench_scanner [--symbols 1000] [--bars 300]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+_STORE = tempfile.mkdtemp(prefix="bench_bars_")
+os.environ["BAR_STORE_DIR"] = _STORE
+
+from utils.bar_store import BAR_DTYPE, bar_store  # noqa: E402
+from utils.scanner import scan  # noqa: E402
+
+DAY_NS = 86_400 * 10 ** 9
+
+
+def _populate(symbols: int, bars: int) -> list:
+    rng = np.random.default_rng(42)
+    start = (time.time_ns() // DAY_NS - bars) * DAY_NS
+    names = []
+    for i in range(symbols):
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, bars)))
+        data = np.zeros(bars, dtype=BAR_DTYPE)
+        data["ts"] = start + np.arange(bars) * DAY_NS
+        data["open"], data["high"], data["low"], data["close"] = close, close * 1.01, close * 0.99, close
+        data["volume"] = 1e6
+        name = f"SYM{i}"
+        bar_store._write(bar_store._path(name, "1d"), data, {"covered_from": 0, "refreshed_at": time.time()})
+        names.append(name)
+    return names
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--bars", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    symbols = _populate(args.symbols, args.bars)
+    print(f"{args.symbols} symbols × {args.bars} stored daily bars ({_STORE})\n")
+    print(f"{'conditions':>28} {'matches':>8} {'time (ms)':>10}")
+    for conditions in (["oversold"], ["macd_bullish", "golden_cross"], ["below_lower_band", "oversold"]):
+        matches = scan(conditions, symbols, limit=0)
+        seconds = _best(lambda: scan(conditions, symbols, limit=20), args.repeat)
+        print(f"{'+'.join(conditions):>28} {len(matches):>8} {seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
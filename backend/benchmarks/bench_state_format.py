@@ -0,0 +1,84 @@
+"""
+📊 memory.json encoding: legacy indented JSON vs. versioned compact formats.
+
+Seeds a state document holding cached price data for N symbols (the
+shape data_collector_agent caches under "data:<symbol>") and times
+save / load for every format available in this environment.
+
+Run from the backend directory:
+    python -B -m benchmarks.bench_state_format [--symbols 1000] [--bars 250]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from core.schemas import PricePoint
+from state.serialization import available_formats
+from state.shared_state import SharedState
+
+
+def _document(symbols: int, bars: int) -> dict:
+    start = datetime(2024, 1, 2)
+    cache = {}
+    for s in range(symbols):
+        price_data = [
+            PricePoint(
+                timestamp=start + timedelta(days=i),
+                open=100.0 + i, high=101.5 + i, low=99.25 + i, close=100.75 + i,
+                volume=1_000_000 + i,
+            ).model_dump()
+            for i in range(bars)
+        ]
+        cache[f"data:SYM{s}"] = {
+            "value": {"raw_news": [], "price_data": price_data},
+            "expires_at": time.time() + 7200,
+        }
+    return {"sessions": {}, "global_context": {}, "cache": cache, "last_updated": None}
+
+
+def _measure(doc: dict, fmt: str, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_file = os.path.join(tmp, "memory.json")
+        state = SharedState(memory_file=memory_file, backend="json", state_format=fmt)
+
+        save = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            state._save_to_disk_raw(doc)
+            save.append(time.perf_counter() - started)
+
+        load = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            state._load_from_disk_raw()
+            load.append(time.perf_counter() - started)
+
+        return min(save), min(load), os.path.getsize(memory_file)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--bars", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    doc = _document(args.symbols, args.bars)
+    print(f"{args.symbols} symbols × {args.bars} bars of cached price data\n")
+    print(f"{'format':>14} {'save (s)':>10} {'load (s)':>10} {'size (MB)':>10}")
+
+    baseline = None
+    for fmt in reversed(available_formats()):  # legacy json first
+        save, load, size = _measure(doc, fmt, args.repeat)
+        baseline = baseline or (save, load, size)
+        print(
+            f"{fmt:>14} {save:>10.3f} {load:>10.3f} {size / 1e6:>10.1f}"
+            f"   ({baseline[0] / save:.1f}x save, {baseline[1] / load:.1f}x load, "
+            f"{size / baseline[2]:.0%} size)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+📊 SharedState write throughput: full-snapshot rewrites vs. record backends.
+
+Run from the backend directory:
+    python -B -m benchmarks.bench_state_journal [--sessions 10000]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from core.schemas import TradingState
+from state.shared_state import SharedState
+
+
+def _seed_snapshot(path: str, sessions: int):
+    """Write a memory.json holding `sessions` default user sessions."""
+    blank = TradingState(symbol="").model_dump()
+    doc = {
+        "sessions": {f"user_{i}": dict(blank, symbol=f"SYM{i % 500}") for i in range(sessions)},
+        "global_context": {},
+        "last_updated": None,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, default=str)
+
+
+def _measure(memory_file: str, backend: str, writes: int) -> float:
+    state = SharedState(memory_file=memory_file, backend=backend)
+    started = time.perf_counter()
+    for i in range(writes):
+        state.set_global(f"news:SYM{i % 50}", {"timestamp": time.time(), "articles": []})
+    state._save_to_disk()  # journal: final group commit
+    elapsed = time.perf_counter() - started
+    return writes / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--legacy-writes", type=int, default=20)
+    parser.add_argument("--record-writes", type=int, default=5_000)
+    args = parser.parse_args()
+
+    results = {}
+    for backend, writes in (
+        ("json", args.legacy_writes),
+        ("journal", args.record_writes),
+        ("sqlite", args.record_writes),
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            memory_file = os.path.join(tmp, "memory.json")
+            _seed_snapshot(memory_file, args.sessions)
+            results[backend] = _measure(memory_file, backend=backend, writes=writes)
+
+    print(f"sessions={args.sessions}")
+    for backend, rate in results.items():
+        print(f"{backend:<8}: {rate:10.1f} writes/sec  ({rate / results['json']:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
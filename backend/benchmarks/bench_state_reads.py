@@ -0,0 +1,71 @@
+"""
+📊 Per-request SharedState disk reads: one SharedState() per agent call
+(the old pattern) vs. the shared in-process instance on a warm cache.
+
+Run from the backend directory:
+    python -B -m benchmarks.bench_state_reads [--sessions 200] [--requests 200]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from core.schemas import TradingState
+from state.shared_state import SharedState
+
+# Cache keys one trading request touches (data collector → news → AI analyst → trading agent)
+REQUEST_KEYS = ("data:AAPL", "news:AAPL", "insight:AAPL", "trade:AAPL")
+
+
+def _seed(memory_file: str, backend: str, sessions: int) -> SharedState:
+    state = SharedState(memory_file=memory_file, backend=backend)
+    for i in range(sessions):
+        state.update_user_state(f"user_{i}", "symbol", f"SYM{i}")
+    for key in REQUEST_KEYS:
+        state.cache_set(key, {"payload": "x" * 512}, ttl=3600)
+    state._save_to_disk()
+    return state
+
+
+def _per_call_instances(memory_file: str, backend: str, requests: int):
+    reads = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        for key in REQUEST_KEYS:
+            memory = SharedState(memory_file=memory_file, backend=backend)
+            memory.cache_get(key)
+            reads += memory.io_stats()["disk_reads"]
+    return reads / requests, (time.perf_counter() - started) / requests
+
+
+def _shared_instance(state: SharedState, requests: int):
+    before = state.io_stats()["disk_reads"]
+    started = time.perf_counter()
+    for _ in range(requests):
+        for key in REQUEST_KEYS:
+            state.cache_get(key)
+    elapsed = time.perf_counter() - started
+    return (state.io_stats()["disk_reads"] - before) / requests, elapsed / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--backend", default="json", choices=["json", "journal", "sqlite"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_file = os.path.join(tmp, "memory.json")
+        warm = _seed(memory_file, args.backend, args.sessions)
+
+        old_reads, old_latency = _per_call_instances(memory_file, args.backend, max(1, args.requests // 10))
+        new_reads, new_latency = _shared_instance(warm, args.requests)
+
+    print(f"backend={args.backend} sessions={args.sessions}")
+    print(f"SharedState() per call : {old_reads:5.1f} disk reads/request  {old_latency * 1e3:9.3f} ms/request")
+    print(f"shared instance (warm) : {new_reads:5.1f} disk reads/request  {new_latency * 1e3:9.3f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
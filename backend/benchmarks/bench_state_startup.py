@@ -0,0 +1,79 @@
+"""
+📊 SharedState startup time vs. number of stored sessions.
+
+Run from the backend directory:
+    python -B -m benchmarks.bench_state_startup [--counts 100 10000 100000]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from core.price_series import PriceSeries
+from core.schemas import TradingState
+from state.shared_state import SharedState
+
+
+def _seed(memory_file: str, sessions: int):
+    blank = TradingState(symbol="").model_dump()
+    doc = {
+        "sessions": {f"user_{i}": dict(blank, symbol=f"SYM{i % 500}") for i in range(sessions)},
+        "global_context": {},
+        "last_updated": None,
+    }
+    with open(memory_file, "w", encoding="utf-8") as f:
+        json.dump(doc, f, default=str)
+
+
+def _startup(memory_file: str, backend: str) -> float:
+    started = time.perf_counter()
+    state = SharedState(memory_file=memory_file, backend=backend)
+    elapsed = time.perf_counter() - started
+    state.get_user_state("user_0")  # first touch hydrates a single session
+    return elapsed
+
+
+def _check_eviction_roundtrip(backend: str):
+    """An evicted session must survive save → reload unchanged (price data included)."""
+    frame = pd.DataFrame(
+        {"Open": [1.0, 2.0], "High": [1.5, 2.5], "Low": [0.5, 1.5], "Close": [1.25, 2.25], "Volume": [10, 20]},
+        index=pd.date_range("2024-01-02", periods=2, tz="UTC"),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_file = os.path.join(tmp, "memory.json")
+        state = SharedState(memory_file=memory_file, backend=backend)
+        state.update_user_state("user_0", "symbol", "AAPL")
+        state.update_user_state("user_0", "price_data", PriceSeries.from_frame(frame))
+        state.evict_idle_sessions(max_idle=0)
+        state._save_to_disk()
+        reloaded = SharedState(memory_file=memory_file, backend=backend).get_user_state("user_0")
+        assert reloaded.symbol == "AAPL", backend
+        assert reloaded.price_data is not None and reloaded.price_data.last_close == 2.25, backend
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 10_000, 100_000])
+    args = parser.parse_args()
+
+    for backend in ("json", "journal", "sqlite"):
+        _check_eviction_roundtrip(backend)
+
+    print(f"{'sessions':>10} {'json':>10} {'journal':>10} {'sqlite':>10}   (seconds)")
+    for count in args.counts:
+        timings = []
+        for backend in ("json", "journal", "sqlite"):
+            with tempfile.TemporaryDirectory() as tmp:
+                memory_file = os.path.join(tmp, "memory.json")
+                _seed(memory_file, count)
+                if backend == "sqlite":
+                    SharedState(memory_file=memory_file, backend=backend)  # one-time migration
+                timings.append(_startup(memory_file, backend))
+        print(f"{count:>10} " + " ".join(f"{t:>10.4f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
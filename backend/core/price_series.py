@@ -0,0 +1,211 @@
+import base64
+import struct
+from datetime import datetime, timezone
+from typing import Any, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from pydantic_core import core_schema
+
+MAGIC = b"PSER"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBI")  # magic, version, bar count
+PAYLOAD_FORMAT = "price_series/v1"
+
+FIELDS = ("open", "high", "low", "close")
+
+
+class PriceSeries:
+    """
+    📈 Columnar OHLCV Series
+    ------------------------------------------------------------
+    Stores bars as parallel NumPy arrays (int64 UTC-ns timestamps,
+    float64 prices, int64 volume) instead of one `PricePoint` per
+    row. Built straight from a DataFrame, O(1) access to the last
+    bar, and a compact binary encoding for SharedState.
+
+    Indexing / iteration still yield `PricePoint` objects, so code
+    written for `List[PricePoint]` (e.g. `price_data[-1].close`)
+    keeps working.
+    """
+
+    __slots__ = ("timestamps", "open", "high", "low", "close", "volume")
+
+    def __init__(self, timestamps, open, high, low, close, volume):
+        self.timestamps = np.ascontiguousarray(timestamps, dtype="<i8")
+        self.open = np.ascontiguousarray(open, dtype="<f8")
+        self.high = np.ascontiguousarray(high, dtype="<f8")
+        self.low = np.ascontiguousarray(low, dtype="<f8")
+        self.close = np.ascontiguousarray(close, dtype="<f8")
+        self.volume = np.ascontiguousarray(volume, dtype="<i8")
+        n = len(self.timestamps)
+        if any(len(getattr(self, f)) != n for f in (*FIELDS, "volume")):
+            raise ValueError("PriceSeries columns must have equal length")
+
+    # --------------------------------------------------------
+    # Constructors
+    # --------------------------------------------------------
+    @classmethod
+    def empty(cls) -> "PriceSeries":
+        return cls(*(np.empty(0),) * 6)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "PriceSeries":
+        """OHLCV DataFrame (yfinance column names, DatetimeIndex) → series, no per-row objects."""
+        if df is None or df.empty:
+            return cls.empty()
+        index = pd.DatetimeIndex(df.index)
+        index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+        return cls(
+            index.as_unit("ns").asi8,
+            df["Open"].to_numpy(dtype="f8"),
+            df["High"].to_numpy(dtype="f8"),
+            df["Low"].to_numpy(dtype="f8"),
+            df["Close"].to_numpy(dtype="f8"),
+            np.nan_to_num(df["Volume"].to_numpy(dtype="f8")).astype("i8"),
+        )
+
+    @classmethod
+    def from_points(cls, points: List[Any]) -> "PriceSeries":
+        """Legacy `List[PricePoint]` (models or dicts) → series."""
+        if not points:
+            return cls.empty()
+        rows = [p if isinstance(p, dict) else p.model_dump() for p in points]
+        stamps = pd.DatetimeIndex(pd.to_datetime([r["timestamp"] for r in rows], utc=True))
+        return cls(
+            stamps.as_unit("ns").asi8,
+            *([float(r[f]) for r in rows] for f in FIELDS),
+            [int(r["volume"]) for r in rows],
+        )
+
+    # --------------------------------------------------------
+    # Binary encoding
+    # --------------------------------------------------------
+    def to_bytes(self) -> bytes:
+        """Header + raw little-endian columns (48 bytes per bar)."""
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(self))]
+        parts += [getattr(self, f).tobytes() for f in ("timestamps", *FIELDS, "volume")]
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "PriceSeries":
+        magic, version, n = _HEADER.unpack_from(blob)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a PriceSeries v{FORMAT_VERSION} blob")
+        offset, columns = _HEADER.size, []
+        for dtype in ("<i8", "<f8", "<f8", "<f8", "<f8", "<i8"):
+            columns.append(np.frombuffer(blob, dtype=dtype, count=n, offset=offset))
+            offset += 8 * n
+        return cls(*columns)
+
+    def to_payload(self) -> dict:
+        """JSON-safe form (base64 of `to_bytes`)."""
+        return {"format": PAYLOAD_FORMAT, "data": base64.b64encode(self.to_bytes()).decode("ascii")}
+
+    @classmethod
+    def coerce(cls, value: Any) -> "PriceSeries":
+        """Accept a series, its bytes / payload, a DataFrame or a legacy list of points."""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(bytes(value))
+        if isinstance(value, dict) and value.get("format") == PAYLOAD_FORMAT:
+            return cls.from_bytes(base64.b64decode(value["data"]))
+        if isinstance(value, pd.DataFrame):
+            return cls.from_frame(value)
+        if isinstance(value, (list, tuple)):
+            return cls.from_points(list(value))
+        raise TypeError(f"Cannot build PriceSeries from {type(value).__name__}")
+
+    # --------------------------------------------------------
+    # Views
+    # --------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _point(self, i: int):
+        from core.schemas import PricePoint
+        return PricePoint(
+            timestamp=datetime.fromtimestamp(int(self.timestamps[i]) / 1e9, tz=timezone.utc),
+            open=float(self.open[i]),
+            high=float(self.high[i]),
+            low=float(self.low[i]),
+            close=float(self.close[i]),
+            volume=int(self.volume[i]),
+        )
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            return PriceSeries(*(getattr(self, f)[key] for f in ("timestamps", *FIELDS, "volume")))
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("PriceSeries index out of range")
+        return self._point(key)
+
+    def __iter__(self) -> Iterator:
+        return (self._point(i) for i in range(len(self)))
+
+    @property
+    def last(self):
+        """Most recent bar as a PricePoint (None when empty)."""
+        return self._point(len(self) - 1) if len(self) else None
+
+    @property
+    def last_close(self) -> Optional[float]:
+        return float(self.close[-1]) if len(self) else None
+
+    def to_frame(self) -> pd.DataFrame:
+        index = pd.DatetimeIndex(pd.to_datetime(self.timestamps, unit="ns", utc=True), name="Date")
+        return pd.DataFrame({
+            "Open": self.open, "High": self.high, "Low": self.low,
+            "Close": self.close, "Volume": self.volume,
+        }, index=index)
+
+    def to_points(self) -> list:
+        """Materialize the legacy `List[PricePoint]` (only for code that needs real objects)."""
+        return list(self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PriceSeries):
+            return NotImplemented
+        return (
+            np.array_equal(self.timestamps, other.timestamps)
+            and np.array_equal(self.volume, other.volume)
+            and all(np.array_equal(getattr(self, f), getattr(other, f), equal_nan=True) for f in FIELDS)
+        )
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "PriceSeries(empty)"
+        first = pd.Timestamp(int(self.timestamps[0]), unit="ns", tz="UTC")
+        last = pd.Timestamp(int(self.timestamps[-1]), unit="ns", tz="UTC")
+        return f"PriceSeries({len(self)} bars {first:%Y-%m-%d %H:%M} → {last:%Y-%m-%d %H:%M}, last close {self.close[-1]:.2f})"
+
+    def __str__(self) -> str:
+        """Compact CSV (prompt-friendly; callers truncate from the end)."""
+        lines = ["timestamp,open,high,low,close,volume"]
+        stamps = pd.to_datetime(self.timestamps, unit="ns", utc=True).strftime("%Y-%m-%d %H:%M")
+        for row in zip(stamps, self.open, self.high, self.low, self.close, self.volume):
+            lines.append(f"{row[0]},{row[1]:.2f},{row[2]:.2f},{row[3]:.2f},{row[4]:.2f},{row[5]}")
+        return "\n".join(lines)
+
+    # --------------------------------------------------------
+    # Pydantic integration (field type in TradingState)
+    # --------------------------------------------------------
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.coerce,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda v: v.to_payload(), when_used="json"
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return {
+            "type": "object",
+            "properties": {"format": {"type": "string"}, "data": {"type": "string", "format": "base64"}},
+        }
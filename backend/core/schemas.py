@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Literal
 from datetime import datetime
 
+from core.price_series import PriceSeries
+
 # ============================================================
 # 1. News Article Schema
 # ============================================================
@@ -153,14 +155,52 @@ class TechnicalAnalysis(BaseModel):
     reasoning: Optional[str] = None
 
 
+class ScanMatch(BaseModel):
+    """One symbol matching a universe-wide technical scan (ranked by score)."""
+    symbol: str
+    score: float
+    conditions: List[str] = []
+    price: Optional[float] = None
+    rsi: Optional[float] = None
+    macd_val: Optional[float] = None
+    macd_signal: Optional[float] = None
+    ma_50: Optional[float] = None
+    ma_200: Optional[float] = None
+    bb_upper: Optional[float] = None
+    bb_lower: Optional[float] = None
+
+
 # ============================================================
 # 10. Risk Analysis Schema
 # ============================================================
 class RiskAnalysis(BaseModel):
     symbol: str
     beta: Optional[float] = None
+
+    # Regression on the benchmark's daily returns (alpha annualized)
+    benchmark: Optional[str] = None
+    alpha: Optional[float] = None
+    correlation: Optional[float] = None
+    r_squared: Optional[float] = None
+
     volatility: Optional[float] = None
     sharpe_ratio: Optional[float] = None
+
+    # Return / downside metrics (annualized, from daily log returns)
+    annual_return: Optional[float] = None
+    sortino_ratio: Optional[float] = None
+    max_drawdown: Optional[float] = None           # fraction below the running peak
+    drawdown_duration: Optional[int] = None        # longest stretch below a prior peak, in trading days
+
+    # One-day Value at Risk / Conditional VaR (positive = loss) at var_confidence
+    var_confidence: Optional[float] = None
+    var_historical: Optional[float] = None
+    cvar_historical: Optional[float] = None
+    var_parametric: Optional[float] = None
+    cvar_parametric: Optional[float] = None
+
+    observations: Optional[int] = None
+    source: Optional[str] = None
     risk_level: Optional[str] = None
     reasoning: Optional[str] = None
 
@@ -198,7 +238,7 @@ class TradingState(BaseModel):
 
     # Collected data
     raw_news: Optional[List[NewsArticle]] = None
-    price_data: Optional[List[PricePoint]] = None
+    price_data: Optional[PriceSeries] = None  # also accepts List[PricePoint] (converted)
     gpt_insight: Optional[GPTInsight] = None
     trade_signal: Optional[TradeSignal] = None
     executed_trade: Optional[ExecutedTrade] = None
@@ -209,6 +249,7 @@ class TradingState(BaseModel):
     # Specialized analysis fields
     stock_insight: Optional[StockInsight] = None
     technical_analysis: Optional[TechnicalAnalysis] = None
+    scan_results: Optional[List[ScanMatch]] = None
     risk_analysis: Optional[RiskAnalysis] = None
     portfolio_guidance: Optional[PortfolioGuidance] = None
     macro_trends: Optional[MacroTrends] = None
@@ -18,6 +18,7 @@ from nodes.gpt_analyst_node import gpt_analyst_node
 # Specialized response nodes
 from nodes.stock_insight_node import stock_insight_node
 from nodes.technical_analysis_node import technical_analysis_node
+from nodes.technical_scan_node import technical_scan_node
 from nodes.risk_analysis_node import risk_analysis_node
 from nodes.portfolio_node import portfolio_node
 from nodes.macro_trend_node import macro_trend_node
@@ -43,6 +44,7 @@ def build_dual_pipeline():
     # 📊 Specialized insight modules
     graph.add_node("step_stock_insight", stock_insight_node)
     graph.add_node("step_technical_analysis", technical_analysis_node)
+    graph.add_node("step_technical_scan", technical_scan_node)
     graph.add_node("step_risk_analysis", risk_analysis_node)
     graph.add_node("step_portfolio_guidance", portfolio_node)
     graph.add_node("step_macro_trends", macro_trend_node)
@@ -71,6 +73,7 @@ def build_dual_pipeline():
     # ✅ Direct-return nodes (end here)
     graph.add_edge("step_stock_insight", "step_generate_response")
     graph.add_edge("step_technical_analysis", END)
+    graph.add_edge("step_technical_scan", END)
     graph.add_edge("step_risk_analysis", END)
     graph.add_edge("step_portfolio_guidance", END)
     graph.add_edge("step_macro_trends", END)
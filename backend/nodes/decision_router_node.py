@@ -78,6 +78,13 @@ def decision_router_node(state: TradingState) -> dict:
             log_info("[DecisionRouter] 🚀 Top movers detected → TopMoversNode")
             return {"next": "step_fetch_top_movers"}
 
+        # ==========================================================
+        # 3️⃣b TECHNICAL SCAN (NO SYMBOL — scans the whole universe)
+        # ==========================================================
+        if not symbol and (intent == "technical_scan" or query_type == "technical_scan"):
+            log_info("[DecisionRouter] 📡 Technical scan → TechnicalScanNode")
+            return {"next": "step_technical_scan"}
+
         # ==========================================================
         # 4️⃣ DISCOVERY / SCREENING (NO SYMBOL)
         # ==========================================================
@@ -91,7 +98,7 @@ def decision_router_node(state: TradingState) -> dict:
         # 5️⃣ SYMBOL-BASED ROUTING (SYMBOL REQUIRED)
         # ==========================================================
         if symbol:
-            if "technical" in user_query or intent == "technical_analysis":
+            if "technical" in user_query or intent in {"technical_analysis", "technical_scan"}:
                 log_info(f"[DecisionRouter] 📈 Technical analysis → {symbol}")
                 return {"next": "step_technical_analysis"}
 
@@ -10,6 +10,7 @@ ALLOWED_INTENTS = {
     "stock_insight",
     "fundamental_lookup",
     "technical_analysis",
+    "technical_scan",
     "risk_assessment",
     "portfolio_guidance",
     "macro_trend",
@@ -21,6 +22,9 @@ ALLOWED_INTENTS = {
 # Fallback keyword hints (ONLY if parser missing)
 # =================================================
 FALLBACK_KEYWORDS = {
+    "technical_scan": {
+        "oversold", "overbought", "golden cross", "death cross", "scan"
+    },
     "technical_analysis": {
         "rsi", "macd", "bollinger", "moving average", "support", "resistance"
     },
@@ -48,6 +52,7 @@ top_movers
 stock_insight
 fundamental_lookup
 technical_analysis
+technical_scan
 risk_assessment
 portfolio_guidance
 macro_trend
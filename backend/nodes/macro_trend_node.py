@@ -1,5 +1,4 @@
 import os
-import requests
 from datetime import datetime
 import yfinance as yf
 
@@ -7,6 +6,9 @@ from core.schemas import TradingState
 from model.model import model
 from utils.logger import log_info, log_error
 from utils.alpha_client import get_alpha_quote
+from utils.fanout import fan_out
+from utils.http_client import Request, run_fetch
+from utils.async_http import run_fetch_async
 
 FRED_API_KEY = os.getenv("FRED_API_KEY")
 
@@ -40,26 +42,44 @@ GLOBAL_INDICATORS = {
 # -------------------------------------------------------------
 # 1️⃣ Fetch US Macro Data (FRED)
 # -------------------------------------------------------------
-def fetch_fred_data(series_id: str, title: str) -> str:
+FRED_URL = "https://api.stlouisfed.org/fred/series/observations"
+
+
+def _fred_params(series_id: str) -> dict:
+    return {
+        "series_id": series_id,
+        "api_key": FRED_API_KEY,
+        "file_type": "json",
+        "sort_order": "desc",
+        "limit": 1,
+    }
+
+
+def _format_fred(data: dict, title: str) -> str:
+    obs = data["observations"][0]
+    return f"- **{title}** ({obs['date']}): `{obs['value']}`"
+
+
+def _fred(series_id: str, title: str):
+    """Fetcher shared by the sync / async FRED calls (see `run_fetch`)."""
     try:
-        url = "https://api.stlouisfed.org/fred/series/observations"
-        params = {
-            "series_id": series_id,
-            "api_key": FRED_API_KEY,
-            "file_type": "json",
-            "sort_order": "desc",
-            "limit": 1,
-        }
-        resp = requests.get(url, params=params, timeout=8)
+        resp = yield Request("fred", FRED_URL, {"params": _fred_params(series_id)})
         resp.raise_for_status()
-        data = resp.json()
-        obs = data["observations"][0]
-        return f"- **{title}** ({obs['date']}): `{obs['value']}`"
+        return _format_fred(resp.json(), title)
     except Exception as e:
         log_error(f"[MacroTrendNode] FRED fetch failed ({series_id}): {e}")
         return f"- **{title}**: Data unavailable"
 
 
+def fetch_fred_data(series_id: str, title: str) -> str:
+    return run_fetch(_fred(series_id, title))
+
+
+async def fetch_fred_data_async(series_id: str, title: str) -> str:
+    """Async `fetch_fred_data`."""
+    return await run_fetch_async(_fred(series_id, title))
+
+
 # -------------------------------------------------------------
 # 2️⃣ Fetch ECB / Asian Data (Fallback via yfinance proxies)
 # -------------------------------------------------------------
@@ -73,20 +93,23 @@ def fetch_global_proxy_data(region: str) -> list[str]:
         "ASIA": {"^N225": "Japan Nikkei 225", "^BSESN": "India BSE Sensex"},
     }
 
-    lines = [f"\n🌏 **{region} Economic Indicators (proxy indices)**"]
-    for symbol, title in proxies.get(region, {}).items():
+    def proxy_line(entry: tuple[str, str]) -> str:
+        symbol, title = entry
         try:
             ticker = yf.Ticker(symbol)
             data = ticker.history(period="5d")
             if not data.empty:
                 last = data.iloc[-1]
                 change = ((last["Close"] - data.iloc[-2]["Close"]) / data.iloc[-2]["Close"]) * 100 if len(data) > 1 else 0
-                lines.append(f"- **{title}**: {round(last['Close'], 2)} ({round(change, 2)}%)")
-            else:
-                lines.append(f"- **{title}**: Data unavailable")
+                return f"- **{title}**: {round(last['Close'], 2)} ({round(change, 2)}%)"
         except Exception as e:
             log_error(f"[MacroTrendNode] Proxy fetch failed for {symbol}: {e}")
-            lines.append(f"- **{title}**: Data unavailable")
+        return f"- **{title}**: Data unavailable"
+
+    entries = list(proxies.get(region, {}).items())
+    lines = [f"\n🌏 **{region} Economic Indicators (proxy indices)**"]
+    results = fan_out(proxy_line, entries, provider="yfinance")
+    lines.extend(line or f"- **{title}**: Data unavailable" for line, (_, title) in zip(results, entries))
     return lines
 
 
@@ -94,12 +117,15 @@ def fetch_global_proxy_data(region: str) -> list[str]:
 # 3️⃣ Sector ETF Summary (Multi-region)
 # -------------------------------------------------------------
 def fetch_sector_etf_data() -> str:
+    symbols = [symbol for etfs in GLOBAL_SECTOR_ETFS.values() for symbol in etfs]
+    quotes = dict(zip(symbols, fan_out(get_alpha_quote, symbols, provider="alpha_vantage")))
+
     lines = ["\n🏛️ **Sector ETF Trends (Global)**"]
     for region, etfs in GLOBAL_SECTOR_ETFS.items():
         lines.append(f"\n**{region} Sector ETFs:**")
         for symbol in etfs:
             try:
-                data = get_alpha_quote(symbol)
+                data = quotes.get(symbol)
                 if not data or "price" not in data:
                     raise ValueError("Missing Alpha Vantage price.")
 
@@ -133,8 +159,13 @@ def macro_trend_node(state: TradingState) -> TradingState:
 
         # --- US FRED Data ---
         us_lines = ["\n🇺🇸 **US Macro Indicators**"]
-        for sid, title in GLOBAL_INDICATORS["US"].items():
-            us_lines.append(fetch_fred_data(sid, title))
+        us_lines.extend(
+            line or f"- **{title}**: Data unavailable"
+            for line, title in zip(
+                fan_out(lambda entry: fetch_fred_data(*entry), GLOBAL_INDICATORS["US"].items(), provider="fred"),
+                GLOBAL_INDICATORS["US"].values(),
+            )
+        )
 
         # --- EU + ASIA Proxy Data ---
         eu_lines = fetch_global_proxy_data("EU")
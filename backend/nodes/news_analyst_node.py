@@ -1,5 +1,4 @@
 import os
-import requests
 import yfinance as yf
 from datetime import datetime, timedelta
 from typing import List, Optional
@@ -7,10 +6,16 @@ from dotenv import load_dotenv
 
 from core.schemas import TradingState, NewsArticle
 from utils.logger import log_info, log_error
+from utils.http_client import Request, run_fetch
+from utils.async_http import run_fetch_async
+from utils.quota import rank_sources
+from utils.single_flight import single_flight
 from state.shared_state import SharedState  # 🧠 Persistent memory integration
 
 load_dotenv()
 
+NEWS_CACHE_TTL = timedelta(hours=3)
+
 
 # ============================================================
 # 1️⃣ — Helper: Normalize & Validate News Data
@@ -47,38 +52,55 @@ def clean_article(item: dict) -> Optional[NewsArticle]:
 # ============================================================
 # 2️⃣ — Global News Fetchers (Primary + Fallbacks)
 # ============================================================
-def fetch_newsapi(symbol: str, api_key: str) -> List[NewsArticle]:
-    """Primary — NewsAPI (global English-focused)."""
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+BING_NEWS_URL = "https://api.bing.microsoft.com/v7.0/news/search"
+
+
+def _newsapi_params(symbol: str, api_key: str) -> dict:
     from_date = (datetime.utcnow() - timedelta(days=2)).strftime("%Y-%m-%d")
+    return {
+        "q": symbol,
+        "from": from_date,
+        "sortBy": "relevancy",
+        "language": "en",
+        "pageSize": 10,
+        "apiKey": api_key,
+    }
+
+
+def _parse_newsapi(data: dict) -> List[NewsArticle]:
+    if data.get("status") != "ok":
+        raise ValueError(f"NewsAPI error: {data.get('message')}")
+    return [
+        art for art in (clean_article(a) for a in data.get("articles", [])) if art
+    ]
+
+
+def _newsapi(symbol: str, api_key: str):
+    """Fetcher shared by the sync / async NewsAPI calls (see `run_fetch`)."""
     try:
-        url = "https://newsapi.org/v2/everything"
-        params = {
-            "q": symbol,
-            "from": from_date,
-            "sortBy": "relevancy",
-            "language": "en",
-            "pageSize": 10,
-            "apiKey": api_key,
-        }
-        resp = requests.get(url, params=params, timeout=10)
+        resp = yield Request("newsapi", NEWSAPI_URL, {"params": _newsapi_params(symbol, api_key)})
         resp.raise_for_status()
-        data = resp.json()
-        if data.get("status") != "ok":
-            raise ValueError(f"NewsAPI error: {data.get('message')}")
-
-        return [
-            art for art in (clean_article(a) for a in data.get("articles", [])) if art
-        ]
+        return _parse_newsapi(resp.json())
     except Exception as e:
         log_error(f"[NewsAnalystNode] NewsAPI fetch failed: {e}")
         return []
 
 
+def fetch_newsapi(symbol: str, api_key: str) -> List[NewsArticle]:
+    """Primary — NewsAPI (global English-focused)."""
+    return run_fetch(_newsapi(symbol, api_key))
+
+
+async def fetch_newsapi_async(symbol: str, api_key: str) -> List[NewsArticle]:
+    """Async `fetch_newsapi`."""
+    return await run_fetch_async(_newsapi(symbol, api_key))
+
+
 def fetch_yfinance_news(symbol: str) -> List[NewsArticle]:
     """Fallback — Yahoo Finance global headlines."""
     try:
-        ticker = yf.Ticker(symbol)
-        news_items = ticker.news or []
+        news_items = single_flight("yfinance", "news", {"symbol": symbol}, lambda: yf.Ticker(symbol).news) or []
         articles = []
         for n in news_items[:10]:
             published_ts = n.get("providerPublishTime", datetime.utcnow().timestamp())
@@ -95,33 +117,44 @@ def fetch_yfinance_news(symbol: str) -> List[NewsArticle]:
         return []
 
 
-def fetch_bing_news(symbol: str, api_key: str) -> List[NewsArticle]:
-    """Optional — Bing News Search fallback (if API key set)."""
+def _parse_bing(data: dict) -> List[NewsArticle]:
+    articles = []
+    for item in data.get("value", []):
+        article = NewsArticle(
+            title=item.get("name", ""),
+            summary=item.get("description", ""),
+            published_at=datetime.fromisoformat(
+                item.get("datePublished", datetime.utcnow().isoformat())
+            ),
+            source=item.get("provider", [{}])[0].get("name", "Bing News"),
+        )
+        articles.append(article)
+    return articles
+
+
+def _bing_news(symbol: str, api_key: str):
+    """Fetcher shared by the sync / async Bing calls (see `run_fetch`)."""
     try:
-        url = "https://api.bing.microsoft.com/v7.0/news/search"
         headers = {"Ocp-Apim-Subscription-Key": api_key}
         params = {"q": symbol, "count": 10, "mkt": "en-US", "sortBy": "Date"}
-        resp = requests.get(url, headers=headers, params=params, timeout=8)
+        resp = yield Request("bing", BING_NEWS_URL, {"headers": headers, "params": params})
         resp.raise_for_status()
-        data = resp.json()
-
-        articles = []
-        for item in data.get("value", []):
-            article = NewsArticle(
-                title=item.get("name", ""),
-                summary=item.get("description", ""),
-                published_at=datetime.fromisoformat(
-                    item.get("datePublished", datetime.utcnow().isoformat())
-                ),
-                source=item.get("provider", [{}])[0].get("name", "Bing News"),
-            )
-            articles.append(article)
-        return articles
+        return _parse_bing(resp.json())
     except Exception as e:
         log_error(f"[NewsAnalystNode] Bing News fetch failed: {e}")
         return []
 
 
+def fetch_bing_news(symbol: str, api_key: str) -> List[NewsArticle]:
+    """Optional — Bing News Search fallback (if API key set)."""
+    return run_fetch(_bing_news(symbol, api_key))
+
+
+async def fetch_bing_news_async(symbol: str, api_key: str) -> List[NewsArticle]:
+    """Async `fetch_bing_news`."""
+    return await run_fetch_async(_bing_news(symbol, api_key))
+
+
 # ============================================================
 # 3️⃣ — Main Node Logic (Global + Memory Integrated)
 # ============================================================
@@ -138,16 +171,14 @@ def news_analyst_node(state: TradingState) -> TradingState:
         state.raw_news = []
         return state
 
-    memory = SharedState()
-    cached = memory.get(f"news:{symbol}")
+    memory = SharedState.get_instance()
+    cached = memory.cache_get(f"news:{symbol}")
 
-    # ✅ Use cached news if still fresh (within 3 hours)
-    if cached:
-        last_updated = datetime.fromisoformat(cached.get("timestamp"))
-        if datetime.utcnow() - last_updated < timedelta(hours=3):
-            log_info(f"[NewsAnalystNode] Using cached news for {symbol}.")
-            state.raw_news = [NewsArticle(**a) for a in cached.get("articles", [])]
-            return state
+    # ✅ Use cached news if still fresh (within NEWS_CACHE_TTL)
+    if cached is not None:
+        log_info(f"[NewsAnalystNode] Using cached news for {symbol}.")
+        state.raw_news = [NewsArticle(**a) for a in cached]
+        return state
 
     # --- Load API keys ---
     newsapi_key = os.getenv("NEWSAPI_API_KEY")
@@ -155,18 +186,21 @@ def news_analyst_node(state: TradingState) -> TradingState:
 
     all_articles: List[NewsArticle] = []
 
-    # --- Primary Fetch (NewsAPI) ---
-    if newsapi_key:
-        all_articles.extend(fetch_newsapi(symbol, newsapi_key))
-    else:
+    if not newsapi_key:
         log_error("[NewsAnalystNode] Missing NEWSAPI_API_KEY. Skipping NewsAPI source.")
 
-    # --- Fallback 1 (Yahoo Finance) ---
-    if len(all_articles) < 3:
-        yfin_articles = fetch_yfinance_news(symbol)
-        if yfin_articles:
-            log_info(f"[NewsAnalystNode] Added {len(yfin_articles)} Yahoo Finance articles.")
-            all_articles.extend(yfin_articles)
+    # --- NewsAPI + Yahoo Finance, NewsAPI first while its daily quota is on pace ---
+    sources = rank_sources(["newsapi", "yfinance"] if newsapi_key else ["yfinance"])
+    for i, source in enumerate(sources):
+        if i > 0 and len(all_articles) >= 3:
+            break
+        if source == "newsapi":
+            all_articles.extend(fetch_newsapi(symbol, newsapi_key))
+        else:
+            yfin_articles = fetch_yfinance_news(symbol)
+            if yfin_articles:
+                log_info(f"[NewsAnalystNode] Added {len(yfin_articles)} Yahoo Finance articles.")
+                all_articles.extend(yfin_articles)
 
     # --- Fallback 2 (Bing News) ---
     if len(all_articles) < 3 and bing_key:
@@ -189,12 +223,10 @@ def news_analyst_node(state: TradingState) -> TradingState:
 
     # --- Cache to Persistent Memory ---
     try:
-        memory.set(
+        memory.cache_set(
             f"news:{symbol}",
-            {
-                "timestamp": datetime.utcnow().isoformat(),
-                "articles": [a.dict() for a in unique_articles],
-            },
+            [a.dict() for a in unique_articles],
+            ttl=NEWS_CACHE_TTL,
         )
     except Exception as e:
         log_error(f"[NewsAnalystNode] Cache write failed: {e}")
@@ -3,7 +3,8 @@ from core.schemas import TradingState
 from model.model import model
 from utils.logger import log_info, log_error
 from utils.etf_client import get_etf_profile
-from state.shared_state import load_memory, save_memory
+from utils.fanout import fan_out
+from state.shared_state import shared_state
 
 
 def analyze_portfolio(assets: list[str]) -> str:
@@ -20,9 +21,10 @@ def analyze_portfolio(assets: list[str]) -> str:
     total_return = 0.0
     valid_assets = 0
 
-    for symbol in assets:
+    profiles = fan_out(get_etf_profile, assets, provider="twelvedata")
+
+    for symbol, profile in zip(assets, profiles):
         try:
-            profile = get_etf_profile(symbol)
             if not isinstance(profile, dict):
                 raise ValueError("Invalid profile format")
 
@@ -70,7 +72,6 @@ def portfolio_node(state: TradingState) -> TradingState:
     """
     query = (state.user_query or "").strip()
     parsed = state.parsed_query
-    memory = load_memory()
 
     # Extract mentioned symbols (2–6 uppercase letters, typical ticker range)
     mentioned = re.findall(r"\b[A-Z]{2,6}\b", query)
@@ -108,10 +109,9 @@ Style guide:
             final_report += f"\n\nAI Recommendation:\n{ai_summary}"
 
         # --- Step 4: Save to persistent memory
-        memory["last_portfolio_query"] = query
-        memory["last_analyzed_assets"] = assets
-        memory["last_portfolio_summary"] = final_report
-        save_memory(memory)
+        shared_state.set_global("last_portfolio_query", query)
+        shared_state.set_global("last_analyzed_assets", assets)
+        shared_state.set_global("last_portfolio_summary", final_report)
 
         # --- Step 5: Update state
         state.user_response = final_report
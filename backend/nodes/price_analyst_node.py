@@ -1,37 +1,28 @@
-import yfinance as yf
-from core.schemas import TradingState, PricePoint
-from datetime import datetime
-from typing import List
+from core.schemas import TradingState
+from core.price_series import PriceSeries
 from utils.logger import log_info, log_error
+from utils.bar_store import get_bars
 
 def price_analyst_node(state: TradingState) -> TradingState:
     """
     Fetches historical price data (last 7 days) for the symbol and updates state.price_data.
 
-    Uses yfinance to retrieve OHLCV values at 1-hour intervals.
+    Reads OHLCV values at 1-hour intervals from the local bar store, which
+    only asks yfinance for bars newer than the ones already on disk.
     """
     try:
-        ticker = yf.Ticker(state.symbol)
-        df = ticker.history(period="7d", interval="1h", auto_adjust=True)
+        df = get_bars(state.symbol, interval="1h", period="7d")
 
         if df.empty:
             raise ValueError("Empty dataframe received from yfinance.")
 
-        data: List[PricePoint] = []
-        for ts, row in df.iterrows():
-            data.append(PricePoint(
-                timestamp=ts.to_pydatetime(),
-                open=float(row["Open"]),
-                high=float(row["High"]),
-                low=float(row["Low"]),
-                close=float(row["Close"]),
-                volume=int(row["Volume"])
-            ))
+        # Columnar series straight from the frame (no per-row PricePoint objects)
+        data = PriceSeries.from_frame(df)
 
         state.price_data = data
         log_info(f"[PriceAnalystNode] Retrieved {len(data)} price points for {state.symbol}")
     except Exception as e:
         log_error(f"[PriceAnalystNode] Failed to fetch price data: {e}")
-        state.price_data = []
+        state.price_data = PriceSeries.empty()
 
     return state
@@ -28,6 +28,7 @@ MARKET_KEYWORDS = {
 QUERY_TYPE_KEYWORDS = {
     "top_gainers": ["top gainers", "best performing", "highest gain"],
     "top_losers": ["top losers", "worst performing"],
+    "technical_scan": ["oversold", "overbought", "golden cross", "death cross", "scan for", "screen for"],
     "budget_picks": ["cheap", "under $", "budget", "low price"],
     "fundamental_lookup": ["pe ratio", "p/e", "market cap", "dividend", "valuation"],
     "portfolio_guidance": ["rebalance", "allocation", "diversify"],
@@ -63,7 +64,7 @@ COMMON_COMPANIES = {
 # 🚫 INVALID SYMBOL TOKENS
 # =========================
 INVALID_SYMBOLS = {
-    "P", "E", "PE", "EPS", "ROI", "GDP", "AI", "USA"
+    "P", "E", "PE", "EPS", "ROI", "GDP", "AI", "USA", "RSI", "MACD"
 }
 
 
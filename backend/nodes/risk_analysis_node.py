@@ -1,92 +1,139 @@
 import os
 import time
-import math
-import requests
-import yfinance as yf
-from statistics import stdev, mean
 from typing import List, Optional
-from core.schemas import TradingState
+import numpy as np
+import pandas as pd
+from core.schemas import RiskAnalysis, TradingState
 from utils.logger import log_info, log_error
 from state.shared_state import shared_state
+from utils.bar_store import get_bars
+from utils.benchmark import market_stats
+from utils.fundamentals import get_fundamentals
+from utils.http_client import Request, run_fetch
+from utils.async_http import run_fetch_async
+from utils.rate_limiter import penalize
+from utils.risk import VAR_CONFIDENCE, compute_risk
 
 # ---------------- Configuration ----------------
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
 FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
-YF_FALLBACK_PERIOD = "3mo"
+# A year of daily bars (already in the bar store for technicals) gives the drawdown / VaR tails enough data
+YF_FALLBACK_PERIOD = "1y"
 
 
 # ---------------- Utility Fetchers ----------------
-def fetch_finnhub_candles(symbol: str, resolution: str = "D", days: int = 90) -> List[float]:
-    """Fetch daily closing prices via Finnhub (fallback-safe)."""
+def _candle_params(symbol: str, resolution: str, days: int) -> dict:
+    now = int(time.time()) - 60
+    start = now - days * 86400
+    return {
+        "symbol": symbol.upper(),
+        "resolution": resolution,
+        "from": start,
+        "to": now,
+        "token": FINNHUB_API_KEY,
+    }
+
+
+def _finnhub_json(resp) -> dict:
+    """Shared status handling for requests / httpx responses."""
+    if resp.status_code == 403:
+        penalize("finnhub", 60)
+        raise PermissionError("403 Forbidden: Finnhub plan limit reached.")
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _parse_candles(data: dict) -> List[float]:
+    return data.get("c", []) if data.get("s") == "ok" else []
+
+
+def _finnhub_candles(symbol: str, resolution: str, days: int):
+    """Fetcher shared by the sync / async candle calls (see `run_fetch`)."""
     if not FINNHUB_API_KEY:
         log_error("[RiskAnalysisNode] Missing FINNHUB_API_KEY in environment.")
         return []
 
     try:
-        now = int(time.time()) - 60
-        start = now - days * 86400
-        url = f"{FINNHUB_BASE_URL}/stock/candle"
-        params = {
-            "symbol": symbol.upper(),
-            "resolution": resolution,
-            "from": start,
-            "to": now,
-            "token": FINNHUB_API_KEY,
-        }
-        resp = requests.get(url, params=params, timeout=5)
-        if resp.status_code == 403:
-            raise PermissionError("403 Forbidden: Finnhub plan limit reached.")
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("c", []) if data.get("s") == "ok" else []
+        resp = yield Request("finnhub", f"{FINNHUB_BASE_URL}/stock/candle",
+                             {"params": _candle_params(symbol, resolution, days)})
+        return _parse_candles(_finnhub_json(resp))
     except Exception as e:
         log_error(f"[RiskAnalysisNode] Finnhub candle fetch failed for {symbol}: {e}")
         return []
 
 
-def fetch_yfinance_prices(symbol: str, period: str = YF_FALLBACK_PERIOD) -> List[float]:
-    """Fallback to yfinance for historical prices."""
+def fetch_finnhub_candles(symbol: str, resolution: str = "D", days: int = 90) -> List[float]:
+    """Fetch daily closing prices via Finnhub (fallback-safe)."""
+    return run_fetch(_finnhub_candles(symbol, resolution, days))
+
+
+async def fetch_finnhub_candles_async(symbol: str, resolution: str = "D", days: int = 90) -> List[float]:
+    """Async `fetch_finnhub_candles`."""
+    return await run_fetch_async(_finnhub_candles(symbol, resolution, days))
+
+
+def fetch_yfinance_history(symbol: str, period: str = YF_FALLBACK_PERIOD) -> pd.DataFrame:
+    """Daily bars from the local bar store (shared with the other nodes, refreshed from yfinance)."""
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=period, interval="1d", auto_adjust=True)
+        hist = get_bars(symbol, interval="1d", period=period)
         if hist.empty:
             raise ValueError("Empty dataframe from yfinance.")
-        return hist["Close"].dropna().tolist()
+        return hist.dropna(subset=["Close"])
     except Exception as e:
         log_error(f"[RiskAnalysisNode] yfinance price fallback failed for {symbol}: {e}")
-        return []
+        return pd.DataFrame()
 
 
-def fetch_finnhub_beta(symbol: str) -> Optional[float]:
-    """Retrieve Beta value from Finnhub or fallback to yfinance."""
+def fetch_yfinance_prices(symbol: str, period: str = YF_FALLBACK_PERIOD) -> List[float]:
+    """Daily closes from the local bar store."""
+    hist = fetch_yfinance_history(symbol, period)
+    return hist["Close"].tolist() if not hist.empty else []
+
+
+def _finnhub_beta(symbol: str):
+    """Fetcher shared by the sync / async beta calls; the yfinance fallback is a blocking step."""
     if not FINNHUB_API_KEY:
         log_error("[RiskAnalysisNode] No API key — skipping Finnhub beta fetch.")
         return None
     try:
         url = f"{FINNHUB_BASE_URL}/stock/profile2"
-        resp = requests.get(url, params={"symbol": symbol.upper(), "token": FINNHUB_API_KEY}, timeout=5)
-        if resp.status_code == 403:
-            raise PermissionError("403 Forbidden: Finnhub plan limit reached.")
-        resp.raise_for_status()
-        data = resp.json()
+        resp = yield Request("finnhub", url, {"params": {"symbol": symbol.upper(), "token": FINNHUB_API_KEY}})
+        data = _finnhub_json(resp)
         return float(data.get("beta")) if "beta" in data else None
     except Exception as e:
         log_error(f"[RiskAnalysisNode] Finnhub beta fetch failed for {symbol}: {e}")
-        try:
-            info = yf.Ticker(symbol).info
-            return float(info.get("beta")) if "beta" in info else None
-        except Exception:
-            return None
+        return (yield lambda: _beta_from_fundamentals(symbol))
+
+
+def fetch_finnhub_beta(symbol: str) -> Optional[float]:
+    """Retrieve Beta value from Finnhub or fallback to yfinance."""
+    return run_fetch(_finnhub_beta(symbol))
+
+
+async def fetch_finnhub_beta_async(symbol: str) -> Optional[float]:
+    """Async `fetch_finnhub_beta` (the yfinance fallback runs in a worker thread)."""
+    return await run_fetch_async(_finnhub_beta(symbol))
+
+
+def _beta_from_fundamentals(symbol: str) -> Optional[float]:
+    try:
+        info = get_fundamentals(symbol)
+        return float(info.get("beta")) if "beta" in info else None
+    except Exception:
+        return None
 
 
 # ---------------- Calculations ----------------
+def calculate_risk_metrics(prices: List[float]) -> dict:
+    """All risk metrics for one price series (see utils.risk.compute_risk); NaN → None."""
+    return compute_risk(np.asarray(prices, dtype="f8")[None, :], ["_"]).row("_")
+
+
 def calculate_volatility(prices: List[float]) -> float:
     """Compute annualized volatility from price series."""
     try:
-        if len(prices) < 30:
-            return 0.0
-        returns = [(prices[i + 1] - prices[i]) / prices[i] for i in range(len(prices) - 1) if prices[i] > 0]
-        return round(stdev(returns) * math.sqrt(252), 4)
+        value = calculate_risk_metrics(prices)["volatility"]
+        return 0.0 if value is None else round(value, 4)
     except Exception as e:
         log_error(f"[RiskAnalysisNode] Volatility calculation failed: {e}")
         return 0.0
@@ -95,23 +142,40 @@ def calculate_volatility(prices: List[float]) -> float:
 def calculate_sharpe_ratio(prices: List[float], risk_free_rate: float = 0.03) -> float:
     """Compute annualized Sharpe ratio."""
     try:
-        if len(prices) < 30:
-            return 0.0
-        returns = [(prices[i + 1] - prices[i]) / prices[i] for i in range(len(prices) - 1) if prices[i] > 0]
-        excess = [r - (risk_free_rate / 252) for r in returns]
-        return round(mean(excess) / stdev(returns) * math.sqrt(252), 2)
+        table = compute_risk(np.asarray(prices, dtype="f8")[None, :], ["_"], risk_free_rate=risk_free_rate)
+        value = table.row("_")["sharpe_ratio"]
+        return 0.0 if value is None else round(value, 2)
     except Exception as e:
         log_error(f"[RiskAnalysisNode] Sharpe ratio calculation failed: {e}")
         return 0.0
 
 
+def _risk_level(volatility: Optional[float], max_drawdown: Optional[float]) -> Optional[str]:
+    if volatility is None:
+        return None
+    if volatility >= 0.45 or (max_drawdown or 0) >= 0.4:
+        return "high"
+    if volatility >= 0.25 or (max_drawdown or 0) >= 0.2:
+        return "moderate"
+    return "low"
+
+
+def _round(value, digits: int = 4):
+    return None if value is None else round(value, digits)
+
+
+def _pct(value: Optional[float]) -> str:
+    return "N/A" if value is None else f"{value * 100:.2f}%"
+
+
 # ---------------- Main Node ----------------
 def risk_analysis_node(state: TradingState, user_id: str = "default_user") -> TradingState:
     """
     Perform global risk analysis for any stock symbol.
 
-    ✅ Fetches data globally via Finnhub (fallback: yfinance)
-    ✅ Calculates Beta, Volatility, Sharpe Ratio
+    ✅ Reads daily closes from the local bar store (fallback: Finnhub candles)
+    ✅ Beta / alpha / correlation by regression on cached benchmark returns
+    ✅ Calculates Volatility, Sharpe / Sortino, Drawdown, VaR / CVaR
     ✅ Integrates with shared_state for persistent memory
     ✅ Handles API, timeout, and data edge cases
     ✅ Never crashes — always returns clean, professional output
@@ -132,11 +196,17 @@ def risk_analysis_node(state: TradingState, user_id: str = "default_user") -> Tr
     log_info(f"[RiskAnalysisNode] Starting risk analysis for {symbol}...")
 
     # --- Multi-source data fetch ---
-    prices = fetch_finnhub_candles(symbol)
+    hist = fetch_yfinance_history(symbol)
+    prices, source = hist["Close"].tolist() if not hist.empty else [], "yfinance"
     if not prices:
-        prices = fetch_yfinance_prices(symbol)
+        prices, source = fetch_finnhub_candles(symbol, days=365), "Finnhub"
 
-    beta = fetch_finnhub_beta(symbol)
+    # --- Beta / alpha / correlation: regression on the cached benchmark returns ---
+    market = None
+    if not hist.empty:
+        market = market_stats(symbol, hist.index.as_unit("ns").asi8, hist["Close"].to_numpy())
+    # Vendor beta only when there is no local history to regress
+    beta = market["beta"] if market else fetch_finnhub_beta(symbol)
 
     if not prices:
         state.user_response = (
@@ -145,38 +215,59 @@ def risk_analysis_node(state: TradingState, user_id: str = "default_user") -> Tr
         )
         return state
 
-    # --- Metrics calculation ---
-    volatility = calculate_volatility(prices)
-    sharpe = calculate_sharpe_ratio(prices)
-
-    # --- Structured result ---
-    result = {
-        "symbol": symbol,
-        "beta": beta,
-        "volatility": volatility,
-        "sharpe_ratio": sharpe,
-        "source": "Finnhub" if FINNHUB_API_KEY else "yfinance",
-    }
+    # --- Metrics calculation (one vectorized pass over the log returns) ---
+    metrics = calculate_risk_metrics(prices)
+    analysis = RiskAnalysis(
+        symbol=symbol,
+        beta=_round(beta),
+        alpha=_round(market["alpha"]) if market else None,
+        correlation=_round(market["correlation"]) if market else None,
+        r_squared=_round(market["r_squared"]) if market else None,
+        benchmark=market["benchmark"] if market else None,
+        volatility=_round(metrics["volatility"]),
+        sharpe_ratio=_round(metrics["sharpe_ratio"], 2),
+        annual_return=_round(metrics["annual_return"]),
+        sortino_ratio=_round(metrics["sortino_ratio"], 2),
+        max_drawdown=_round(metrics["max_drawdown"]),
+        drawdown_duration=metrics["drawdown_duration"] if metrics["volatility"] is not None else None,
+        var_confidence=VAR_CONFIDENCE,
+        var_historical=_round(metrics["var_historical"]),
+        cvar_historical=_round(metrics["cvar_historical"]),
+        var_parametric=_round(metrics["var_parametric"]),
+        cvar_parametric=_round(metrics["cvar_parametric"]),
+        observations=metrics["observations"],
+        source=source,
+        risk_level=_risk_level(metrics["volatility"], metrics["max_drawdown"]),
+    )
 
-    state.risk_analysis = result
-    shared_state.update_user_state(user_id, "risk_analysis", result)
+    state.risk_analysis = analysis
+    shared_state.update_user_state(user_id, "risk_analysis", analysis)
     shared_state.set_global("last_risk_symbol", symbol)
 
     # --- Human-readable summary ---
     beta_txt = f"{round(beta, 2)}" if beta is not None else "N/A"
+    if market:
+        beta_txt += (f" vs {market['benchmark']} (correlation {analysis.correlation:.2f}, "
+                     f"alpha {_pct(analysis.alpha)} / yr)")
+    confidence = f"{VAR_CONFIDENCE * 100:.0f}%"
     msg = f"""
 📊 **Global Risk Analysis: {symbol}**
 
 • **Beta:** {beta_txt}  
-• **Volatility (Annualized):** {volatility}  
-• **Sharpe Ratio:** {sharpe}  
+• **Volatility (Annualized):** {analysis.volatility}  
+• **Sharpe Ratio:** {analysis.sharpe_ratio} | **Sortino Ratio:** {analysis.sortino_ratio}  
+• **Max Drawdown:** {_pct(analysis.max_drawdown)} (longest underwater stretch: {analysis.drawdown_duration} trading days)  
+• **1-Day VaR ({confidence}):** {_pct(analysis.var_historical)} historical · {_pct(analysis.var_parametric)} parametric  
+• **1-Day CVaR ({confidence}):** {_pct(analysis.cvar_historical)} historical · {_pct(analysis.cvar_parametric)} parametric  
+• **Risk Level:** {analysis.risk_level or "N/A"}  
 
 **Interpretation**
-- *Beta* → Measures market correlation (≥1 = high risk exposure).  
+- *Beta* → Sensitivity to the benchmark's daily moves (≥1 = high risk exposure); *alpha* is the excess return it doesn't explain.  
 - *Volatility* → Indicates daily price fluctuation (risk level).  
-- *Sharpe Ratio* → Shows risk-adjusted returns (≥1 = strong performance).  
+- *Sharpe / Sortino* → Risk-adjusted returns over total / downside volatility (≥1 = strong performance).  
+- *VaR / CVaR* → Daily loss not exceeded on {confidence} of days / average loss on the remaining worst days.  
 
-Data Source: {result['source']}
+Data Source: {source}
 """
 
     state.user_response = msg.strip()
@@ -1,6 +1,8 @@
 from core.schemas import TradingState, StockInsight
 from utils.logger import log_info, log_error
 from utils.alpha_client import get_alpha_quote, get_alpha_overview
+from utils.fundamentals import get_fundamentals
+from utils.quota import rank_sources, within_budget
 import yfinance as yf
 
 
@@ -40,14 +42,75 @@ def identify_market_type(symbol: str) -> str:
     return "equity"
 
 
+def _merge_missing(stock_data: dict, fields: dict):
+    """Fill fields that earlier sources left empty."""
+    for k, v in fields.items():
+        if stock_data.get(k) in [None, 0, "N/A", ""]:
+            stock_data[k] = v
+
+
+def _alpha_fields(symbol: str) -> dict:
+    """Quote + overview from Alpha Vantage (two quota calls)."""
+    quote = get_alpha_quote(symbol)
+    overview = get_alpha_overview(symbol)
+    if not (quote or overview):
+        return {}
+    return {
+        "price": safe_float(quote.get("price")) if quote else None,
+        "volume": safe_float(quote.get("volume")) if quote else None,
+        "market_cap": safe_float(overview.get("market_cap")) if overview else None,
+        "pe_ratio": safe_float(overview.get("pe_ratio")) if overview else None,
+        "forward_pe": safe_float(overview.get("forwardPE")) if overview else None,
+        "eps": safe_float(overview.get("eps")) if overview else None,
+        "dividend_yield": normalize_dividend_yield(overview.get("dividend_yield")) if overview else None,
+        "dividend_per_share": safe_float(overview.get("dividend_per_share")) if overview else None,
+        "beta": safe_float(overview.get("beta")) if overview else None,
+        "sector": overview.get("sector"),
+        "industry": overview.get("industry"),
+        "shares_outstanding": safe_float(overview.get("shares_outstanding")) if overview else None,
+        "profit_margin": safe_float(overview.get("profit_margin")) if overview else None,
+        "roe": safe_float(overview.get("return_on_equity")) if overview else None,
+        "summary": overview.get("description") if overview else None,
+    }
+
+
+def _yfinance_fields(symbol: str) -> dict:
+    info = get_fundamentals(symbol)
+    return {
+        "price": safe_float(
+            info.get("currentPrice")
+            or info.get("regularMarketPrice")
+            or info.get("previousClose")
+            or info.get("open")
+        ),
+        "market_cap": safe_float(info.get("marketCap")),
+        "high_52w": safe_float(info.get("fiftyTwoWeekHigh")),
+        "low_52w": safe_float(info.get("fiftyTwoWeekLow")),
+        "volume": safe_float(info.get("volume")),
+        "avg_volume": safe_float(info.get("averageVolume")),
+        "dividend_yield": normalize_dividend_yield(info.get("dividendYield")),
+        "dividend_per_share": safe_float(info.get("dividendRate")),
+        "pe_ratio": safe_float(info.get("trailingPE")),
+        "forward_pe": safe_float(info.get("forwardPE")),
+        "eps": safe_float(info.get("trailingEps")),
+        "beta": safe_float(info.get("beta")),
+        "sector": info.get("sector"),
+        "industry": info.get("industry"),
+        "shares_outstanding": safe_float(info.get("sharesOutstanding")),
+        "profit_margin": safe_float(info.get("profitMargins")),
+        "roe": safe_float(info.get("returnOnEquity")),
+        "summary": info.get("longBusinessSummary"),
+    }
+
+
 # --- Main Node ---
 def stock_insight_node(state: TradingState) -> TradingState:
     """
     🌍 Global Stock Insight Node (Alpha + yfinance hybrid)
     ------------------------------------------------------
     Fetches market data for any equity, ETF, index, or crypto.
-    - Alpha Vantage → preferred primary source
-    - yfinance → secondary fallback
+    - Alpha Vantage → preferred primary source while its daily quota is on pace
+    - yfinance → secondary fallback (primary once Alpha's budget is paced)
     - Global tickers supported: US, India (.NS), Japan (.T), UK (.L), etc.
     """
 
@@ -67,81 +130,26 @@ def stock_insight_node(state: TradingState) -> TradingState:
     stock_data = {"symbol": symbol, "summary": None}
 
     # ==============================================================
-    # 1️⃣ Primary Source — Alpha Vantage
+    # 1️⃣ / 2️⃣ Alpha Vantage + yfinance, ordered by remaining quota
     # ==============================================================
-    try:
-        quote, overview = None, None
-        if market_type in {"equity", "global_stock"}:
-            quote = get_alpha_quote(symbol)
-            overview = get_alpha_overview(symbol)
-
-        if quote or overview:
-            stock_data.update({
-                "price": safe_float(quote.get("price")) if quote else None,
-                "volume": safe_float(quote.get("volume")) if quote else None,
-                "market_cap": safe_float(overview.get("market_cap")) if overview else None,
-                "pe_ratio": safe_float(overview.get("pe_ratio")) if overview else None,
-                "forward_pe": safe_float(overview.get("forwardPE")) if overview else None,
-                "eps": safe_float(overview.get("eps")) if overview else None,
-                "dividend_yield": normalize_dividend_yield(overview.get("dividend_yield")) if overview else None,
-                "dividend_per_share": safe_float(overview.get("dividend_per_share")) if overview else None,
-                "beta": safe_float(overview.get("beta")) if overview else None,
-                "sector": overview.get("sector"),
-                "industry": overview.get("industry"),
-                "shares_outstanding": safe_float(overview.get("shares_outstanding")) if overview else None,
-                "profit_margin": safe_float(overview.get("profit_margin")) if overview else None,
-                "roe": safe_float(overview.get("return_on_equity")) if overview else None,
-                "summary": overview.get("description") if overview else None,
-            })
-            log_info(f"[StockInsightNode] ✅ Alpha Vantage data fetched for {symbol}")
-        else:
-            log_info(f"[StockInsightNode] ⚠️ Alpha Vantage returned no data for {symbol}")
-
-    except Exception as e:
-        log_error(f"[StockInsightNode] Alpha Vantage error for {symbol}: {e}")
-
-    # ==============================================================
-    # 2️⃣ Secondary Source — yfinance
-    # ==============================================================
-    try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info or {}
-
-        merge_map = {
-            "price": safe_float(
-                info.get("currentPrice")
-                or info.get("regularMarketPrice")
-                or info.get("previousClose")
-                or info.get("open")
-            ),
-            "market_cap": safe_float(info.get("marketCap")),
-            "high_52w": safe_float(info.get("fiftyTwoWeekHigh")),
-            "low_52w": safe_float(info.get("fiftyTwoWeekLow")),
-            "volume": safe_float(info.get("volume")),
-            "avg_volume": safe_float(info.get("averageVolume")),
-            "dividend_yield": normalize_dividend_yield(info.get("dividendYield")),
-            "dividend_per_share": safe_float(info.get("dividendRate")),
-            "pe_ratio": safe_float(info.get("trailingPE")),
-            "forward_pe": safe_float(info.get("forwardPE")),
-            "eps": safe_float(info.get("trailingEps")),
-            "beta": safe_float(info.get("beta")),
-            "sector": info.get("sector"),
-            "industry": info.get("industry"),
-            "shares_outstanding": safe_float(info.get("sharesOutstanding")),
-            "profit_margin": safe_float(info.get("profitMargins")),
-            "roe": safe_float(info.get("returnOnEquity")),
-            "summary": info.get("longBusinessSummary"),
-        }
-
-        # Fill in missing values
-        for k, v in merge_map.items():
-            if stock_data.get(k) in [None, 0, "N/A", ""]:
-                stock_data[k] = v
-
-        log_info(f"[StockInsightNode] 🧩 yfinance data merged for {symbol}")
-
-    except Exception as e:
-        log_error(f"[StockInsightNode] yfinance error for {symbol}: {e}")
+    candidates = ["alpha_vantage", "yfinance"] if market_type in {"equity", "global_stock"} else ["yfinance"]
+    for source in rank_sources(candidates):
+        # A paced-out paid source only fills in when the free one found no price
+        if source == "alpha_vantage" and not within_budget(source) and stock_data.get("price"):
+            continue
+        try:
+            if source == "alpha_vantage":
+                fields = _alpha_fields(symbol)
+                if fields:
+                    _merge_missing(stock_data, fields)
+                    log_info(f"[StockInsightNode] ✅ Alpha Vantage data fetched for {symbol}")
+                else:
+                    log_info(f"[StockInsightNode] ⚠️ Alpha Vantage returned no data for {symbol}")
+            else:
+                _merge_missing(stock_data, _yfinance_fields(symbol))
+                log_info(f"[StockInsightNode] 🧩 yfinance data merged for {symbol}")
+        except Exception as e:
+            log_error(f"[StockInsightNode] {source} error for {symbol}: {e}")
 
     # ==============================================================
     # 3️⃣ Fallback for Crypto / Index
@@ -1,60 +1,15 @@
 from core.schemas import TradingState, TechnicalAnalysis
 from utils.logger import log_info, log_error
-import yfinance as yf
-import pandas as pd
-import time
-from typing import Optional, Tuple, Dict
+from typing import Optional
+from utils.indicator_state import latest_indicators
+from utils.analysis_cache import get_analysis, last_bar, put_analysis
 
-# ---------- Simple cache for yfinance ----------
-_YF_CACHE: Dict[str, Dict[str, object]] = {}
+# ---------- Daily bars (local bar store, incremental yfinance refresh) ----------
 _YF_TTL_SEC = 300
 
-def _get_yf_history(symbol: str, period: str = "1y") -> pd.DataFrame:
-    now = time.time()
-    cached = _YF_CACHE.get(symbol)
-    if cached and now - cached["ts"] < _YF_TTL_SEC:
-        return cached["data"]
-
-    t = yf.Ticker(symbol)
-    hist = t.history(period=period)
-    _YF_CACHE[symbol] = {"ts": now, "data": hist}
-    return hist
-
-# ---------- Indicator Calculations ----------
-def calculate_rsi(df: pd.DataFrame, period: int = 14) -> Optional[float]:
-    try:
-        delta = df["Close"].diff()
-        gain = delta.clip(lower=0).rolling(period).mean()
-        loss = -delta.clip(upper=0).rolling(period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return round(float(rsi.iloc[-1]), 2)
-    except Exception as e:
-        log_error(f"RSI calc failed: {e}")
-        return None
-
-def calculate_macd(df: pd.DataFrame) -> Tuple[Optional[float], Optional[float]]:
-    try:
-        short = df["Close"].ewm(span=12, adjust=False).mean()
-        long = df["Close"].ewm(span=26, adjust=False).mean()
-        macd = short - long
-        signal = macd.ewm(span=9, adjust=False).mean()
-        return round(float(macd.iloc[-1]), 2), round(float(signal.iloc[-1]), 2)
-    except Exception as e:
-        log_error(f"MACD calc failed: {e}")
-        return None, None
-
-def calculate_bbands(df: pd.DataFrame, period: int = 20) -> Tuple[Optional[float], Optional[float], Optional[float]]:
-    try:
-        sma = df["Close"].rolling(period).mean()
-        std = df["Close"].rolling(period).std()
-        upper = sma + 2 * std
-        lower = sma - 2 * std
-        price = df["Close"].iloc[-1]
-        return round(float(upper.iloc[-1]), 2), round(float(lower.iloc[-1]), 2), round(float(price), 2)
-    except Exception as e:
-        log_error(f"Bollinger calc failed: {e}")
-        return None, None, None
+# ---------- Helpers (indicators come from utils.indicator_state) ----------
+def _round2(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), 2)
 
 # ---------- Narrative ----------
 def generate_signal_narrative(symbol, rsi, macd_val, macd_signal, ma_50, ma_200, price):
@@ -78,16 +33,24 @@ def technical_analysis_node(state: TradingState) -> TradingState:
         return state
 
     try:
-        hist = _get_yf_history(symbol, period="1y")
-        if hist.empty or len(hist) < 200:
+        # Results are cached per bar: reuse them until a new bar (or a new close) lands
+        bar = last_bar(symbol, interval="1d", period="1y", max_age=_YF_TTL_SEC)
+        cached = get_analysis(symbol, "1d", bar) if bar else None
+        if cached:
+            state.technical_analysis = TechnicalAnalysis(**cached["analysis"])
+            state.user_response = cached["response"]
+            log_info(f"[TA Node] {symbol} served from the analysis cache.")
+            return state
+
+        # Streaming indicator state: only bars newer than the last committed one are read
+        ind = latest_indicators(symbol, interval="1d", period="1y", max_age=_YF_TTL_SEC)
+        if ind.get("bars", 0) < 200:
             raise ValueError("Not enough data for indicators")
 
-        # Compute indicators
-        ma_50 = round(hist["Close"].rolling(50).mean().iloc[-1], 2)
-        ma_200 = round(hist["Close"].rolling(200).mean().iloc[-1], 2)
-        rsi = calculate_rsi(hist)
-        macd_val, macd_signal = calculate_macd(hist)
-        upper, lower, price = calculate_bbands(hist)
+        ma_50, ma_200 = _round2(ind["ma_50"]), _round2(ind["ma_200"])
+        rsi = _round2(ind["rsi"])
+        macd_val, macd_signal = _round2(ind["macd"]), _round2(ind["macd_signal"])
+        upper, lower, price = _round2(ind["bb_upper"]), _round2(ind["bb_lower"]), _round2(ind["price"])
 
         # ✅ Populate TechnicalAnalysis model
         ta = TechnicalAnalysis(
@@ -126,6 +89,8 @@ def technical_analysis_node(state: TradingState) -> TradingState:
         state.technical_analysis = ta
 
         state.user_response = "\n".join(summary + ["", rec])
+        if bar:
+            put_analysis(symbol, "1d", bar, {"analysis": ta.model_dump(), "response": state.user_response})
         log_info(f"[TA Node] {symbol} analyzed via yfinance.")
     except Exception as e:
         log_error(f"[TA Node failed]: {e}")
@@ -0,0 +1,47 @@
+from core.schemas import TradingState
+from utils.logger import log_info, log_error
+from utils.scanner import CONDITIONS, conditions_from_text, scan
+
+# Scan run when the query names no condition ("any technical setups today?")
+DEFAULT_CONDITIONS = ["oversold"]
+
+
+def _format_match(rank: int, m) -> str:
+    parts = [f"{rank}. **{m.symbol}** ${m.price}"]
+    if m.rsi is not None:
+        parts.append(f"RSI {m.rsi}")
+    if m.macd_val is not None and m.macd_signal is not None:
+        parts.append(f"MACD {m.macd_val} / {m.macd_signal}")
+    if m.ma_50 is not None and m.ma_200 is not None:
+        parts.append(f"50MA ${m.ma_50} vs 200MA ${m.ma_200}")
+    return " | ".join(parts)
+
+
+def technical_scan_node(state: TradingState) -> TradingState:
+    """
+    🔭 Technical Scan Node
+    ------------------------------------------------------------
+    Answers "which stocks are oversold right now"-style queries:
+    conditions are read from the query, evaluated across the
+    configured universe in one pass, and the ranked matches are
+    stored in `state.scan_results`.
+    """
+    conditions = conditions_from_text(state.user_query) or DEFAULT_CONDITIONS
+    limit = (state.parsed_query.top_n_requested if state.parsed_query else None) or 10
+
+    try:
+        matches = scan(conditions, limit=limit)
+        state.scan_results = matches
+
+        criteria = " and ".join(CONDITIONS[c][0] for c in conditions)
+        if not matches:
+            state.user_response = f"📡 No stocks in the scan universe currently match: {criteria}."
+        else:
+            lines = [f"📡 **Technical Scan** — {criteria} ({len(matches)} matches, strongest first)"]
+            lines += [_format_match(i, m) for i, m in enumerate(matches, 1)]
+            state.user_response = "\n".join(lines)
+        log_info(f"[TechnicalScanNode] ✅ {len(matches)} matches for {conditions}")
+    except Exception as e:
+        log_error(f"[TechnicalScanNode] ❌ Scan failed: {e}")
+        state.user_response = "Could not run the technical scan right now."
+    return state
@@ -48,19 +48,20 @@ def top_movers_node(state: TradingState) -> TradingState:
                 return state
 
         # ==========================================================
-        # 2️⃣ Fetch raw data
+        # 2️⃣ Fetch raw data (ranked top-k / bottom-k of a shared snapshot,
+        #    so the sign filter below never needs extra candidates)
         # ==========================================================
         if qtype == "top_gainers":
-            raw = get_top_movers(limit=limit * 3, timeframe=timeframe)
+            raw = get_top_movers(limit=limit, timeframe=timeframe)
 
         elif qtype == "top_losers":
-            raw = get_top_losers(limit=limit * 3, timeframe=timeframe)
+            raw = get_top_losers(limit=limit, timeframe=timeframe)
 
         elif qtype == "budget_picks":
-            raw = get_budget_picks(limit=limit * 3, max_price=query.budget or 15)
+            raw = get_budget_picks(limit=limit, max_price=query.budget or 15)
 
         else:
-            raw = get_top_movers(limit=limit * 3, timeframe="today")
+            raw = get_top_movers(limit=limit, timeframe="today")
 
         if not raw:
             raise ValueError("API returned no data")
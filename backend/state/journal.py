@@ -0,0 +1,273 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from threading import Lock, Event, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import json
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: no inter-process locking, one process only
+    fcntl = None
+
+from utils.logger import log_info, log_error
+from state.records import apply_record
+
+
+@contextmanager
+def _flocked(fh, mode: int):
+    """Hold an advisory inter-process lock on `fh` (no-op where fcntl is unavailable)."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(fh.fileno(), mode)
+    try:
+        yield
+    finally:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+class StateJournal:
+    """
+    📓 Append-only Write-Ahead Journal for SharedState
+    ------------------------------------------------------------
+    Every mutation is appended as one small JSON line instead of
+    rewriting the whole memory.json snapshot.
+
+      - Group commit: fsync runs every `fsync_interval` seconds
+        (0 → fsync on every append)
+      - Compaction: once the journal grows past `compact_bytes`, a
+        background pass folds it into the snapshot file
+      - Recovery: `load()` replays rotated + live records on top of
+        the snapshot
+
+    Compaction works purely on disk (snapshot + records), so it never
+    depends on any one process' in-memory view. Several processes may
+    share a journal: appends and rotation hold `<journal>.lock`, the
+    fold into the snapshot holds `<journal>.compact.lock` (flock), and
+    a writer whose handle points at a rotated file reopens the live one
+    before appending.
+    """
+
+    _open: Dict[str, "StateJournal"] = {}
+    _open_lock = Lock()
+
+    def __init__(
+        self,
+        path: str,
+        load_snapshot: Callable[[], Dict[str, Any]],
+        save_snapshot: Callable[[Dict[str, Any]], bool],
+        fsync_interval: float = 0.05,
+        compact_bytes: int = 8 * 1024 * 1024,
+    ):
+        self._path = path
+        self._rotated_path = f"{path}.old"
+        self._load_snapshot = load_snapshot
+        self._save_snapshot = save_snapshot
+        self._fsync_interval = max(0.0, fsync_interval)
+        self._compact_bytes = compact_bytes
+
+        self._io_lock = Lock()
+        self._compact_lock = Lock()
+        self._dirty = False
+        self._stop = Event()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._append_lock_fh = open(f"{path}.lock", "a")
+        self._compact_lock_fh = open(f"{path}.compact.lock", "a")
+        self._fh = open(self._path, "a", encoding="utf-8")
+        self._size = self._fh.tell()
+        self._reopened = False  # live file was rotated by another process (see `changes`)
+
+        self._worker = Thread(target=self._background_loop, name="StateJournal", daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def shared(cls, path: str, **kwargs) -> "StateJournal":
+        """Return the process-wide journal for `path` (one writer handle per file)."""
+        key = os.path.abspath(path)
+        with cls._open_lock:
+            journal = cls._open.get(key)
+            if journal is None:
+                journal = cls._open[key] = cls(path, **kwargs)
+            return journal
+
+    # --------------------------------------------------------
+    # Write Path
+    # --------------------------------------------------------
+    def write(self, record: Dict[str, Any]):
+        """Append one mutation record (fsync deferred to group commit)."""
+        line = json.dumps(record, default=str, separators=(",", ":")) + "\n"
+        with self._io_lock, _flocked(self._append_lock_fh, fcntl and fcntl.LOCK_EX):
+            self._follow_live_locked()
+            self._fh.write(line)
+            # Hand the line to the OS before releasing the lock, so a rotation in
+            # another process moves it along with the file (fsync stays batched)
+            self._fh.flush()
+            self._size += len(line)
+            if self._fsync_interval == 0:
+                self._sync_locked()
+            else:
+                self._dirty = True
+
+    def _follow_live_locked(self):
+        """Reopen the live journal if another process rotated it away from our handle."""
+        try:
+            live = os.stat(self._path).st_ino
+        except FileNotFoundError:
+            live = None
+        if live != os.fstat(self._fh.fileno()).st_ino:
+            self._fh.close()
+            self._fh = open(self._path, "a", encoding="utf-8")
+            self._reopened = True
+
+    def flush(self):
+        """Force pending records to stable storage."""
+        with self._io_lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._dirty = False
+
+    # --------------------------------------------------------
+    # Recovery
+    # --------------------------------------------------------
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Yield every persisted record, oldest first. Torn lines are skipped."""
+        with self._io_lock, _flocked(self._append_lock_fh, fcntl and fcntl.LOCK_SH):
+            self._fh.flush()
+            records = [r for path in (self._rotated_path, self._path) for r in self._read_records(path)]
+        yield from records
+
+    def load(self) -> Dict[str, Any]:
+        """Load the snapshot and replay the journal on top of it."""
+        with self._compact_lock, _flocked(self._compact_lock_fh, fcntl and fcntl.LOCK_SH):
+            doc = self._load_snapshot()
+            for record in self.replay():
+                apply_record(doc, record)
+            return doc
+
+    @staticmethod
+    def _read_records(path: str) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except Exception:
+                    log_error(f"[StateJournal] ⚠️ Skipping torn record in {path}")
+
+    # --------------------------------------------------------
+    # Compaction
+    # --------------------------------------------------------
+    def _rotate(self):
+        """Move the live journal aside (appending to a leftover rotated file)."""
+        with self._io_lock, _flocked(self._append_lock_fh, fcntl and fcntl.LOCK_EX):
+            self._sync_locked()
+            self._fh.close()
+            if os.path.exists(self._rotated_path):
+                with open(self._rotated_path, "a", encoding="utf-8") as old, \
+                        open(self._path, "r", encoding="utf-8") as live:
+                    old.write(live.read())
+                    old.flush()
+                    os.fsync(old.fileno())
+                os.remove(self._path)
+            else:
+                os.replace(self._path, self._rotated_path)
+            self._fh = open(self._path, "a", encoding="utf-8")
+            self._size = 0
+
+    def compact(self):
+        """Fold journaled records into the snapshot (one compaction at a time)."""
+        if not self._compact_lock.acquire(blocking=False):
+            return
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(self._compact_lock_fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return  # another process is compacting
+            started = time.perf_counter()
+            self._rotate()
+            doc = self._load_snapshot()
+            count = 0
+            for record in self._read_records(self._rotated_path):
+                apply_record(doc, record)
+                count += 1
+            if self._save_snapshot(doc):
+                os.remove(self._rotated_path)
+                log_info(
+                    f"[StateJournal] 🗜️ Compacted {count} records in "
+                    f"{time.perf_counter() - started:.2f}s"
+                )
+        except Exception as e:
+            log_error(f"[StateJournal] ❌ Compaction failed: {e}")
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._compact_lock_fh.fileno(), fcntl.LOCK_UN)
+            self._compact_lock.release()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def changes(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        If the journal's size or inode no longer matches what this
+        process wrote, another process has touched it and the caller
+        must reload ([{"op": "reload"}]).
+        """
+        with self._io_lock:
+            self._fh.flush()
+            if self._reopened:
+                self._reopened = False
+                self._size = os.fstat(self._fh.fileno()).st_size
+                return [{"op": "reload"}]
+            try:
+                st = os.stat(self._path)
+            except FileNotFoundError:
+                st = None
+            if st is not None and st.st_ino == os.fstat(self._fh.fileno()).st_ino:
+                if st.st_size == self._size:
+                    return None
+            else:
+                # Rotated or removed elsewhere: follow the live journal file
+                self._fh.close()
+                self._fh = open(self._path, "a", encoding="utf-8")
+            self._size = os.fstat(self._fh.fileno()).st_size
+        return [{"op": "reload"}]
+
+    # --------------------------------------------------------
+    # Background Group Commit + Compactor
+    # --------------------------------------------------------
+    def _background_loop(self):
+        interval = self._fsync_interval or 0.5
+        while not self._stop.wait(interval):
+            try:
+                with self._io_lock:
+                    if self._dirty:
+                        self._sync_locked()
+                if self._compact_bytes and self._size >= self._compact_bytes:
+                    self.compact()
+            except Exception as e:
+                log_error(f"[StateJournal] ⚠️ Background commit failed: {e}")
+
+    def close(self):
+        """Flush and stop the background worker."""
+        self._stop.set()
+        self._worker.join(timeout=2)
+        with self._io_lock:
+            if not self._fh.closed:
+                self._sync_locked()
+                self._fh.close()
+            self._append_lock_fh.close()
+            self._compact_lock_fh.close()
+        with self._open_lock:
+            self._open.pop(os.path.abspath(self._path), None)
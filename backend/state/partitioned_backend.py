@@ -0,0 +1,251 @@
+from __future__ import annotations
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import os
+import tempfile
+import time
+
+from utils.logger import log_info, log_error
+from state.records import NAMESPACES, empty_document
+from state.serialization import StateFormatError, decode_state, encode_state
+
+# Cache prefixes that get a partition of their own; other cache keys share "cache_misc"
+# ("trade" only holds entries written before last-trade state moved back to global_context)
+CACHE_PARTITIONS = ("news", "data", "insight", "trade", "fundamentals", "indicators", "analysis")
+
+# Seconds a dirty partition may wait before it is written (0 → write immediately)
+DEFAULT_FLUSH_SEC = {
+    "sessions": 0.0,
+    "global_context": 0.0,
+    "asset_profiles": 0.0,
+    "trades": 0.0,
+}
+
+
+def partition_for(ns: str, key: str) -> str:
+    """Route a (namespace, key) pair to its partition file."""
+    if ns == "cache":
+        prefix = key.split(":", 1)[0] if ":" in key else ""
+        return f"cache_{prefix}" if prefix in CACHE_PARTITIONS else "cache_misc"
+    if ns == "global_context" and key == "asset_profiles":
+        return "asset_profiles"
+    return ns
+
+
+class PartitionedStateBackend:
+    """
+    🧩 Partitioned JSON Storage Backend for SharedState
+    ------------------------------------------------------------
+    Persistence is split into independent files under one directory:
+
+      sessions.json · global_context.json · trades.json
+      asset_profiles.json · cache_news.json · cache_data.json
+      cache_insight.json · cache_trade.json · cache_fundamentals.json
+      cache_misc.json
+
+    A write only re-serializes the partition it touched, and each
+    partition has its own flush policy: user data is written
+    immediately, hot cache partitions are batched every
+    `cache_flush_sec` so news churn never rewrites sessions.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        load_legacy: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
+        cache_flush_sec: float = 5.0,
+        flush_policy: Optional[Dict[str, float]] = None,
+        state_format: str = "json",
+    ):
+        self._dir = directory
+        self._format = state_format
+        self._load_legacy = load_legacy
+        self._cache_flush_sec = cache_flush_sec
+        self._flush_policy = {**DEFAULT_FLUSH_SEC, **(flush_policy or {})}
+
+        self._lock = Lock()
+        self._write_locks: Dict[str, Lock] = {}
+        self._parts: Dict[str, Dict[str, Any]] = {}     # partition → {"ns", "entries"}
+        self._dirty_since: Dict[str, float] = {}        # partition → first unflushed write
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+        self._stop = Event()
+
+        os.makedirs(directory, exist_ok=True)
+        self._worker = Thread(target=self._flush_loop, name="PartitionFlusher", daemon=True)
+        self._worker.start()
+
+    # --------------------------------------------------------
+    # Partition Files
+    # --------------------------------------------------------
+    def _path(self, part: str) -> str:
+        return os.path.join(self._dir, f"{part}.json")
+
+    def _flush_delay(self, part: str) -> float:
+        if part in self._flush_policy:
+            return self._flush_policy[part]
+        return self._cache_flush_sec if part.startswith("cache_") else 0.0
+
+    def _signature(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _read_partition(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as f:
+                data = decode_state(f.read())
+            if isinstance(data, dict) and "ns" in data:
+                data.setdefault("entries", {})
+                return data
+        except StateFormatError as e:
+            # Readable by a newer build: don't treat it as empty (a flush would overwrite it)
+            log_error(f"[PartitionedStateBackend] ❌ Cannot decode partition {path}: {e}")
+            raise
+        except Exception as e:
+            log_error(f"[PartitionedStateBackend] ⚠️ Unreadable partition {path}: {e}")
+        return None
+
+    def _flush_partition(self, part: str):
+        """Serialize one partition and replace its file atomically."""
+        lock = self._write_locks.setdefault(part, Lock())
+        with lock:
+            with self._lock:
+                if part not in self._dirty_since:
+                    return
+                self._dirty_since.pop(part, None)
+                payload = encode_state(self._parts.get(part, {"ns": part, "entries": {}}), self._format)
+            path = self._path(part)
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self._dir, prefix=f".{part}_", suffix=".tmp")
+                with os.fdopen(fd, "wb") as tmpf:
+                    tmpf.write(payload)
+                    tmpf.flush()
+                    os.fsync(tmpf.fileno())
+                os.replace(tmp_path, path)
+                with self._lock:
+                    self._signatures[part] = self._signature(path)
+            except Exception as e:
+                log_error(f"[PartitionedStateBackend] ❌ Failed to write {part}: {e}")
+                with self._lock:
+                    self._dirty_since.setdefault(part, time.monotonic())
+
+    def _mark_dirty(self, part: str):
+        self._dirty_since.setdefault(part, time.monotonic())
+
+    # --------------------------------------------------------
+    # Backend Contract
+    # --------------------------------------------------------
+    def load(self) -> Dict[str, Any]:
+        """Read every partition (importing memory.json on first start)."""
+        files = [f for f in os.listdir(self._dir) if f.endswith(".json")]
+        if not files and self._load_legacy:
+            legacy = self._load_legacy()
+            if legacy:
+                for ns in NAMESPACES:
+                    for key, value in (legacy.get(ns) or {}).items():
+                        self.write({"op": "put", "ns": ns, "key": key, "value": value}, defer=True)
+                self.flush()
+                log_info(f"[PartitionedStateBackend] 📥 Split memory.json into {len(self._parts)} partitions")
+            files = [f for f in os.listdir(self._dir) if f.endswith(".json")]
+
+        doc = empty_document()
+        with self._lock:
+            for name in files:
+                part = name[:-len(".json")]
+                path = self._path(part)
+                data = self._read_partition(path)
+                if data is None:
+                    continue
+                self._parts[part] = data
+                self._signatures[part] = self._signature(path)
+                doc.setdefault(data["ns"], {}).update(data["entries"])
+        return doc
+
+    def write(self, record: Dict[str, Any], defer: bool = False):
+        """Apply one record to its partition; flush now or per the partition's policy."""
+        op = record.get("op")
+        if op == "clear":
+            with self._lock:
+                for part, data in self._parts.items():
+                    data["entries"] = {}
+                    self._mark_dirty(part)
+            if not defer:
+                self.flush()
+            return
+        if op not in {"put", "del"}:
+            return
+
+        ns, key = record["ns"], record["key"]
+        part = partition_for(ns, key)
+        with self._lock:
+            data = self._parts.setdefault(part, {"ns": ns, "entries": {}})
+            if op == "put":
+                data["entries"][key] = record.get("value")
+            else:
+                data["entries"].pop(key, None)
+            self._mark_dirty(part)
+        if not defer and self._flush_delay(part) <= 0:
+            self._flush_partition(part)
+
+    def changes(self) -> Optional[List[Dict[str, Any]]]:
+        """Partitions rewritten by another process, diffed into put/del records."""
+        records: List[Dict[str, Any]] = []
+        for name in os.listdir(self._dir):
+            if not name.endswith(".json"):
+                continue
+            part = name[:-len(".json")]
+            path = self._path(part)
+            sig = self._signature(path)
+            with self._lock:
+                if sig is None or sig == self._signatures.get(part) or part in self._dirty_since:
+                    continue
+            data = self._read_partition(path)
+            if data is None:
+                continue
+            with self._lock:
+                old = self._parts.get(part, {"entries": {}})["entries"]
+                new = data["entries"]
+                records.extend(
+                    {"op": "put", "ns": data["ns"], "key": k, "value": v}
+                    for k, v in new.items() if old.get(k, None) != v or k not in old
+                )
+                records.extend({"op": "del", "ns": data["ns"], "key": k} for k in old if k not in new)
+                self._parts[part] = data
+                self._signatures[part] = sig
+        return records or None
+
+    def flush(self):
+        """Write every dirty partition now."""
+        with self._lock:
+            dirty = list(self._dirty_since)
+        for part in dirty:
+            self._flush_partition(part)
+
+    def compact(self):
+        self.flush()
+
+    def partition_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Entry count and dirty flag per partition."""
+        with self._lock:
+            return {
+                part: {"entries": len(data["entries"]), "dirty": part in self._dirty_since}
+                for part, data in self._parts.items()
+            }
+
+    # --------------------------------------------------------
+    # Background Flusher (batched cache partitions)
+    # --------------------------------------------------------
+    def _flush_loop(self):
+        while not self._stop.wait(0.5):
+            now = time.monotonic()
+            with self._lock:
+                due = [p for p, since in self._dirty_since.items() if now - since >= self._flush_delay(p)]
+            for part in due:
+                self._flush_partition(part)
+
+    def close(self):
+        self._stop.set()
+        self._worker.join(timeout=2)
+        self.flush()
@@ -0,0 +1,29 @@
+from typing import Any, Dict
+
+# Namespaces every storage backend persists
+#   sessions       → user_id → serialized TradingState
+#   global_context → global memory (last_intent, asset_profiles, ...)
+#   cache          → TTL cache entries {"value", "expires_at"}
+#   trades         → user_id → executed trade history
+NAMESPACES = ("sessions", "global_context", "cache", "trades")
+
+
+def empty_document() -> Dict[str, Any]:
+    """A blank raw state document."""
+    doc: Dict[str, Any] = {ns: {} for ns in NAMESPACES}
+    doc["last_updated"] = None
+    return doc
+
+
+def apply_record(doc: Dict[str, Any], record: Dict[str, Any]):
+    """Apply one mutation record to a raw {namespace: {key: value}} document."""
+    op = record.get("op")
+    if op == "put":
+        doc.setdefault(record["ns"], {})[record["key"]] = record.get("value")
+    elif op == "del":
+        doc.setdefault(record["ns"], {}).pop(record["key"], None)
+    elif op == "clear":
+        for ns in NAMESPACES:
+            doc[ns] = {}
+    if record.get("ts"):
+        doc["last_updated"] = record["ts"]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+from datetime import date, datetime
+from typing import Any, List
+import json
+
+from utils.logger import log_error
+
+# Optional fast codecs (plain JSON is always available)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+# Versioned files start with MAGIC + format version + codec id.
+# Files without the header are legacy JSON (memory.json as written before).
+MAGIC = b"TAST"
+FORMAT_VERSION = 1
+_CODEC_IDS = {"json-compact": 0, "orjson": 1, "msgpack": 2}
+_CODEC_NAMES = {v: k for k, v in _CODEC_IDS.items()}
+
+
+class StateFormatError(ValueError):
+    """Raised for state files this build cannot decode (newer version, missing codec)."""
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder: datetimes first (the common case), then numpy scalars, then str."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, "item"):
+        try:
+            return obj.item()
+        except Exception:
+            pass
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+def available_formats() -> List[str]:
+    """Formats usable in this environment, fastest first."""
+    # orjson encodes datetimes natively; msgpack goes through the Python default hook
+    formats = [name for name, mod in (("orjson", orjson), ("msgpack", msgpack)) if mod is not None]
+    return formats + ["json-compact", "json"]
+
+
+def resolve_format(name: str) -> str:
+    """
+    Map a configured format to one that can actually be written:
+      json   → legacy indented JSON (no header, readable by older builds)
+      binary → best available codec (orjson > msgpack > compact JSON)
+    """
+    name = (name or "json").lower()
+    if name in {"binary", "auto"}:
+        return available_formats()[0]
+    if name in available_formats():
+        return name
+    if name in _CODEC_IDS:
+        fallback = available_formats()[0]
+        log_error(f"[StateSerialization] ⚠️ '{name}' is not installed, writing '{fallback}' instead.")
+        return fallback
+    if name != "json":
+        log_error(f"[StateSerialization] ⚠️ Unknown state format '{name}', using json.")
+    return "json"
+
+
+def encode_state(doc: Any, fmt: str = "json") -> bytes:
+    """Encode a raw state document in `fmt` (see `resolve_format`)."""
+    if fmt == "json":
+        return json.dumps(doc, indent=4, default=_default).encode("utf-8")
+
+    if fmt == "msgpack":
+        payload = msgpack.packb(doc, default=_default, use_bin_type=True)
+    elif fmt == "orjson":
+        payload = orjson.dumps(
+            doc, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    else:
+        payload = json.dumps(doc, default=_default, separators=(",", ":")).encode("utf-8")
+    return MAGIC + bytes((FORMAT_VERSION, _CODEC_IDS[fmt])) + payload
+
+
+def decode_state(data: bytes) -> Any:
+    """Decode a versioned state file, or a legacy JSON one."""
+    if not data.startswith(MAGIC):
+        return json.loads(data.decode("utf-8"))
+
+    version, codec_id = data[len(MAGIC)], data[len(MAGIC) + 1]
+    if version > FORMAT_VERSION:
+        raise StateFormatError(f"state format v{version} is newer than supported v{FORMAT_VERSION}")
+    codec = _CODEC_NAMES.get(codec_id)
+    payload = data[len(MAGIC) + 2:]
+
+    if codec == "msgpack":
+        if msgpack is None:
+            raise StateFormatError("state file is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if codec == "orjson":
+        # orjson output is plain JSON; the stdlib can read it when orjson is missing
+        return orjson.loads(payload) if orjson is not None else json.loads(payload.decode("utf-8"))
+    if codec == "json-compact":
+        return json.loads(payload.decode("utf-8"))
+    raise StateFormatError(f"unknown state codec id {codec_id}")
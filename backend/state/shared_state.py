@@ -1,16 +1,54 @@
 from __future__ import annotations
-from threading import RLock
-from typing import Dict, Optional, Any
+from threading import RLock, Thread
+from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-import json
+from weakref import WeakSet
 import os
 import tempfile
+import time
 
 from core.schemas import TradingState, ExecutedTrade
 from utils.logger import log_info, log_error
+from state.journal import StateJournal
+from state.partitioned_backend import PartitionedStateBackend
+from state.records import apply_record
+from state.serialization import StateFormatError, decode_state, encode_state, resolve_format
+from state.sqlite_backend import SQLiteStateBackend
+from state.ttl_cache import TTLCache, TTL
 
 MEMORY_PATH = os.path.join("state", "memory.json")
 
+# Storage backend: "json" (full memory.json rewrite), "journal", "sqlite" or "partitioned"
+JOURNAL_ENABLED = os.getenv("SHARED_STATE_JOURNAL", "0").lower() in {"1", "true", "yes"}
+STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "journal" if JOURNAL_ENABLED else "json").lower()
+SQLITE_PATH = os.getenv("SHARED_STATE_DB", os.path.join("state", "memory.db"))
+JOURNAL_FSYNC_MS = int(os.getenv("SHARED_STATE_FSYNC_MS", "50"))
+JOURNAL_COMPACT_BYTES = int(os.getenv("SHARED_STATE_COMPACT_BYTES", str(8 * 1024 * 1024)))
+
+# Partitioned backend: directory of per-partition files, cache partitions batched
+PARTITION_DIR = os.getenv("SHARED_STATE_PARTITION_DIR", os.path.join("state", "memory"))
+PARTITION_CACHE_FLUSH_SEC = float(os.getenv("SHARED_STATE_CACHE_FLUSH_SEC", "5"))
+
+# On-disk encoding of snapshot / partition files: "json" (legacy, indented) or
+# "binary" (msgpack / orjson when installed, versioned header). Legacy JSON is always readable.
+STATE_FORMAT = os.getenv("SHARED_STATE_FORMAT", "json")
+
+# Cross-process coherence: how often reads check for writes by other processes
+STATE_POLL_SEC = float(os.getenv("SHARED_STATE_POLL_SEC", "1.0"))
+
+# Sessions idle longer than this are dropped from memory (persisted copy is kept)
+SESSION_IDLE_SEC = float(os.getenv("SHARED_STATE_SESSION_IDLE_SEC", "1800"))
+
+# TTL cache namespace (LRU-capped, swept in the background)
+CACHE_MAX_ENTRIES = int(os.getenv("SHARED_STATE_CACHE_MAX_ENTRIES", "2000"))
+CACHE_MAX_BYTES = int(os.getenv("SHARED_STATE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_SWEEP_SEC = float(os.getenv("SHARED_STATE_CACHE_SWEEP_SEC", "60"))
+
+# Hand-rolled caches that used to live in global_context (dropped on load)
+LEGACY_CACHE_PREFIXES = ("news:", "data:", "insight:")
+# Durable entries that must stay in global_context (moved back out of the cache on load)
+DURABLE_GLOBAL_PREFIXES = ("trade:",)
+
 
 class SharedState:
     """
@@ -22,23 +60,47 @@ class SharedState:
 
     _instance: Optional["SharedState"] = None
     _lock = RLock()
-
-    def __init__(self, memory_file: str = MEMORY_PATH):
+    _sweep_targets: "WeakSet[SharedState]" = WeakSet()
+    _sweeper: Optional[Thread] = None
+
+    def __init__(
+        self,
+        memory_file: str = MEMORY_PATH,
+        backend: Optional[str] = None,
+        state_format: Optional[str] = None,
+    ):
         self._memory_file = memory_file
+        self._format = resolve_format(state_format or STATE_FORMAT)
         self._state: Dict[str, Any] = {
-            "sessions": {},        # user_id → TradingState
+            "sessions": {},        # user_id → TradingState (hydrated, recently used)
             "global_context": {},  # global memory / cache
             "last_updated": datetime.utcnow(),
         }
+        self._trades: Dict[str, List[Dict[str, Any]]] = {}  # user_id → executed trades
+        self._raw_sessions: Dict[str, Any] = {}      # user_id → serialized session (not hydrated)
+        self._session_access: Dict[str, float] = {}  # user_id → last access (monotonic)
+        self._cache = TTLCache(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, on_discard=self._on_cache_discard)
+        self._io_stats = {"disk_reads": 0, "full_reloads": 0, "incremental_reloads": 0, "polls": 0}
+        self._disk_signature: Optional[tuple] = None
+        self._next_poll = time.monotonic() + STATE_POLL_SEC
+
+        self._backend = self._open_backend((backend or STATE_BACKEND).lower())
+        # Backends that can point-read a session never load them up front
+        self._lazy_sessions = "sessions" in getattr(self._backend, "lazy_namespaces", ())
 
         try:
-            disk = self._load_from_disk_raw()
+            disk = self._load_persisted()
             self._restore_from_disk(disk)
             log_info("[SharedState] ✅ Loaded from disk successfully.")
+        except StateFormatError:
+            # Starting empty would overwrite state this build can't read
+            raise
         except Exception as e:
             log_error(f"[SharedState] ⚠️ Disk restore failed: {e}")
             pass
 
+        self._register_sweeper(self)
+
     # --------------------------------------------------------
     # Singleton Accessor
     # --------------------------------------------------------
@@ -49,6 +111,133 @@ class SharedState:
                 cls._instance = cls()
             return cls._instance
 
+    # --------------------------------------------------------
+    # Storage Backend Selection
+    # --------------------------------------------------------
+    def _journal_path(self) -> str:
+        return os.path.splitext(self._memory_file)[0] + ".journal"
+
+    def _open_backend(self, kind: str):
+        """Return a record-based backend, or None for legacy full rewrites."""
+        if kind == "journal":
+            return StateJournal.shared(
+                self._journal_path(),
+                load_snapshot=self._load_from_disk_raw,
+                save_snapshot=self._save_to_disk_raw,
+                fsync_interval=JOURNAL_FSYNC_MS / 1000.0,
+                compact_bytes=JOURNAL_COMPACT_BYTES,
+            )
+        if kind == "sqlite":
+            db_path = SQLITE_PATH if self._memory_file == MEMORY_PATH else (
+                os.path.splitext(self._memory_file)[0] + ".db"
+            )
+            return SQLiteStateBackend(db_path, load_legacy=self._load_legacy_snapshot)
+        if kind == "partitioned":
+            directory = PARTITION_DIR if self._memory_file == MEMORY_PATH else (
+                os.path.splitext(self._memory_file)[0]
+            )
+            return PartitionedStateBackend(
+                directory,
+                load_legacy=self._load_legacy_snapshot,
+                cache_flush_sec=PARTITION_CACHE_FLUSH_SEC,
+                state_format=self._format,
+            )
+        if kind != "json":
+            log_error(f"[SharedState] ⚠️ Unknown backend '{kind}', using json.")
+        return None
+
+    def _load_persisted(self) -> Dict[str, Any]:
+        """Load the raw document from whichever backend is active."""
+        self._io_stats["disk_reads"] += 1
+        if self._backend is not None:
+            return self._backend.load()
+        doc = self._load_from_disk_raw()
+        self._disk_signature = self._file_signature()
+        return doc
+
+    # --------------------------------------------------------
+    # Cross-process Coherence (reads stay in memory)
+    # --------------------------------------------------------
+    def _file_signature(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self._memory_file)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _refresh_if_stale(self):
+        """Pick up writes from other processes; at most one cheap check per poll interval."""
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        with self._lock:
+            if now < self._next_poll:
+                return
+            self._next_poll = now + STATE_POLL_SEC
+            self._io_stats["polls"] += 1
+            try:
+                if self._backend is None:
+                    changed = self._file_signature() != self._disk_signature
+                    records = [{"op": "reload"}] if changed else None
+                else:
+                    records = self._backend.changes()
+                if not records:
+                    return
+
+                if any(r.get("op") == "reload" for r in records):
+                    self._restore_from_disk(self._load_persisted())
+                    self._io_stats["full_reloads"] += 1
+                    log_info("[SharedState] 🔄 Reloaded after external write.")
+                else:
+                    for record in records:
+                        self._apply_external(record)
+                    self._io_stats["disk_reads"] += 1
+                    self._io_stats["incremental_reloads"] += 1
+            except Exception as e:
+                log_error(f"[SharedState] ⚠️ Change detection failed: {e}")
+
+    def _apply_external(self, record: Dict[str, Any]):
+        """Apply one row changed by another process to the in-memory view."""
+        ns, key, put = record.get("ns"), record.get("key"), record.get("op") == "put"
+        if ns == "sessions":
+            if key in self._state["sessions"]:
+                self._state["sessions"].pop(key)
+                self._session_access.pop(key, None)
+            if put and not self._lazy_sessions:
+                self._raw_sessions[key] = record.get("value")
+            elif not put:
+                self._raw_sessions.pop(key, None)
+        elif ns == "global_context":
+            if put:
+                self._state["global_context"][key] = record.get("value")
+            else:
+                self._state["global_context"].pop(key, None)
+        elif ns == "cache":
+            if put:
+                self._cache.load({key: record.get("value")})
+            else:
+                self._cache.delete(key)
+        elif ns == "trades":
+            if put:
+                self._trades[key] = list(record.get("value") or [])
+            else:
+                self._trades.pop(key, None)
+
+    def io_stats(self) -> Dict[str, int]:
+        """Disk read / reload counters (reads served from memory are not counted)."""
+        return dict(self._io_stats)
+
+    def _load_legacy_snapshot(self) -> Optional[Dict[str, Any]]:
+        """memory.json plus any leftover journal records (used for migration)."""
+        if not os.path.exists(self._memory_file):
+            return None
+        doc = self._load_from_disk_raw()
+        journal_path = self._journal_path()
+        for path in (f"{journal_path}.old", journal_path):
+            for record in StateJournal._read_records(path):
+                apply_record(doc, record)
+        return doc
+
     # --------------------------------------------------------
     # Disk IO Helpers
     # --------------------------------------------------------
@@ -56,54 +245,89 @@ class SharedState:
         os.makedirs(os.path.dirname(self._memory_file) or ".", exist_ok=True)
 
     def _load_from_disk_raw(self) -> Dict[str, Any]:
-        """Safely load memory.json from disk."""
+        """Safely load memory.json from disk (versioned binary or legacy JSON)."""
         if not os.path.exists(self._memory_file):
             self._ensure_dir()
             baseline = {"sessions": {}, "global_context": {}, "last_updated": None}
-            with open(self._memory_file, "w", encoding="utf-8") as f:
-                json.dump(baseline, f, indent=4)
+            with open(self._memory_file, "wb") as f:
+                f.write(encode_state(baseline, self._format))
             return baseline
         try:
-            with open(self._memory_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
+            with open(self._memory_file, "rb") as f:
+                return decode_state(f.read())
+        except StateFormatError as e:
+            # A valid file this build can't read (newer version, codec not installed): leave it in place
+            log_error(f"[SharedState] ❌ Cannot decode {self._memory_file}: {e}")
+            raise
+        except (ValueError, IndexError) as e:
+            # Truncated / malformed content only: move it aside and start empty
             corrupt_path = f"{self._memory_file}.corrupt.{int(datetime.utcnow().timestamp())}"
             try:
                 os.rename(self._memory_file, corrupt_path)
             except Exception:
                 pass
-            log_error(f"[SharedState] ⚠️ Corrupt memory.json backed up as {corrupt_path}")
+            log_error(f"[SharedState] ⚠️ Unreadable memory.json ({e}) backed up as {corrupt_path}")
             return {"sessions": {}, "global_context": {}, "last_updated": None}
 
-    def _save_to_disk_raw(self, data: Dict[str, Any]):
+    def _save_to_disk_raw(self, data: Dict[str, Any]) -> bool:
         """Atomic save to memory.json."""
         try:
             self._ensure_dir()
             dirpath = os.path.dirname(self._memory_file) or "."
+            payload = encode_state(data, self._format)
             fd, tmp_path = tempfile.mkstemp(dir=dirpath, prefix="memory_", suffix=".json")
-            with os.fdopen(fd, "w", encoding="utf-8") as tmpf:
-                json.dump(data, tmpf, indent=4, default=str)
+            with os.fdopen(fd, "wb") as tmpf:
+                tmpf.write(payload)
                 tmpf.flush()
                 os.fsync(tmpf.fileno())
             os.replace(tmp_path, self._memory_file)
+            return True
         except Exception as e:
             log_error(f"[SharedState] ❌ Failed to save memory: {e}")
+            return False
 
     # --------------------------------------------------------
     # Internal State Management
     # --------------------------------------------------------
-    def _restore_from_disk(self, disk: Dict[str, Any]):
-        """Rehydrate TradingState objects from disk JSON."""
-        sessions = disk.get("sessions", {}) or {}
-        restored_sessions: Dict[str, TradingState] = {}
-        for user_id, raw in sessions.items():
-            try:
-                restored_sessions[user_id] = TradingState.model_validate(raw)
-            except Exception:
-                restored_sessions[user_id] = TradingState(symbol="")
+    @staticmethod
+    def _hydrate_session(raw: Any) -> TradingState:
+        try:
+            return TradingState.model_validate(raw)
+        except Exception:
+            return TradingState(symbol="")
 
-        self._state["sessions"] = restored_sessions
-        self._state["global_context"] = disk.get("global_context", {}) or {}
+    def _restore_from_disk(self, disk: Dict[str, Any]):
+        """Restore disk JSON; sessions stay serialized until first use."""
+        self._state["sessions"] = {}
+        self._session_access = {}
+        self._raw_sessions = dict(disk.get("sessions", {}) or {})
+
+        global_context = disk.get("global_context", {}) or {}
+        legacy = [k for k in global_context if k.startswith(LEGACY_CACHE_PREFIXES)]
+        for key in legacy:
+            del global_context[key]
+        self._state["global_context"] = global_context
+
+        self._trades = {uid: list(trades or []) for uid, trades in (disk.get("trades", {}) or {}).items()}
+
+        cache = dict(disk.get("cache", {}) or {})
+        durable = [k for k in cache if k.startswith(DURABLE_GLOBAL_PREFIXES)]
+        for key in durable:
+            entry = cache.pop(key)
+            if key not in global_context and isinstance(entry, dict):
+                global_context[key] = entry.get("value")
+
+        self._cache.clear()
+        expired = self._cache.load(cache)
+        if self._backend is not None:
+            for key in legacy:
+                self._write_record({"op": "del", "ns": "global_context", "key": key})
+            for key in durable:
+                if key in global_context:
+                    self._write_record({"op": "put", "ns": "global_context", "key": key, "value": global_context[key]})
+                self._write_record({"op": "del", "ns": "cache", "key": key})
+            for key in expired:
+                self._on_cache_discard(key)
         last = disk.get("last_updated")
         try:
             self._state["last_updated"] = datetime.fromisoformat(last) if last else datetime.utcnow()
@@ -112,11 +336,14 @@ class SharedState:
 
     def _serialize_for_disk(self) -> Dict[str, Any]:
         """Serialize in-memory state for disk persistence."""
-        serial_sessions: Dict[str, Any] = {}
+        serial_sessions: Dict[str, Any] = dict(self._raw_sessions)
+        if self._lazy_sessions:
+            serial_sessions.update(self._backend.load_namespace("sessions"))
         for uid, state_obj in self._state.get("sessions", {}).items():
             try:
                 if isinstance(state_obj, TradingState):
-                    serial_sessions[uid] = state_obj.model_dump()
+                    # mode="json" converts datetimes in pydantic-core, not in the encoder
+                    serial_sessions[uid] = state_obj.model_dump(mode="json")
                 elif hasattr(state_obj, "dict"):
                     serial_sessions[uid] = state_obj.dict()
                 else:
@@ -127,21 +354,90 @@ class SharedState:
         return {
             "sessions": serial_sessions,
             "global_context": self._state.get("global_context", {}),
+            "cache": self._cache.dump(),
+            "trades": self._trades,
             "last_updated": datetime.utcnow().isoformat(),
         }
 
+    # --------------------------------------------------------
+    # Persistence (backend record or full snapshot)
+    # --------------------------------------------------------
+    def _persist_session(self, user_id: str):
+        if self._backend is None:
+            return self._save_to_disk()
+        state_obj = self._state["sessions"].get(user_id)
+        value = state_obj.model_dump(mode="json") if isinstance(state_obj, TradingState) else state_obj
+        self._write_record({"op": "put", "ns": "sessions", "key": user_id, "value": value})
+
+    def _persist_global(self, key: str):
+        if self._backend is None:
+            return self._save_to_disk()
+        if key in self._state["global_context"]:
+            value = self._state["global_context"][key]
+            self._write_record({"op": "put", "ns": "global_context", "key": key, "value": value})
+        else:
+            self._write_record({"op": "del", "ns": "global_context", "key": key})
+
+    def _persist_trades(self, user_id: str):
+        if self._backend is None:
+            return self._save_to_disk()
+        self._write_record({"op": "put", "ns": "trades", "key": user_id, "value": self._trades[user_id]})
+
+    def _on_cache_discard(self, key: str):
+        """Expired / evicted cache entry: drop its row (json mode drops it on next save)."""
+        if self._backend is not None:
+            self._write_record({"op": "del", "ns": "cache", "key": key})
+
+    def _write_record(self, record: Dict[str, Any]):
+        record["ts"] = datetime.utcnow().isoformat()
+        try:
+            self._backend.write(record)
+        except Exception as e:
+            log_error(f"[SharedState] ❌ Failed to persist {record.get('op')} {record.get('key')}: {e}")
+
     # --------------------------------------------------------
     # 🔑 Modern API (User & Global)
     # --------------------------------------------------------
     def get_user_state(self, user_id: str) -> TradingState:
-        """Return or create a user session TradingState."""
+        """Return or create a user session TradingState (hydrated on first touch)."""
+        self._refresh_if_stale()
         with self._lock:
             sessions = self._state.setdefault("sessions", {})
             if user_id not in sessions:
-                sessions[user_id] = TradingState(symbol="")
-                self._save_to_disk()
+                raw = self._raw_sessions.pop(user_id, None)
+                if raw is None and self._lazy_sessions:
+                    self._io_stats["disk_reads"] += 1
+                    raw = self._backend.get("sessions", user_id)
+                if raw is not None:
+                    sessions[user_id] = self._hydrate_session(raw)
+                else:
+                    sessions[user_id] = TradingState(symbol="")
+                    self._persist_session(user_id)
+            self._session_access[user_id] = time.monotonic()
             return sessions[user_id]
 
+    def evict_idle_sessions(self, max_idle: Optional[float] = None) -> int:
+        """
+        Drop sessions untouched for `max_idle` seconds from memory.
+        Every mutation is already persisted, so nothing is lost: lazy
+        backends re-read the row, others keep the serialized form.
+        """
+        idle = SESSION_IDLE_SEC if max_idle is None else max_idle
+        cutoff = time.monotonic() - idle
+        with self._lock:
+            stale = [uid for uid, seen in self._session_access.items() if seen <= cutoff]
+            for uid in stale:
+                self._session_access.pop(uid, None)
+                state_obj = self._state["sessions"].pop(uid, None)
+                if state_obj is not None and not self._lazy_sessions:
+                    self._raw_sessions[uid] = state_obj.model_dump(mode="json")
+            return len(stale)
+
+    def session_stats(self) -> Dict[str, int]:
+        """Hydrated vs. serialized session counts held in memory."""
+        with self._lock:
+            return {"hydrated": len(self._state["sessions"]), "serialized": len(self._raw_sessions)}
+
     def update_user_state(self, user_id: str, key: str, value: Any):
         """Update field for a user's TradingState."""
         with self._lock:
@@ -153,17 +449,18 @@ class SharedState:
                 data[key] = value
                 self._state["sessions"][user_id] = TradingState.model_validate(data)
             self._state["last_updated"] = datetime.utcnow()
-            self._save_to_disk()
+            self._persist_session(user_id)
 
     def set_global(self, key: str, value: Any):
         """Set global variable or cached data."""
         with self._lock:
             self._state.setdefault("global_context", {})[key] = value
             self._state["last_updated"] = datetime.utcnow()
-            self._save_to_disk()
+            self._persist_global(key)
 
     def get_global(self, key: str, default: Any = None) -> Any:
         """Fetch global context value."""
+        self._refresh_if_stale()
         with self._lock:
             return self._state.get("global_context", {}).get(key, default)
 
@@ -183,20 +480,90 @@ class SharedState:
         with self._lock:
             if key in self._state.get("global_context", {}):
                 del self._state["global_context"][key]
+                self._persist_global(key)
+
+    # --------------------------------------------------------
+    # ⏳ TTL Cache Namespace (lazy expiry + LRU cap)
+    # --------------------------------------------------------
+    def cache_get(self, key: str, default: Any = None) -> Any:
+        """Return a fresh cached value, or `default` if missing / expired."""
+        self._refresh_if_stale()
+        return self._cache.get(key, default)
+
+    def cache_set(self, key: str, value: Any, ttl: TTL = None):
+        """Cache `value` for `ttl` (seconds or timedelta; None → until evicted)."""
+        with self._lock:
+            self._cache.set(key, value, ttl)
+            if self._backend is None:
+                return self._save_to_disk()
+            entry = self._cache.entry(key)
+            if entry is not None:
+                self._write_record({"op": "put", "ns": "cache", "key": key, "value": entry})
+
+    def cache_delete(self, key: str):
+        """Drop one cache entry."""
+        with self._lock:
+            if self._cache.delete(key):
+                if self._backend is None:
+                    return self._save_to_disk()
+                self._write_record({"op": "del", "ns": "cache", "key": key})
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """hit / miss / eviction / expiration counters and current size."""
+        return self._cache.stats()
+
+    def sweep_cache(self) -> int:
+        """Remove expired cache entries now; returns how many were dropped."""
+        with self._lock:
+            removed = self._cache.sweep()
+            if removed and self._backend is None:
                 self._save_to_disk()
+            return len(removed)
+
+    @classmethod
+    def _register_sweeper(cls, instance: "SharedState"):
+        """One background sweeper thread serves every live SharedState."""
+        with cls._lock:
+            cls._sweep_targets.add(instance)
+            if cls._sweeper is None and CACHE_SWEEP_SEC > 0:
+                cls._sweeper = Thread(target=cls._sweep_loop, name="SharedStateSweeper", daemon=True)
+                cls._sweeper.start()
+
+    @classmethod
+    def _sweep_loop(cls):
+        while True:
+            time.sleep(CACHE_SWEEP_SEC)
+            for instance in list(cls._sweep_targets):
+                try:
+                    instance.sweep_cache()
+                    if SESSION_IDLE_SEC > 0:
+                        instance.evict_idle_sessions()
+                except Exception as e:
+                    log_error(f"[SharedState] ⚠️ Cache sweep failed: {e}")
 
     # --------------------------------------------------------
     # 💹 Trade Record Management
     # --------------------------------------------------------
     def record_trade(self, user_id: str, trade: ExecutedTrade):
-        """Append an executed trade to user trade history."""
+        """Append an executed trade to the user's history (own namespace, not the session)."""
+        entry = trade.model_dump(mode="json") if isinstance(trade, ExecutedTrade) else dict(trade)
         with self._lock:
-            state = self.get_user_state(user_id)
-            if not hasattr(state, "trade_history") or state.trade_history is None:
-                state.trade_history = []
-            state.trade_history.append(trade)
+            self._trades.setdefault(user_id, []).append(entry)
             self._state["last_updated"] = datetime.utcnow()
-            self._save_to_disk()
+            self._persist_trades(user_id)
+
+    def get_trade_history(self, user_id: str) -> List[ExecutedTrade]:
+        """Executed trades recorded for `user_id`, oldest first."""
+        self._refresh_if_stale()
+        with self._lock:
+            history = list(self._trades.get(user_id, []))
+        trades: List[ExecutedTrade] = []
+        for raw in history:
+            try:
+                trades.append(ExecutedTrade.model_validate(raw))
+            except Exception:
+                continue
+        return trades
 
     # --------------------------------------------------------
     # 🧾 Utility / Maintenance
@@ -210,13 +577,29 @@ class SharedState:
         """Completely reset shared memory."""
         with self._lock:
             self._state = {"sessions": {}, "global_context": {}, "last_updated": datetime.utcnow()}
-            self._save_to_disk()
+            self._raw_sessions = {}
+            self._session_access = {}
+            self._trades = {}
+            self._cache.clear()
+            if self._backend is not None:
+                self._write_record({"op": "clear"})
+            else:
+                self._save_to_disk()
             log_info("[SharedState] 🧹 Cleared all cached memory.")
 
     def _save_to_disk(self):
-        """Public wrapper for atomic save."""
+        """Public wrapper for atomic save (record backends: flush pending writes)."""
+        if self._backend is not None:
+            self._backend.flush()
+            return
         payload = self._serialize_for_disk()
-        self._save_to_disk_raw(payload)
+        if self._save_to_disk_raw(payload):
+            self._disk_signature = self._file_signature()
+
+    def compact(self):
+        """Compact the backend storage (journal fold / WAL checkpoint / partition flush)."""
+        if self._backend is not None:
+            self._backend.compact()
 
 
 # --------------------------------------------------------
@@ -227,7 +610,7 @@ shared_state = SharedState.get_instance()
 
 def load_memory() -> dict:
     """Legacy alias for older modules."""
-    return shared_state._load_from_disk_raw()
+    return shared_state._load_persisted()
 
 
 def save_memory() -> None:
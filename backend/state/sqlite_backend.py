@@ -0,0 +1,276 @@
+from __future__ import annotations
+from threading import local, Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import time
+
+from utils.logger import log_info, log_error
+from state.records import NAMESPACES, empty_document
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    ns          TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    updated_at  TEXT,
+    PRIMARY KEY (ns, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT
+);
+CREATE TABLE IF NOT EXISTS changes (
+    version  INTEGER PRIMARY KEY AUTOINCREMENT,
+    ns       TEXT NOT NULL,
+    key      TEXT NOT NULL
+);
+"""
+
+# Change-log rows kept for other processes to catch up incrementally
+CHANGELOG_KEEP = 20_000
+
+
+class SQLiteStateBackend:
+    """
+    🗄️ SQLite (WAL) Storage Backend for SharedState
+    ------------------------------------------------------------
+    One row per (namespace, key): a session update or a cache write
+    touches only its own row instead of rewriting memory.json.
+
+      - WAL journal mode → readers never block the single writer
+      - busy_timeout + BEGIN IMMEDIATE → several uvicorn workers can
+        share one database file safely
+      - First start imports an existing memory.json (exactly once,
+        guarded by the `meta` table)
+      - `changes()` tells a process what other writers touched, using
+        `PRAGMA data_version` as a free "anything new?" check and the
+        `changes` log to fetch only the affected rows
+      - Sessions are never bulk-loaded; `get("sessions", uid)` reads
+        one row on demand, so startup cost ignores the session count
+    """
+
+    lazy_namespaces = ("sessions",)
+
+    def __init__(
+        self,
+        db_path: str,
+        load_legacy: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
+        busy_timeout_ms: int = 5000,
+    ):
+        self._db_path = db_path
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = local()
+        self._init_lock = Lock()
+
+        # Change tracking (versions written by this process are skipped)
+        self._poll_lock = Lock()
+        self._own_versions: set = set()
+        self._seen_version = 0
+        self._data_version: Optional[int] = None
+        self._writes = 0
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        self._migrate(load_legacy)
+        self._poll_conn = self._connect()
+
+    # --------------------------------------------------------
+    # Connection Handling (one connection per thread)
+    # --------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=self._busy_timeout_ms / 1000.0,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self._busy_timeout_ms)}")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # --------------------------------------------------------
+    # One-time Migration from memory.json
+    # --------------------------------------------------------
+    def _migrate(self, load_legacy):
+        conn = self._conn()
+        with self._init_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                done = conn.execute("SELECT value FROM meta WHERE key = 'migrated'").fetchone()
+                if done:
+                    conn.execute("COMMIT")
+                    return
+                legacy = load_legacy() if load_legacy else None
+                rows = 0
+                for ns in NAMESPACES:
+                    for key, value in ((legacy or {}).get(ns) or {}).items():
+                        conn.execute(
+                            "INSERT OR REPLACE INTO kv (ns, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                            (ns, key, json.dumps(value, default=str), (legacy or {}).get("last_updated")),
+                        )
+                        rows += 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated', ?)",
+                    (str(time.time()),),
+                )
+                conn.execute("COMMIT")
+                if rows:
+                    log_info(f"[SQLiteStateBackend] 📥 Migrated {rows} rows from memory.json")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    # --------------------------------------------------------
+    # Backend Contract
+    # --------------------------------------------------------
+    def load(self) -> Dict[str, Any]:
+        """Return all eager namespaces as a raw {ns: {key: value}} document."""
+        doc = empty_document()
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            version = conn.execute("SELECT COALESCE(MAX(version), 0) FROM changes").fetchone()[0]
+            # Range scans around each lazy namespace keep this on the primary key index
+            rows = []
+            lower = ""
+            for ns in sorted(self.lazy_namespaces) + [None]:
+                if ns is None:
+                    query, params = "SELECT ns, key, value, updated_at FROM kv WHERE ns > ?", (lower,)
+                else:
+                    query, params = (
+                        "SELECT ns, key, value, updated_at FROM kv WHERE ns > ? AND ns < ?", (lower, ns)
+                    )
+                rows.extend(conn.execute(query, params).fetchall())
+                lower = ns
+        finally:
+            conn.execute("COMMIT")
+
+        for ns, key, value, updated_at in rows:
+            try:
+                doc.setdefault(ns, {})[key] = json.loads(value)
+            except Exception:
+                log_error(f"[SQLiteStateBackend] ⚠️ Skipping unreadable row {ns}/{key}")
+                continue
+            if updated_at and (doc["last_updated"] is None or updated_at > doc["last_updated"]):
+                doc["last_updated"] = updated_at
+
+        with self._poll_lock:
+            self._seen_version = version
+            self._data_version = self._poll_conn.execute("PRAGMA data_version").fetchone()[0]
+        return doc
+
+    def load_namespace(self, ns: str) -> Dict[str, Any]:
+        """Every row of one namespace (used for full exports)."""
+        return {
+            key: json.loads(value)
+            for key, value in self._conn().execute("SELECT key, value FROM kv WHERE ns = ?", (ns,))
+        }
+
+    def get(self, ns: str, key: str, default: Any = None) -> Any:
+        """Point read of a single row."""
+        row = self._conn().execute(
+            "SELECT value FROM kv WHERE ns = ? AND key = ?", (ns, key)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def write(self, record: Dict[str, Any]):
+        """Apply one mutation record (row + change-log entry) in one transaction."""
+        conn = self._conn()
+        op = record.get("op")
+        if op not in {"put", "del", "clear"}:
+            return
+        payload = json.dumps(record.get("value"), default=str) if op == "put" else None
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if op == "put":
+                conn.execute(
+                    "INSERT INTO kv (ns, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(ns, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                    (record["ns"], record["key"], payload, record.get("ts")),
+                )
+            elif op == "del":
+                conn.execute("DELETE FROM kv WHERE ns = ? AND key = ?", (record["ns"], record["key"]))
+            else:
+                conn.execute("DELETE FROM kv")
+            cur = conn.execute(
+                "INSERT INTO changes (ns, key) VALUES (?, ?)",
+                (record.get("ns", "*"), record.get("key", "*")) if op != "clear" else ("*", "*"),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._poll_lock:
+            self._own_versions.add(cur.lastrowid)
+            self._writes += 1
+            prune = self._writes % 1000 == 0
+        if prune:
+            conn.execute(
+                "DELETE FROM changes WHERE version <= (SELECT MAX(version) FROM changes) - ?",
+                (CHANGELOG_KEEP,),
+            )
+
+    def changes(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Records written by *other* processes since the last load/poll.
+        None → nothing new; [{"op": "reload"}] → caller must reload fully.
+        """
+        with self._poll_lock:
+            data_version = self._poll_conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return None
+            self._data_version = data_version
+
+            rows = self._poll_conn.execute(
+                "SELECT version, ns, key FROM changes WHERE version > ? ORDER BY version",
+                (self._seen_version,),
+            ).fetchall()
+            if not rows:
+                return None
+            own, self._own_versions = self._own_versions, {v for v in self._own_versions if v > rows[-1][0]}
+            gap = rows[0][0] > self._seen_version + 1  # change log pruned past us
+            self._seen_version = rows[-1][0]
+
+            touched: Dict[Tuple[str, str], None] = {}
+            for version, ns, key in rows:
+                if version in own:
+                    continue
+                if ns == "*" or gap:
+                    return [{"op": "reload"}]
+                touched[(ns, key)] = None
+
+            records: List[Dict[str, Any]] = []
+            for ns, key in touched:
+                row = self._poll_conn.execute(
+                    "SELECT value FROM kv WHERE ns = ? AND key = ?", (ns, key)
+                ).fetchone()
+                if row is None:
+                    records.append({"op": "del", "ns": ns, "key": key})
+                else:
+                    records.append({"op": "put", "ns": ns, "key": key, "value": json.loads(row[0])})
+            return records
+
+    def flush(self):
+        """Each write already commits; nothing is buffered."""
+        return None
+
+    def compact(self):
+        """Checkpoint the WAL back into the main database file."""
+        try:
+            self._conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception as e:
+            log_error(f"[SQLiteStateBackend] ⚠️ WAL checkpoint failed: {e}")
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from collections import OrderedDict
+from datetime import timedelta
+from threading import RLock
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import json
+import time
+
+TTL = Union[float, int, timedelta, None]
+
+_MISSING = object()
+
+
+def ttl_seconds(ttl: TTL) -> Optional[float]:
+    """Normalize a TTL given as seconds or timedelta (None → never expires)."""
+    if ttl is None:
+        return None
+    if isinstance(ttl, timedelta):
+        return ttl.total_seconds()
+    return float(ttl)
+
+
+class TTLCache:
+    """
+    ⏳ Bounded TTL + LRU Cache
+    ------------------------------------------------------------
+    - Lazy expiry on read, plus `sweep()` for background cleanup
+    - Least-recently-used eviction past `max_entries` / `max_bytes`
+    - hit / miss / eviction / expiration counters for monitoring
+
+    Entry sizes are measured on their JSON encoding, which is what
+    ends up on disk. `on_discard(key)` fires for every expired or
+    evicted entry so a persistent owner can drop it from storage too.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2000,
+        max_bytes: int = 64 * 1024 * 1024,
+        on_discard: Optional[Callable[[str], None]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._on_discard = on_discard
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = RLock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    # --------------------------------------------------------
+    # Core API
+    # --------------------------------------------------------
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._stats["misses"] += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._discard(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: TTL = None):
+        """Store `value`, evicting least-recently-used entries past the caps."""
+        seconds = ttl_seconds(ttl)
+        expires_at = time.time() + seconds if seconds is not None else None
+        self._insert(key, value, expires_at)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop(key)
+            return True
+
+    def sweep(self) -> List[str]:
+        """Remove every expired entry; returns the removed keys."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, exp, _) in self._entries.items() if exp is not None and exp <= now]
+            for key in expired:
+                self._discard(key)
+            self._stats["expirations"] += len(expired)
+            return expired
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.time())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --------------------------------------------------------
+    # Persistence Helpers
+    # --------------------------------------------------------
+    def entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Disk form of one entry: {"value", "expires_at"}."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return {"value": entry[0], "expires_at": entry[1]} if entry else None
+
+    def dump(self) -> Dict[str, Dict[str, Any]]:
+        """Disk form of all live entries, least-recently-used first."""
+        now = time.time()
+        with self._lock:
+            return {
+                k: {"value": v, "expires_at": exp}
+                for k, (v, exp, _) in self._entries.items()
+                if exp is None or exp > now
+            }
+
+    def load(self, entries: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Restore disk entries; returns keys that were already expired."""
+        now = time.time()
+        expired: List[str] = []
+        for key, raw in (entries or {}).items():
+            if not isinstance(raw, dict):
+                continue
+            expires_at = raw.get("expires_at")
+            if expires_at is not None and expires_at <= now:
+                expired.append(key)
+                continue
+            self._insert(key, raw.get("value"), expires_at)
+        return expired
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    # --------------------------------------------------------
+    # Internals
+    # --------------------------------------------------------
+    def _insert(self, key: str, value: Any, expires_at: Optional[float]):
+        try:
+            size = len(json.dumps(value, default=str))
+        except Exception:
+            size = len(str(value))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._discard(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def _drop(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _discard(self, key: str):
+        self._drop(key)
+        if self._on_discard is not None:
+            self._on_discard(key)
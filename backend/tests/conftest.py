@@ -0,0 +1,15 @@
+"""
+Run from the backend directory:
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# state/, logs/ and the bar store resolve against the working directory:
+# point them at a scratch directory so tests never touch the real ones
+os.chdir(tempfile.mkdtemp(prefix="trading-assistant-tests-"))
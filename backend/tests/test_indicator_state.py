@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils.indicator_state import IndicatorState, RESYNC_EVERY
+from utils.indicators import compute_indicators
+
+
+def _closes(bars: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, bars)))
+
+
+def _engine(closes: np.ndarray) -> dict:
+    return compute_indicators(closes[None, :], ["X"], wilder_rsi=True).row("X")
+
+
+def _assert_same(streamed: dict, vectorized: dict):
+    assert streamed.keys() == vectorized.keys()
+    for name, expected in vectorized.items():
+        value = streamed[name]
+        if expected is None:
+            assert value is None, name
+        else:
+            assert value == pytest.approx(expected, rel=1e-9, abs=1e-9), name
+
+
+@pytest.mark.parametrize("bars", [1, 10, 15, 30, 199, 200, 260, RESYNC_EVERY + 120])
+def test_streaming_state_matches_vectorized_engine(bars):
+    closes = _closes(bars)
+    state = IndicatorState("X", "1d")
+    for i, close in enumerate(closes):
+        state.push(i, close)
+    _assert_same(state.values(), _engine(closes))
+
+
+def test_forming_bar_preview_leaves_committed_state_alone():
+    closes = _closes(300)
+    state = IndicatorState("X", "1d")
+    for i, close in enumerate(closes[:-1]):
+        state.push(i, close)
+    before = state.values()
+
+    _assert_same(state.values(close=closes[-1]), _engine(closes))
+    assert state.values() == before
+
+
+def test_state_survives_a_round_trip_through_its_dict_form():
+    closes = _closes(420)
+    state = IndicatorState("X", "1d")
+    for i, close in enumerate(closes[:400]):
+        state.push(i, close)
+
+    restored = IndicatorState.from_dict(state.to_dict())
+    for i, close in enumerate(closes[400:], start=400):
+        restored.push(i, close)
+    _assert_same(restored.values(), _engine(closes))
+    assert not math.isnan(restored.values()["ma_200"])
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import BACKGROUND, INTERACTIVE, BudgetExhausted, TokenBucket, priority_scope
+
+
+def test_background_callers_leave_the_interactive_reserve():
+    bucket = TokenBucket("test", capacity=5, rate=1e-6, reserve=0.2)  # reserve: 1 of 5 tokens
+    for _ in range(4):
+        bucket.acquire(BACKGROUND, max_wait=0)
+    with pytest.raises(BudgetExhausted):
+        bucket.acquire(BACKGROUND, max_wait=0)
+
+    bucket.acquire(INTERACTIVE, max_wait=0)
+    with pytest.raises(BudgetExhausted) as exhausted:
+        bucket.acquire(INTERACTIVE, max_wait=0)
+    assert exhausted.value.provider == "test" and exhausted.value.retry_after > 0
+
+    stats = bucket.snapshot()
+    assert (stats["granted"], stats["denied"]) == (5, 2)
+
+
+def test_exhausted_bucket_fails_fast_instead_of_waiting_past_max_wait():
+    bucket = TokenBucket("test", capacity=1, rate=0.1, reserve=0.0)  # next token in 10s
+    bucket.acquire(INTERACTIVE)
+    started = time.monotonic()
+    with pytest.raises(BudgetExhausted):
+        bucket.acquire(INTERACTIVE, max_wait=0.5)
+    assert time.monotonic() - started < 0.2
+
+
+def test_queued_interactive_caller_is_served_before_earlier_background_one():
+    bucket = TokenBucket("test", capacity=1, rate=5.0, reserve=0.0)  # one token every 200ms
+    bucket.acquire(INTERACTIVE)
+    order = []
+
+    def wait_for_token(priority, name):
+        bucket.acquire(priority, max_wait=5)
+        order.append(name)
+
+    background = threading.Thread(target=wait_for_token, args=(BACKGROUND, "background"))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=wait_for_token, args=(INTERACTIVE, "interactive"))
+    interactive.start()
+    background.join(5)
+    interactive.join(5)
+
+    assert order == ["interactive", "background"]
+    assert bucket.snapshot()["waited"] == 2
+
+
+def test_limit_response_blocks_the_bucket():
+    bucket = TokenBucket("test", capacity=10, rate=100.0)
+    bucket.block_for(5)
+    with pytest.raises(BudgetExhausted):
+        bucket.acquire(INTERACTIVE, max_wait=1)
+
+
+def test_priority_scope_sets_the_default_priority(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_SCOPED_TEST", "5/1000")
+    monkeypatch.setattr(rate_limiter, "_buckets", {})
+    bucket = rate_limiter.get_bucket("scoped_test")
+    assert bucket.reserve == pytest.approx(1.0)
+
+    with priority_scope(BACKGROUND):
+        for _ in range(4):
+            rate_limiter.acquire("scoped_test", max_wait=0)
+        with pytest.raises(BudgetExhausted):
+            asyncio.run(rate_limiter.acquire_async("scoped_test", max_wait=0))
+    rate_limiter.acquire("scoped_test", max_wait=0)
+
+    stats = bucket.snapshot()
+    assert (stats["granted"], stats["denied"]) == (5, 1)
@@ -0,0 +1,50 @@
+import math
+from statistics import NormalDist, fmean, stdev
+
+import numpy as np
+import pytest
+
+from utils.risk import MIN_OBSERVATIONS, TRADING_DAYS, compute_risk
+
+
+def _prices(returns) -> np.ndarray:
+    """Closes whose daily log returns are exactly `returns`."""
+    return 100.0 * np.exp(np.cumsum([0.0] + list(returns)))
+
+
+def test_drawdown_of_a_fixed_path():
+    # Peak 120, trough 60 two bars later, new high on the bar after that
+    closes = np.array([100.0, 120.0, 90.0, 60.0] + [130.0 + i for i in range(36)])
+    row = compute_risk(closes[None, :], ["X"]).row("X")
+    assert row["max_drawdown"] == pytest.approx(0.5)
+    assert row["drawdown_duration"] == 2
+
+
+def test_historical_and_parametric_var_of_fixed_returns():
+    returns = [0.01] * 37
+    for i in (5, 17, 29):  # 3 of 40 returns are -5%: the 5% quantile sits on them
+        returns.insert(i, -0.05)
+    row = compute_risk(_prices(returns)[None, :], ["X"], confidence=0.95).row("X")
+
+    assert row["observations"] == 40
+    assert row["var_historical"] == pytest.approx(0.05)
+    assert row["cvar_historical"] == pytest.approx(0.05)
+
+    mu, sigma = fmean(returns), stdev(returns)
+    z = NormalDist().inv_cdf(0.95)
+    assert row["var_parametric"] == pytest.approx(-(mu - z * sigma))
+    assert row["cvar_parametric"] == pytest.approx(-(mu - sigma * NormalDist().pdf(z) / 0.05))
+    assert row["volatility"] == pytest.approx(sigma * math.sqrt(TRADING_DAYS))
+    assert row["annual_return"] == pytest.approx(mu * TRADING_DAYS)
+
+
+def test_rows_are_independent_and_short_histories_give_no_metrics():
+    long = _prices([0.01, -0.02] * 30)
+    short = np.full(len(long), np.nan)
+    short[-(MIN_OBSERVATIONS - 2):] = long[-(MIN_OBSERVATIONS - 2):]
+    table = compute_risk(np.vstack([long, short]), ["LONG", "SHORT"])
+
+    assert table.row("LONG") == compute_risk(long[None, :], ["LONG"]).row("LONG")
+    short_row = table.row("SHORT")
+    assert short_row["var_historical"] is None and short_row["max_drawdown"] is None
+    assert short_row["observations"] == MIN_OBSERVATIONS - 3
@@ -1,6 +1,8 @@
 import os
-import requests
 from utils.logger import log_info, log_error
+from utils.http_client import Request, run_fetch
+from utils.async_http import run_fetch_async
+from utils.rate_limiter import BudgetExhausted, penalize
 
 ALPHA_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
 BASE_URL = "https://www.alphavantage.co/query"
@@ -8,29 +10,61 @@ BASE_URL = "https://www.alphavantage.co/query"
 HEADERS = {"User-Agent": "TradingAssistant/1.0"}
 
 
+# --------------------------------------------------------------------------
+# Request / response helpers shared by the sync and async fetchers
+# --------------------------------------------------------------------------
+def _params(function: str, symbol: str) -> dict:
+    return {"function": function, "symbol": symbol, "apikey": ALPHA_KEY}
+
+
+def _check_limit(payload: dict):
+    """Alpha Vantage answers 200 with a "Note" / "Information" message when the key is throttled."""
+    if isinstance(payload, dict) and ("Note" in payload or "Information" in payload):
+        penalize("alpha_vantage", 60)
+        raise BudgetExhausted("alpha_vantage", 60)
+
+
+def _parse_quote(symbol: str, payload: dict) -> dict:
+    _check_limit(payload)
+    data = payload.get("Global Quote", {})
+    return {
+        "symbol": symbol.upper(),
+        "price": float(data.get("05. price", 0)),
+        "change_percent": float(data.get("10. change percent", "0%").strip("%")),
+        "volume": int(data.get("06. volume", 0))
+    }
+
+
+def _parse_overview(symbol: str, data: dict) -> dict:
+    _check_limit(data)
+    return {
+        "symbol": symbol.upper(),
+        "name": data.get("Name", symbol),
+        "market_cap": float(data.get("MarketCapitalization", 0)),
+        "pe_ratio": float(data.get("PERatio", 0)),
+        "dividend_yield": float(data.get("DividendYield", 0)),
+        "sector": data.get("Sector", "Unknown"),
+        "description": data.get("Description", "N/A")
+    }
+
+
+def _alpha(function: str, symbol: str, parse, what: str):
+    """Fetcher shared by the sync / async calls (see `run_fetch`)."""
+    try:
+        resp = yield Request("alpha_vantage", BASE_URL, {"params": _params(function, symbol), "headers": HEADERS})
+        resp.raise_for_status()
+        return parse(symbol, resp.json())
+    except Exception as e:
+        log_error(f"[Alpha] Failed to fetch {what} for {symbol}: {e}")
+        return {}
+
+
 def get_alpha_quote(symbol: str) -> dict:
     """
     Fetches real-time stock/ETF quote data.
     Returns price, change %, volume.
     """
-    try:
-        params = {
-            "function": "GLOBAL_QUOTE",
-            "symbol": symbol,
-            "apikey": ALPHA_KEY
-        }
-        resp = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=10)
-        resp.raise_for_status()
-        data = resp.json().get("Global Quote", {})
-        return {
-            "symbol": symbol.upper(),
-            "price": float(data.get("05. price", 0)),
-            "change_percent": float(data.get("10. change percent", "0%").strip("%")),
-            "volume": int(data.get("06. volume", 0))
-        }
-    except Exception as e:
-        log_error(f"[Alpha] Failed to fetch quote for {symbol}: {e}")
-        return {}
+    return run_fetch(_alpha("GLOBAL_QUOTE", symbol, _parse_quote, "quote"))
 
 
 def get_alpha_overview(symbol: str) -> dict:
@@ -38,25 +72,17 @@ def get_alpha_overview(symbol: str) -> dict:
     Fetches company or ETF fundamentals (overview).
     Returns market cap, PE, dividend yield.
     """
-    try:
-        params = {
-            "function": "OVERVIEW",
-            "symbol": symbol,
-            "apikey": ALPHA_KEY
-        }
-        resp = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-
-        return {
-            "symbol": symbol.upper(),
-            "name": data.get("Name", symbol),
-            "market_cap": float(data.get("MarketCapitalization", 0)),
-            "pe_ratio": float(data.get("PERatio", 0)),
-            "dividend_yield": float(data.get("DividendYield", 0)),
-            "sector": data.get("Sector", "Unknown"),
-            "description": data.get("Description", "N/A")
-        }
-    except Exception as e:
-        log_error(f"[Alpha] Failed to fetch overview for {symbol}: {e}")
-        return {}
+    return run_fetch(_alpha("OVERVIEW", symbol, _parse_overview, "overview"))
+
+
+# --------------------------------------------------------------------------
+# ⚡ Async variants
+# --------------------------------------------------------------------------
+async def get_alpha_quote_async(symbol: str) -> dict:
+    """Async `get_alpha_quote`."""
+    return await run_fetch_async(_alpha("GLOBAL_QUOTE", symbol, _parse_quote, "quote"))
+
+
+async def get_alpha_overview_async(symbol: str) -> dict:
+    """Async `get_alpha_overview`."""
+    return await run_fetch_async(_alpha("OVERVIEW", symbol, _parse_overview, "overview"))
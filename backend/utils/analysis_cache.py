@@ -0,0 +1,89 @@
+import os
+from threading import Lock
+from typing import Optional, Tuple
+
+from state.shared_state import shared_state
+from state.ttl_cache import TTLCache
+from utils.bar_store import bar_store
+
+# Computed technical-analysis results, keyed by the bar they were computed on
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "2000"))
+ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+# Entries for a bar that is no longer the latest are never read again; this only bounds the disk tier
+ANALYSIS_CACHE_TTL_SEC = float(os.getenv("ANALYSIS_CACHE_TTL_SEC", str(3 * 24 * 3600)))
+# Also keep entries in SharedState's TTL cache (survives restarts, shared by workers)
+ANALYSIS_CACHE_PERSIST = os.getenv("ANALYSIS_CACHE_PERSIST", "1").lower() in {"1", "true", "yes"}
+
+_cache = TTLCache(ANALYSIS_CACHE_MAX_ENTRIES, ANALYSIS_CACHE_MAX_BYTES)
+_lock = Lock()
+_stats = {"lookups": 0, "hits": 0, "persisted_hits": 0, "stale": 0, "misses": 0, "stores": 0}
+
+
+def _cache_key(symbol: str, interval: str, ts: int) -> str:
+    return f"analysis:{interval}:{symbol}:{ts}"
+
+
+def _count(name: str):
+    with _lock:
+        _stats[name] += 1
+
+
+def last_bar(symbol: str, interval: str = "1d", period: str = "1y",
+             max_age: Optional[float] = None) -> Optional[Tuple[int, float]]:
+    """(timestamp ns, close) of the newest stored bar after a refresh; None when nothing is stored."""
+    bar_store.refresh(symbol, interval, period, max_age)
+    bars = bar_store.load(symbol.upper().strip(), interval)
+    if not len(bars):
+        return None
+    return int(bars["ts"][-1]), float(bars["close"][-1])
+
+
+def get_analysis(symbol: str, interval: str, bar: Tuple[int, float]) -> Optional[dict]:
+    """
+    📦 Cached Analysis Lookup
+    ------------------------------------------------------------
+    Lookup order: in-process LRU → persisted SharedState cache.
+    An entry is only valid for the bar it was computed on: a new
+    bar changes the key, and a still-forming bar whose close moved
+    since counts as stale.
+    """
+    ts, close = bar
+    key = _cache_key(symbol.upper().strip(), interval, ts)
+    _count("lookups")
+
+    entry = _cache.get(key)
+    tier = "hits"
+    if entry is None and ANALYSIS_CACHE_PERSIST:
+        entry = shared_state.cache_get(key)
+        tier = "persisted_hits"
+        if entry is not None:
+            _cache.set(key, entry, ANALYSIS_CACHE_TTL_SEC)
+
+    if entry is None:
+        _count("misses")
+        return None
+    if entry.get("close") != close:
+        _count("stale")
+        return None
+    _count(tier)
+    return entry["result"]
+
+
+def put_analysis(symbol: str, interval: str, bar: Tuple[int, float], result: dict):
+    """Store a computed result for the bar it was computed on (in-process and persisted)."""
+    ts, close = bar
+    key = _cache_key(symbol.upper().strip(), interval, ts)
+    entry = {"close": close, "result": result}
+    _cache.set(key, entry, ANALYSIS_CACHE_TTL_SEC)
+    if ANALYSIS_CACHE_PERSIST:
+        shared_state.cache_set(key, entry, ttl=ANALYSIS_CACHE_TTL_SEC)
+    _count("stores")
+
+
+def analysis_cache_stats() -> dict:
+    """Lookup outcomes, hit rate and in-process cache counters."""
+    with _lock:
+        stats = dict(_stats)
+    hits = stats["hits"] + stats["persisted_hits"]
+    stats["hit_rate"] = round(hits / stats["lookups"], 4) if stats["lookups"] else 0.0
+    return {**stats, "memory": _cache.stats()}
@@ -1,66 +1,228 @@
-import yfinance as yf
+import numpy as np
+import pandas as pd
 import requests
 from datetime import datetime, timedelta
+from threading import Lock
+import time
 from core.schemas import CompanyData
 import os
 from dotenv import load_dotenv
 from utils.logger import log_error
+from utils.fundamentals import get_fundamentals, get_many_fundamentals
+from utils.bar_store import get_bars, get_many_bars
+from utils.resample import RESAMPLED_INTERVALS, get_resampled
 
 load_dotenv()
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
 
+# Movers snapshots are shared by every caller for this many seconds
+SNAPSHOT_TTL_SEC = float(os.getenv("MOVERS_SNAPSHOT_TTL_SEC", "60"))
 
-def get_top_movers(limit=5, timeframe="today") -> list[CompanyData]:
-    tickers = ["AAPL", "TSLA", "NVDA", "MSFT", "AMZN", "META", "NFLX", "AMD", "GOOGL", "BABA"]
-    results = []
 
-    for symbol in tickers:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="7d" if timeframe != "today" else "1d")
-        if hist.empty:
-            continue
+MOVER_TICKERS = ["AAPL", "TSLA", "NVDA", "MSFT", "AMZN", "META", "NFLX", "AMD", "GOOGL", "BABA"]
+BUDGET_TICKERS = ["SIRI", "PLTR", "F", "SOFI", "INTC", "NOK", "T", "GPRO", "CHPT"]
 
-        open_price = hist["Open"].iloc[0]
-        close_price = hist["Close"].iloc[-1]
-        change = ((close_price - open_price) / open_price) * 100
 
-        results.append(CompanyData(
-            symbol=symbol,
-            name=ticker.info.get("shortName"),
-            price=close_price,
-            percent_change=round(change, 2),
-            volume=ticker.info.get("volume"),
-            market_cap=ticker.info.get("marketCap")
-        ))
+class MarketSnapshot:
+    """
+    📸 Bulk OHLCV Snapshot for a Ticker Universe
+    ------------------------------------------------------------
+    Bars for every ticker come from the local bar store (stale ones
+    refreshed by a single bulk `yf.download`) and are reduced to a
+    single table indexed by symbol:
 
-    sorted_results = sorted(results, key=lambda x: x.percent_change or 0, reverse=True)
-    return sorted_results[:limit]
+      open · high · low · close · prev_close · volume
+      change_pct      → first open → last close over the period
+      day_change_pct  → last close vs. previous close
 
+    Movers, losers and budget picks are all computed from this
+    table instead of one `yf.Ticker` round trip per symbol.
+    """
 
-def get_top_losers(limit=5, timeframe="today") -> list[CompanyData]:
-    movers = get_top_movers(limit=50, timeframe=timeframe)
-    sorted_losers = sorted(movers, key=lambda x: x.percent_change or 0)
-    return sorted_losers[:limit]
+    COLUMNS = ["open", "high", "low", "close", "prev_close", "volume", "change_pct", "day_change_pct"]
 
+    def __init__(self, table: pd.DataFrame, period: str = "1d", interval: str = "1d"):
+        self.table = table
+        self.period = period
+        self.interval = interval
+        self.fetched_at = datetime.utcnow()
+        self.loaded_at = time.monotonic()
 
-def get_budget_picks(limit=5, max_price=10.0) -> list[CompanyData]:
-    tickers = ["SIRI", "PLTR", "F", "SOFI", "INTC", "NOK", "T", "GPRO", "CHPT"]
-    results = []
+    @classmethod
+    def fetch(cls, tickers: list[str], period: str = "1d", interval: str = "1d",
+              max_age: float | None = None) -> "MarketSnapshot":
+        """
+        OHLCV for all `tickers` from the local bar store; symbols whose
+        bars are stale are refreshed in one bulk request.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        try:
+            if interval in RESAMPLED_INTERVALS:
+                # Weekly / monthly bars are built from stored daily bars, not downloaded
+                frames = get_resampled(tickers, interval, period=period, max_age=max_age)
+            else:
+                frames = get_many_bars(tickers, interval=interval, period=period, max_age=max_age)
+            frames = {t: f for t, f in frames.items() if not f.empty}
+            # Same (field, ticker) layout as a group_by="column" download
+            raw = pd.concat(frames, axis=1).swaplevel(axis=1) if frames else None
+        except Exception as e:
+            log_error(f"[MarketSnapshot] ❌ Bar load failed for {len(tickers)} tickers: {e}")
+            raw = None
+        return cls.from_download(raw, tickers, period, interval)
 
-    for symbol in tickers:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        price = info.get("regularMarketPrice")
+    @classmethod
+    def from_download(cls, raw: pd.DataFrame | None, tickers: list[str],
+                      period: str = "1d", interval: str = "1d") -> "MarketSnapshot":
+        """Reduce a (dates × [field, ticker]) download frame to one row per symbol."""
+        if raw is None or raw.empty:
+            return cls(pd.DataFrame(columns=cls.COLUMNS), period, interval)
+
+        if not isinstance(raw.columns, pd.MultiIndex):
+            raw = raw.copy()
+            raw.columns = pd.MultiIndex.from_product([raw.columns, tickers[:1]])
+
+        def field(name: str) -> pd.DataFrame:
+            return raw[name].reindex(columns=tickers).astype(float)
+
+        closes = field("Close").ffill()
+        table = pd.DataFrame({
+            "open": field("Open").bfill().iloc[0],
+            "high": field("High").max(),
+            "low": field("Low").min(),
+            "close": closes.iloc[-1],
+            "prev_close": closes.iloc[-2] if len(closes) > 1 else np.nan,
+            "volume": field("Volume").ffill().iloc[-1],
+        }, index=tickers)
+        table["change_pct"] = ((table["close"] - table["open"]) / table["open"] * 100).round(2)
+        table["day_change_pct"] = ((table["close"] - table["prev_close"]) / table["prev_close"] * 100).round(2)
+        table = table.replace([np.inf, -np.inf], np.nan).dropna(subset=["close"])
+        return cls(table, period, interval)
 
-        if price and price <= max_price:
-            results.append(CompanyData(
+    # --------------------------------------------------------
+    # Views over the table
+    # --------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @property
+    def empty(self) -> bool:
+        return self.table.empty
+
+    def _rank(self, n: int, by: str, largest: bool) -> pd.DataFrame:
+        """Partial sort: select k rows in O(n) with argpartition, then order only those k."""
+        values = self.table[by].to_numpy(dtype=float)
+        candidates = np.flatnonzero(~np.isnan(values))
+        keys = -values[candidates] if largest else values[candidates]
+        if 0 < n < len(candidates):
+            picked = np.argpartition(keys, n - 1)[:n]
+            candidates, keys = candidates[picked], keys[picked]
+        elif n <= 0:
+            return self.table.iloc[:0]
+        order = candidates[np.argsort(keys, kind="stable")]
+        return self.table.iloc[order]
+
+    def top(self, n: int, by: str = "change_pct") -> pd.DataFrame:
+        """n best rows by `by`."""
+        return self._rank(n, by, largest=True)
+
+    def bottom(self, n: int, by: str = "change_pct") -> pd.DataFrame:
+        """n worst rows by `by`."""
+        return self._rank(n, by, largest=False)
+
+    def below(self, max_price: float) -> pd.DataFrame:
+        """Rows whose last close is at or under `max_price`."""
+        return self.table[self.table["close"] <= max_price]
+
+    @staticmethod
+    def to_company_data(rows: pd.DataFrame, change: str = "change_pct",
+                        info: dict[str, dict] | None = None) -> list[CompanyData]:
+        """Convert table rows to CompanyData; `info` adds name / market cap when known."""
+        info = info or {}
+        companies = []
+        for symbol, close, pct, volume in zip(rows.index, rows["close"], rows[change], rows["volume"]):
+            meta = info.get(symbol) or {}
+            companies.append(CompanyData(
                 symbol=symbol,
-                name=info.get("shortName"),
-                price=price,
-                percent_change=info.get("regularMarketChangePercent"),
-                volume=info.get("volume"),
-                market_cap=info.get("marketCap")
+                name=meta.get("shortName"),
+                price=float(close),
+                percent_change=None if pd.isna(pct) else float(pct),
+                volume=None if pd.isna(volume) else int(volume),
+                market_cap=meta.get("marketCap"),
             ))
+        return companies
+
+
+# --------------------------------------------------------
+# Shared snapshots (one fetch per universe + period per TTL)
+# --------------------------------------------------------
+_snapshots: dict[tuple, MarketSnapshot] = {}
+_snapshot_locks: dict[tuple, Lock] = {}
+_snapshot_registry_lock = Lock()
+_snapshot_stats = {"fetches": 0, "hits": 0}
+
+
+def get_market_snapshot(tickers: list[str], period: str = "1d", ttl: float | None = None,
+                        interval: str = "1d") -> MarketSnapshot:
+    """
+    Return the shared snapshot for (tickers, period, interval), fetching it
+    at most once per TTL. Concurrent callers for the same key wait on one fetch.
+    """
+    ttl = SNAPSHOT_TTL_SEC if ttl is None else ttl
+    key = (tuple(tickers), period, interval)
+    with _snapshot_registry_lock:
+        lock = _snapshot_locks.setdefault(key, Lock())
+
+    with lock:
+        cached = _snapshots.get(key)
+        if cached is not None and time.monotonic() - cached.loaded_at < ttl:
+            _snapshot_stats["hits"] += 1
+            return cached
+        snapshot = MarketSnapshot.fetch(list(tickers), period=period, interval=interval, max_age=ttl)
+        snapshot.loaded_at = time.monotonic()
+        _snapshot_stats["fetches"] += 1
+        if not snapshot.empty:
+            _snapshots[key] = snapshot
+        return snapshot
+
+
+def snapshot_stats() -> dict:
+    """Snapshot fetches vs. shared hits."""
+    return dict(_snapshot_stats)
+
+
+def _movers_window(timeframe: str) -> tuple[str, str]:
+    """(period, interval) a movers timeframe is ranked over; week / month are calendar-to-date."""
+    return {
+        "today": ("1d", "1d"),
+        "this_week": ("1wk", "1wk"),
+        "this_month": ("1mo", "1mo"),
+    }.get(timeframe, ("7d", "1d"))
+
+
+def _fetch_info(symbols) -> dict[str, dict]:
+    """Cached fundamentals for the (few) symbols that are actually returned."""
+    return get_many_fundamentals(symbols)
+
+
+def get_top_movers(limit=5, timeframe="today") -> list[CompanyData]:
+    period, interval = _movers_window(timeframe)
+    snapshot = get_market_snapshot(MOVER_TICKERS, period=period, interval=interval)
+    rows = snapshot.top(limit)
+    return MarketSnapshot.to_company_data(rows, info=_fetch_info(rows.index))
+
+
+def get_top_losers(limit=5, timeframe="today") -> list[CompanyData]:
+    period, interval = _movers_window(timeframe)
+    snapshot = get_market_snapshot(MOVER_TICKERS, period=period, interval=interval)
+    rows = snapshot.bottom(limit)
+    return MarketSnapshot.to_company_data(rows, info=_fetch_info(rows.index))
+
+
+def get_budget_picks(limit=5, max_price=10.0) -> list[CompanyData]:
+    snapshot = get_market_snapshot(BUDGET_TICKERS, period="5d")
+    rows = snapshot.below(max_price)
+    info = _fetch_info(rows.index)  # market cap ranks the affordable candidates only
+    results = MarketSnapshot.to_company_data(rows, change="day_change_pct", info=info)
 
     sorted_picks = sorted(results, key=lambda x: x.market_cap or 0)
     return sorted_picks[:limit]
@@ -105,8 +267,7 @@ def get_company_data(symbol: str) -> CompanyData | None:
         if not symbol:
             return None
 
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+        info = get_fundamentals(symbol)
 
         # Basic validation — avoid broken responses
         if not info or "shortName" not in info:
@@ -114,7 +275,7 @@ def get_company_data(symbol: str) -> CompanyData | None:
 
         price = info.get("regularMarketPrice")
         if price is None:
-            hist = ticker.history(period="1d")
+            hist = get_bars(symbol, interval="1d", period="1d")
             if not hist.empty:
                 price = hist["Close"].iloc[-1]
 
@@ -0,0 +1,178 @@
+import asyncio
+import os
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+from weakref import WeakKeyDictionary
+
+import httpx
+
+from utils.fanout import provider_limit, FANOUT_TIMEOUT_SEC
+from utils.http_client import (
+    DEFAULT_HEADERS,
+    Fetcher,
+    HTTP_BACKOFF_JITTER_SEC,
+    HTTP_BACKOFF_MAX_SEC,
+    HTTP_BACKOFF_SEC,
+    HTTP_MAX_RETRIES,
+    RETRY_STATUSES,
+    Request,
+    T,
+    provider_timeout,
+    request_identity,
+    retry_after_seconds,
+)
+from utils.quota import check_quota, record_call
+from utils.rate_limiter import BudgetExhausted, acquire_async, penalize
+from utils.single_flight import single_flight_async
+from utils.logger import log_error
+
+# Connection limits of the shared async client
+ASYNC_MAX_CONNECTIONS = int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", "100"))
+ASYNC_MAX_KEEPALIVE = int(os.getenv("ASYNC_HTTP_MAX_KEEPALIVE", "20"))
+
+# httpx clients and asyncio semaphores are bound to the loop that created them
+_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = WeakKeyDictionary()
+_semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    🌐 Shared Async HTTP Client
+    ------------------------------------------------------------
+    One pooled `httpx.AsyncClient` per running event loop, with
+    ASYNC_HTTP_MAX_CONNECTIONS / ASYNC_HTTP_MAX_KEEPALIVE limits.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_MAX_KEEPALIVE,
+            ),
+            follow_redirects=True,
+        )
+    return client
+
+
+def _semaphore(provider: str) -> asyncio.Semaphore:
+    per_loop = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    sem = per_loop.get(provider)
+    if sem is None:
+        sem = per_loop[provider] = asyncio.Semaphore(provider_limit(provider))
+    return sem
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Retry-After when the server sends one, else exponential backoff plus jitter."""
+    header = response.headers.get("Retry-After") if response is not None else None
+    if header:
+        try:
+            return min(float(header), HTTP_BACKOFF_MAX_SEC)
+        except ValueError:
+            try:
+                wait = (parsedate_to_datetime(header) - datetime.now(timezone.utc)).total_seconds()
+                return min(max(wait, 0.0), HTTP_BACKOFF_MAX_SEC)
+            except Exception:
+                pass
+    backoff = min(HTTP_BACKOFF_MAX_SEC, HTTP_BACKOFF_SEC * (2 ** attempt))
+    return backoff + random.uniform(0, HTTP_BACKOFF_JITTER_SEC)
+
+
+async def async_get(provider: str, url: str, timeout: float | None = None, **kwargs) -> httpx.Response:
+    """
+    GET on the shared async client with the provider's timeout, rate
+    budget and retry policy; identical concurrent GETs share one request.
+    """
+    return await single_flight_async(
+        provider, url, request_identity(kwargs), lambda: _issue_get(provider, url, timeout, **kwargs)
+    )
+
+
+async def _charge_call(provider: str):
+    """Async `http_client.charge_call`: quota + rate budget for one attempt."""
+    check_quota(provider)
+    await acquire_async(provider)
+    record_call(provider)
+
+
+async def _issue_get(provider: str, url: str, timeout: float | None, **kwargs) -> httpx.Response:
+    await _charge_call(provider)
+    client = get_async_client()
+    timeout = provider_timeout(provider) if timeout is None else timeout
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        last_attempt = attempt == HTTP_MAX_RETRIES
+        try:
+            resp = await client.get(url, timeout=timeout, **kwargs)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+            await asyncio.sleep(_retry_delay(attempt))
+            await _charge_call(provider)  # every re-attempt is a call (BudgetExhausted ends retrying)
+            continue
+        if resp.status_code in RETRY_STATUSES and not last_attempt:
+            await asyncio.sleep(_retry_delay(attempt, resp))
+            try:
+                await _charge_call(provider)
+                continue
+            except BudgetExhausted:
+                pass  # out of budget: hand back the last response
+        if resp.status_code == 429:
+            penalize(provider, retry_after_seconds(resp.headers))
+        return resp
+
+
+async def run_fetch_async(fetcher: Fetcher[T]) -> T:
+    """Async `http_client.run_fetch`: Requests go through `async_get`, callables run in a worker thread."""
+    try:
+        step = next(fetcher)
+        while True:
+            try:
+                if isinstance(step, Request):
+                    result = await async_get(step.provider, step.url, **step.kwargs)
+                else:
+                    result = await asyncio.to_thread(step)
+            except Exception as e:
+                step = fetcher.throw(e)
+            else:
+                step = fetcher.send(result)
+    except StopIteration as done:
+        return done.value
+
+
+async def gather_limited(
+    fn: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    provider: str = "default",
+    timeout: Optional[float] = None,
+    default: Any = None,
+) -> List[Any]:
+    """
+    Async counterpart of `fan_out`: awaits `fn(item)` for every item
+    with at most `provider_limit(provider)` in flight, a per-call
+    timeout, and results in input order (`default` on failure).
+    """
+    sem = _semaphore(provider)
+    timeout = FANOUT_TIMEOUT_SEC if timeout is None else timeout
+
+    async def run(item):
+        async with sem:
+            try:
+                return await asyncio.wait_for(fn(item), timeout)
+            except asyncio.TimeoutError:
+                log_error(f"[gather_limited] ⏱️ {provider} call timed out after {timeout}s for {item}")
+            except Exception as e:
+                log_error(f"[gather_limited] ❌ {provider} call failed for {item}: {e}")
+            return default
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
+
+
+async def aclose_async_client():
+    """Close the current loop's client (e.g. on application shutdown)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,389 @@
+import json
+import os
+import re
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from utils.logger import log_info, log_error
+from utils.rate_limiter import BACKGROUND, priority_scope
+from utils.single_flight import single_flight
+
+# One memory-mapped .npy file (plus a small .meta.json) per (symbol, interval)
+BAR_STORE_DIR = os.getenv("BAR_STORE_DIR", os.path.join("state", "bars"))
+# Bars newer than this are served without asking the provider for an update
+BAR_STORE_REFRESH_SEC = float(os.getenv("BAR_STORE_REFRESH_SEC", "300"))
+# Relative close mismatch on the overlap bar that triggers a full re-download. Any split
+# or dividend re-adjusts the whole history, so only float noise is tolerated: merging
+# bars across a small dividend adjustment would mix adjustment bases in one series
+BAR_STORE_ADJUST_TOLERANCE = float(os.getenv("BAR_STORE_ADJUST_TOLERANCE", "1e-6"))
+
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),  # bar open, ns since epoch (UTC)
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+# DataFrame column names, as yfinance returns them
+COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_UNITS = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+
+_stats = {"reads": 0, "disk_hits": 0, "incremental_fetches": 0, "full_fetches": 0, "empty_fetches": 0,
+          "bars_fetched": 0}
+_stats_lock = Lock()
+
+
+def _count(name: str, n: int = 1):
+    with _stats_lock:
+        _stats[name] += n
+
+
+def period_to_timedelta(period: str) -> Optional[timedelta]:
+    """yfinance period ("7d", "3mo", "1y", "max", "ytd") → lookback; None means everything."""
+    if period == "max":
+        return None
+    if period == "ytd":
+        now = datetime.now(timezone.utc)
+        return now - datetime(now.year, 1, 1, tzinfo=timezone.utc)
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    return timedelta(days=int(match.group(1)) * _PERIOD_UNITS[match.group(2)])
+
+
+def frame_to_bars(df: pd.DataFrame) -> np.ndarray:
+    """yfinance OHLCV frame → structured bar array (UTC ns timestamps, NaN rows dropped)."""
+    if df is None or df.empty:
+        return np.empty(0, dtype=BAR_DTYPE)
+    df = df.dropna(subset=["Close"])
+    index = pd.DatetimeIndex(df.index)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    bars = np.empty(len(df), dtype=BAR_DTYPE)
+    bars["ts"] = index.as_unit("ns").asi8
+    for field, column in COLUMNS.items():
+        bars[field] = df[column].to_numpy(dtype="f8") if column in df else np.nan
+    return bars
+
+
+def bars_to_frame(bars: np.ndarray) -> pd.DataFrame:
+    """Structured bar array → OHLCV DataFrame with a UTC DatetimeIndex."""
+    index = pd.DatetimeIndex(pd.to_datetime(np.asarray(bars["ts"]), unit="ns", utc=True), name="Date")
+    return pd.DataFrame({column: np.asarray(bars[field]) for field, column in COLUMNS.items()}, index=index)
+
+
+# Parsed .npy headers by raw header bytes: files of the same length share one
+# header, so a universe scan parses a handful instead of one per file
+_npy_headers: Dict[bytes, tuple] = {}
+_NPY_HEADERS_MAX = 4096
+
+
+def _npy_layout(f) -> Optional[tuple]:
+    """(data offset, shape, dtype) of an open .npy file; None for layouts `load` leaves to numpy."""
+    prefix = f.read(10)
+    if len(prefix) < 10 or prefix[:6] != b"\x93NUMPY" or prefix[6] != 1:
+        return None
+    raw = prefix + f.read(int.from_bytes(prefix[8:10], "little"))
+    layout = _npy_headers.get(raw)
+    if layout is None:
+        f.seek(8)
+        shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        if fortran or len(shape) != 1 or dtype.hasobject:
+            return None
+        if len(_npy_headers) >= _NPY_HEADERS_MAX:
+            _npy_headers.clear()
+        layout = _npy_headers[raw] = (len(raw), shape, dtype)
+    return layout
+
+
+def _merge(stored: np.ndarray, fresh: np.ndarray) -> np.ndarray:
+    """Keep stored bars older than the first fresh one (the last stored bar may have been partial)."""
+    if not len(fresh):
+        return stored
+    keep = stored[stored["ts"] < fresh["ts"][0]]
+    return np.concatenate([keep, fresh])
+
+
+class BarStore:
+    """
+    🗄️ Local OHLCV Bar Store
+    ------------------------------------------------------------
+    Bars per (symbol, interval) live in memory-mapped NumPy files.
+    A read only asks the provider for bars after the last stored
+    one (or nothing at all while the file is fresh), so repeated
+    analyses are served from local disk:
+
+      - first read of a key → full download for the period
+      - later reads         → incremental download from the last bar
+      - longer lookback     → one backfill download, then incremental
+    """
+
+    def __init__(self, directory: str = BAR_STORE_DIR, refresh_sec: float = BAR_STORE_REFRESH_SEC):
+        self.directory = directory
+        self.refresh_sec = refresh_sec
+
+    # --------------------------------------------------------
+    # Files
+    # --------------------------------------------------------
+    def _path(self, symbol: str, interval: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", symbol.upper())
+        return os.path.join(self.directory, interval, f"{safe}.npy")
+
+    def _read_meta(self, path: str) -> dict:
+        try:
+            with open(path + ".meta.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, symbol: str, interval: str) -> np.ndarray:
+        """Stored bars (read-only memory map; empty if none)."""
+        path = self._path(symbol, interval)
+        try:
+            with open(path, "rb") as f:
+                layout = _npy_layout(f)
+            if layout is None:
+                return np.load(path, mmap_mode="r")
+            offset, shape, dtype = layout
+            if not shape[0]:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+        except (OSError, ValueError):
+            return np.empty(0, dtype=BAR_DTYPE)
+
+    @staticmethod
+    def _atomic_write(target: str, writer):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".bars_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer(f)
+            os.replace(tmp, target)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _write_meta(self, path: str, meta: dict):
+        self._atomic_write(path + ".meta.json", lambda f: f.write(json.dumps(meta).encode()))
+
+    def _write(self, path: str, bars: np.ndarray, meta: dict):
+        # Bars first: a reader never sees metadata claiming bars that aren't there yet
+        self._atomic_write(path, lambda f: np.save(f, bars, allow_pickle=False))
+        self._write_meta(path, meta)
+
+    # --------------------------------------------------------
+    # Refresh planning
+    # --------------------------------------------------------
+    def _plan(self, symbol: str, interval: str, period: str, max_age: Optional[float]):
+        """None (serve from disk), ("full", None) or ("since", last_bar_ts_ns)."""
+        path = self._path(symbol, interval)
+        stored, meta = self.load(symbol, interval), self._read_meta(path)
+        lookback = period_to_timedelta(period)
+        wanted_from = 0 if lookback is None else int((time.time() - lookback.total_seconds()) * 1e9)
+
+        if wanted_from < meta.get("covered_from", 2 ** 62):
+            return "full", None
+        max_age = self.refresh_sec if max_age is None else max_age
+        if time.time() - meta.get("refreshed_at", 0) < max_age:
+            return None  # also throttles symbols whose last full download came back empty
+        if not len(stored):
+            return "full", None
+        # Re-fetch from the last complete bar: it doubles as the re-adjustment check
+        return "since", int(stored["ts"][-2 if len(stored) > 1 else -1])
+
+    def _download(self, symbol: str, interval: str, period: str, since_ns: Optional[int]) -> pd.DataFrame:
+        ticker = yf.Ticker(symbol)
+        if since_ns is None:
+            return ticker.history(period=period, interval=interval, auto_adjust=True)
+        start = pd.Timestamp(since_ns, unit="ns", tz="UTC")
+        return ticker.history(start=start.strftime("%Y-%m-%d"), interval=interval, auto_adjust=True)
+
+    def _apply(self, symbol: str, interval: str, period: str, since_ns: Optional[int],
+               fresh: np.ndarray) -> bool:
+        """Merge downloaded bars into the store; False when a full re-download is needed."""
+        path = self._path(symbol, interval)
+        meta = self._read_meta(path)
+        if since_ns is None:
+            lookback = period_to_timedelta(period)
+            meta["covered_from"] = 0 if lookback is None else int(
+                (time.time() - lookback.total_seconds()) * 1e9
+            )
+            meta["refreshed_at"] = time.time()
+            if not len(fresh):
+                # Negative-cache marker: unknown / delisted symbols aren't re-downloaded
+                # on every read, only once `max_age` has passed
+                _count("empty_fetches")
+                self._write_meta(path, meta)
+                return True
+            self._write(path, fresh, meta)
+            _count("full_fetches")
+            _count("bars_fetched", len(fresh))
+            return True
+
+        stored = np.array(self.load(symbol, interval))
+        overlap = fresh[fresh["ts"] == since_ns]
+        old = stored[stored["ts"] == since_ns]
+        if len(overlap) and len(old):
+            drift = abs(overlap["close"][0] - old["close"][0]) / max(abs(old["close"][0]), 1e-12)
+            if drift > BAR_STORE_ADJUST_TOLERANCE:
+                log_info(f"[BarStore] {symbol} {interval} history re-adjusted; re-downloading")
+                return False
+        _count("incremental_fetches")
+        _count("bars_fetched", len(fresh))
+        if len(fresh):
+            meta["refreshed_at"] = time.time()
+            self._write(path, _merge(stored, fresh), meta)
+        else:
+            meta["refreshed_at"] = time.time()
+            self._write_meta(path, meta)
+        return True
+
+    def _refresh(self, symbol: str, interval: str, period: str, max_age: Optional[float]):
+        plan = self._plan(symbol, interval, period, max_age)
+        if plan is None:
+            _count("disk_hits")
+            return
+        mode, since_ns = plan
+        try:
+            fresh = frame_to_bars(self._download(symbol, interval, period, since_ns))
+            if not self._apply(symbol, interval, period, since_ns, fresh):
+                fresh = frame_to_bars(self._download(symbol, interval, period, None))
+                self._apply(symbol, interval, period, None, fresh)
+        except Exception as e:
+            log_error(f"[BarStore] ❌ Refresh failed for {symbol} {interval} ({mode}): {e}")
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+    def get_bars(self, symbol: str, interval: str = "1d", period: str = "1y",
+                 max_age: Optional[float] = None) -> pd.DataFrame:
+        """
+        OHLCV for the last `period` of stored bars (anchored at the newest
+        bar, so "1d" is the latest session even on a weekend). Refreshes
+        from yfinance first when the stored copy is older than `max_age`.
+        """
+        symbol = symbol.upper().strip()
+        self.refresh(symbol, interval, period, max_age)
+        return self._window(self.load(symbol, interval), period)
+
+    def refresh(self, symbol: str, interval: str = "1d", period: str = "1y",
+                max_age: Optional[float] = None):
+        """Bring the stored bars up to date without materializing them (see `load`)."""
+        symbol = symbol.upper().strip()
+        _count("reads")
+        single_flight(
+            "yfinance", "bars", {"symbol": symbol, "interval": interval, "period": period},
+            lambda: self._refresh(symbol, interval, period, max_age),
+        )
+
+    def get_many_bars(self, symbols: Iterable[str], interval: str = "1d", period: str = "1y",
+                      max_age: Optional[float] = None) -> Dict[str, pd.DataFrame]:
+        """
+        `get_bars` for a universe: every symbol that needs provider data is
+        fetched in one bulk `yf.download` (one for full downloads, one for
+        incremental ones starting at the oldest last bar).
+        """
+        symbols = self.refresh_many(symbols, interval, period, max_age)
+        return {s: self._window(self.load(s, interval), period) for s in symbols}
+
+    def refresh_many(self, symbols: Iterable[str], interval: str = "1d", period: str = "1y",
+                     max_age: Optional[float] = None) -> List[str]:
+        """`refresh` for a universe (bulk downloads, see `get_many_bars`); returns the normalized symbols."""
+        symbols = list(dict.fromkeys(s.upper().strip() for s in symbols))
+        _count("reads", len(symbols))
+        full: List[str] = []
+        since: Dict[str, int] = {}
+        for symbol in symbols:
+            plan = self._plan(symbol, interval, period, max_age)
+            if plan is None:
+                _count("disk_hits")
+            elif plan[0] == "full":
+                full.append(symbol)
+            else:
+                since[symbol] = plan[1]
+
+        # Universe sweeps yield provider budget to interactive requests
+        with priority_scope(BACKGROUND):
+            if since:
+                redo = self._bulk(list(since), interval, period, min(since.values()), since)
+                full.extend(redo)
+            if full:
+                self._bulk(full, interval, period, None, {s: None for s in full})
+        return symbols
+
+    def _bulk(self, symbols: List[str], interval: str, period: str, start_ns: Optional[int],
+              since: Dict[str, Optional[int]]) -> List[str]:
+        """One multi-ticker download merged per symbol; returns symbols needing a full re-download."""
+        try:
+            kwargs = {"period": period} if start_ns is None else {
+                "start": pd.Timestamp(start_ns, unit="ns", tz="UTC").strftime("%Y-%m-%d")
+            }
+            raw = yf.download(symbols, interval=interval, group_by="ticker", auto_adjust=True,
+                              threads=True, progress=False, **kwargs)
+        except Exception as e:
+            log_error(f"[BarStore] ❌ Bulk download failed for {len(symbols)} symbols: {e}")
+            return []
+
+        redo = []
+        for symbol in symbols:
+            try:
+                if isinstance(raw.columns, pd.MultiIndex):
+                    frame = raw[symbol] if symbol in raw.columns.get_level_values(0) else None
+                else:
+                    frame = raw
+                fresh = frame_to_bars(frame)
+                if since[symbol] is not None and len(fresh):
+                    fresh = fresh[fresh["ts"] >= since[symbol]]
+                if not self._apply(symbol, interval, period, since[symbol], fresh):
+                    redo.append(symbol)
+            except Exception as e:
+                log_error(f"[BarStore] ❌ Failed to store bars for {symbol}: {e}")
+        return redo
+
+    @staticmethod
+    def _window(bars: np.ndarray, period: str) -> pd.DataFrame:
+        if not len(bars):
+            return bars_to_frame(np.empty(0, dtype=BAR_DTYPE))
+        lookback = period_to_timedelta(period)
+        if lookback is not None:
+            start = bars["ts"][-1] - int(lookback.total_seconds() * 1e9)
+            bars = bars[np.searchsorted(bars["ts"], start, side="right"):]
+        return bars_to_frame(bars)
+
+    def invalidate(self, symbol: str, interval: str):
+        """Forget a key (next read downloads the full period)."""
+        path = self._path(symbol, interval)
+        for target in (path, path + ".meta.json"):
+            try:
+                os.remove(target)
+            except FileNotFoundError:
+                pass
+
+
+bar_store = BarStore()
+
+
+def get_bars(symbol: str, interval: str = "1d", period: str = "1y",
+             max_age: Optional[float] = None) -> pd.DataFrame:
+    return bar_store.get_bars(symbol, interval, period, max_age)
+
+
+def get_many_bars(symbols: Iterable[str], interval: str = "1d", period: str = "1y",
+                  max_age: Optional[float] = None) -> Dict[str, pd.DataFrame]:
+    return bar_store.get_many_bars(symbols, interval, period, max_age)
+
+
+def bar_store_stats() -> dict:
+    """Reads served from disk vs. incremental / full provider downloads."""
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,102 @@
+import os
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.bar_store import bar_store
+from utils.logger import log_info, log_error
+from utils.rate_limiter import BACKGROUND, priority_scope
+from utils.resample import bucket_ids
+from utils.risk import MIN_OBSERVATIONS, compute_market_stats
+
+# Market benchmark per exchange suffix (anything else is compared with SPY)
+DEFAULT_BENCHMARK = os.getenv("BENCHMARK_DEFAULT", "SPY")
+REGION_BENCHMARKS = {
+    ".NS": "^NSEI",    # NSE → Nifty 50
+    ".BO": "^BSESN",   # BSE → Sensex
+    ".T": "^N225",     # Tokyo → Nikkei 225
+    ".HK": "^HSI",     # Hong Kong → Hang Seng
+    ".L": "^FTSE",     # London → FTSE 100
+    ".DE": "^GDAXI",   # Xetra → DAX
+}
+# Benchmark bars are re-checked with the provider at most this often; in between
+# every request reuses the same in-process returns
+BENCHMARK_REFRESH_SEC = float(os.getenv("BENCHMARK_REFRESH_SEC", str(6 * 3600)))
+BENCHMARK_PERIOD = "2y"
+
+_series: Dict[str, Tuple[float, np.ndarray, np.ndarray]] = {}
+_lock = Lock()
+_stats = {"loads": 0, "hits": 0}
+
+
+def benchmark_for(symbol: str) -> str:
+    symbol = (symbol or "").upper()
+    for suffix, index in REGION_BENCHMARKS.items():
+        if symbol.endswith(suffix):
+            return index
+    return DEFAULT_BENCHMARK
+
+
+def daily_log_returns(ts: np.ndarray, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(trading day numbers, log returns) of a daily bar series; day d's return is vs. the previous bar."""
+    close = np.asarray(close, dtype="f8")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(np.where(close > 0, close, np.nan)))
+    return bucket_ids(np.asarray(ts, dtype="i8"), "1d")[1:], returns
+
+
+def benchmark_returns(benchmark: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cached daily log returns of a benchmark (day numbers, returns).
+    Loaded from the bar store once per BENCHMARK_REFRESH_SEC and
+    shared by every risk request in the process.
+    """
+    with _lock:
+        cached = _series.get(benchmark)
+        if cached is not None and time.monotonic() - cached[0] < BENCHMARK_REFRESH_SEC:
+            _stats["hits"] += 1
+            return cached[1], cached[2]
+
+    with priority_scope(BACKGROUND):
+        bar_store.refresh(benchmark, "1d", BENCHMARK_PERIOD, max_age=BENCHMARK_REFRESH_SEC)
+    bars = bar_store.load(benchmark, "1d")
+    days, returns = daily_log_returns(bars["ts"], bars["close"])
+    with _lock:
+        _stats["loads"] += 1
+        if len(returns):
+            _series[benchmark] = (time.monotonic(), days, returns)
+    log_info(f"[Benchmark] Loaded {len(returns)} daily returns for {benchmark}")
+    return days, returns
+
+
+def market_stats(symbol: str, ts: np.ndarray, close: np.ndarray,
+                 benchmark: Optional[str] = None) -> Optional[dict]:
+    """
+    Beta, Jensen's alpha (annualized), correlation and R² of a symbol's
+    daily returns against its benchmark over their common trading days.
+    None when the benchmark is unavailable or the overlap is too short.
+    """
+    benchmark = benchmark or benchmark_for(symbol)
+    try:
+        bench_days, bench_returns = benchmark_returns(benchmark)
+        days, returns = daily_log_returns(ts, close)
+        _, mine, theirs = np.intersect1d(days, bench_days, return_indices=True)
+        if len(mine) + 1 < MIN_OBSERVATIONS:
+            return None
+        row = compute_market_stats(returns[mine], bench_returns[theirs])[0]
+    except Exception as e:
+        log_error(f"[Benchmark] ❌ Regression vs {benchmark} failed for {symbol}: {e}")
+        return None
+
+    stats = {name: row[name].item() for name in row.dtype.names}
+    if np.isnan(stats["beta"]):
+        return None
+    stats["benchmark"] = benchmark
+    return stats
+
+
+def benchmark_stats() -> dict:
+    with _lock:
+        return {**_stats, "benchmarks": sorted(_series)}
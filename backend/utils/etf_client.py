@@ -1,13 +1,35 @@
 import os
-import requests
 from dotenv import load_dotenv
 from utils.logger import log_info, log_error
-from state.shared_state import load_memory, save_memory
+from utils.http_client import Request, run_fetch
+from utils.async_http import run_fetch_async
+from state.shared_state import shared_state
 
 load_dotenv()
 
 TWELVE_API_KEY = os.getenv("TWELVE_API_KEY")
 IEX_API_KEY = os.getenv("IEX_API_KEY")
+# Heuristic profiles served after a failed fetch are only reused this long, so a
+# throttled / offline lookup is retried instead of being remembered for good
+ETF_FALLBACK_TTL_SEC = float(os.getenv("ETF_FALLBACK_TTL_SEC", "900"))
+
+# --------------------------------------------------------------------------
+# 🗂️ Built-in Profiles (Crypto & Commodities)
+# --------------------------------------------------------------------------
+CRYPTO_PROFILES = {
+    "BTC": {"name": "Bitcoin", "asset_type": "Crypto", "top_sector": "Digital Assets", "expected_return": 0.15, "risk_score": "high"},
+    "ETH": {"name": "Ethereum", "asset_type": "Crypto", "top_sector": "Smart Contracts", "expected_return": 0.12, "risk_score": "high"},
+    "SOL": {"name": "Solana", "asset_type": "Crypto", "top_sector": "Blockchain", "expected_return": 0.18, "risk_score": "high"},
+    "XRP": {"name": "Ripple", "asset_type": "Crypto", "top_sector": "Payments", "expected_return": 0.08, "risk_score": "medium"},
+}
+
+COMMODITY_PROFILES = {
+    "GLD": {"name": "SPDR Gold Shares", "asset_type": "Commodity", "top_sector": "Gold", "expected_return": 0.04, "risk_score": "low"},
+    "SLV": {"name": "iShares Silver Trust", "asset_type": "Commodity", "top_sector": "Silver", "expected_return": 0.05, "risk_score": "medium"},
+    "USO": {"name": "United States Oil Fund", "asset_type": "Commodity", "top_sector": "Oil", "expected_return": 0.07, "risk_score": "high"},
+    "DBA": {"name": "Invesco Agriculture Fund", "asset_type": "Commodity", "top_sector": "Agriculture", "expected_return": 0.06, "risk_score": "medium"},
+}
+
 
 # --------------------------------------------------------------------------
 # 🎯 Global ETF, Equity, and Asset Profile Fetcher (Production Grade)
@@ -29,87 +51,109 @@ def get_etf_profile(symbol: str) -> dict:
         }
     """
 
-    symbol = symbol.upper().strip()
-    memory = load_memory()
+    return run_fetch(_etf_profile(symbol))
 
-    # ✅ Step 1: Return cached data if available
-    cached_profiles = memory.get("asset_profiles", {})
-    if symbol in cached_profiles:
-        log_info(f"[get_etf_profile] ⚡ Using cached profile for {symbol}")
-        return cached_profiles[symbol]
 
-    # ✅ Step 2: Predefined mappings for Crypto
-    crypto_map = {
-        "BTC": {"name": "Bitcoin", "asset_type": "Crypto", "top_sector": "Digital Assets", "expected_return": 0.15, "risk_score": "high"},
-        "ETH": {"name": "Ethereum", "asset_type": "Crypto", "top_sector": "Smart Contracts", "expected_return": 0.12, "risk_score": "high"},
-        "SOL": {"name": "Solana", "asset_type": "Crypto", "top_sector": "Blockchain", "expected_return": 0.18, "risk_score": "high"},
-        "XRP": {"name": "Ripple", "asset_type": "Crypto", "top_sector": "Payments", "expected_return": 0.08, "risk_score": "medium"},
-    }
-    if symbol in crypto_map:
-        _cache_and_save_profile(symbol, crypto_map[symbol], memory)
-        return crypto_map[symbol]
-
-    # ✅ Step 3: Predefined mappings for Commodities
-    commodity_map = {
-        "GLD": {"name": "SPDR Gold Shares", "asset_type": "Commodity", "top_sector": "Gold", "expected_return": 0.04, "risk_score": "low"},
-        "SLV": {"name": "iShares Silver Trust", "asset_type": "Commodity", "top_sector": "Silver", "expected_return": 0.05, "risk_score": "medium"},
-        "USO": {"name": "United States Oil Fund", "asset_type": "Commodity", "top_sector": "Oil", "expected_return": 0.07, "risk_score": "high"},
-        "DBA": {"name": "Invesco Agriculture Fund", "asset_type": "Commodity", "top_sector": "Agriculture", "expected_return": 0.06, "risk_score": "medium"},
-    }
-    if symbol in commodity_map:
-        _cache_and_save_profile(symbol, commodity_map[symbol], memory)
-        return commodity_map[symbol]
+async def get_etf_profile_async(symbol: str) -> dict:
+    """Async `get_etf_profile` (same cache, mappings and fallback)."""
+    return await run_fetch_async(_etf_profile(symbol))
+
+
+def _etf_profile(symbol: str):
+    """Fetcher shared by the sync / async calls (see `run_fetch`)."""
+    symbol = symbol.upper().strip()
+
+    # ✅ Steps 1–3: Cached profile or built-in crypto / commodity mapping
+    known = _known_profile(symbol)
+    if known is not None:
+        return known
 
     # ✅ Step 4: Global ETF fetch via TwelveData API
     try:
-        if not TWELVE_API_KEY:
-            raise EnvironmentError("Missing TWELVE_API_KEY environment variable")
-
-        url = f"https://api.twelvedata.com/fundamentals?symbol={symbol}&apikey={TWELVE_API_KEY}"
-        resp = requests.get(url, timeout=10)
+        resp = yield Request("twelvedata", _twelvedata_url(symbol))
         resp.raise_for_status()
-        data = resp.json()
-
-        if not isinstance(data, dict) or "name" not in data:
-            raise ValueError(f"Unexpected TwelveData response format for {symbol}: {data}")
-
-        name = data.get("name", symbol)
-        sectors = data.get("sector_weights", {})
-        top_sector = (
-            max(sectors.items(), key=lambda x: x[1])[0]
-            if sectors else "Unknown"
-        )
-
-        # Basic heuristic for expected return & risk
-        sector_lower = top_sector.lower()
-        if "tech" in sector_lower:
-            expected_return, risk_score = 0.10, "high"
-        elif "bond" in sector_lower or "income" in sector_lower:
-            expected_return, risk_score = 0.04, "low"
-        elif "energy" in sector_lower or "oil" in sector_lower:
-            expected_return, risk_score = 0.07, "medium"
-        else:
-            expected_return, risk_score = 0.06, "medium"
-
-        profile = {
-            "name": name,
-            "asset_type": "ETF",
-            "top_sector": top_sector.title(),
-            "expected_return": expected_return,
-            "risk_score": risk_score
-        }
-
-        log_info(f"[get_etf_profile] ✅ Loaded profile for {symbol}: {profile}")
-        _cache_and_save_profile(symbol, profile, memory)
+        profile = _parse_twelvedata(symbol, resp.json())
+        _cache_and_save_profile(symbol, profile)
         return profile
 
     # ✅ Step 5: Fallback on API or data issues
     except Exception as e:
-        log_error(f"[get_etf_profile] ⚠️ Fallback used for {symbol}: {e}")
-        fallback = _fallback_profile(symbol)
-        _cache_and_save_profile(symbol, fallback, memory)
+        return _fallback_after_error(symbol, e)
+
+
+# --------------------------------------------------------------------------
+# 🔧 Helpers shared by the sync and async fetchers
+# --------------------------------------------------------------------------
+def _known_profile(symbol: str) -> dict | None:
+    """Cached profile (shared state) or a built-in crypto / commodity mapping."""
+    cached_profiles = shared_state.get_global("asset_profiles") or {}
+    if symbol in cached_profiles:
+        log_info(f"[get_etf_profile] ⚡ Using cached profile for {symbol}")
+        return cached_profiles[symbol]
+
+    fallback = shared_state.cache_get(_fallback_key(symbol))
+    if fallback is not None:
+        log_info(f"[get_etf_profile] ⚡ Using recent fallback profile for {symbol}")
         return fallback
 
+    for mapping in (CRYPTO_PROFILES, COMMODITY_PROFILES):
+        if symbol in mapping:
+            _cache_and_save_profile(symbol, mapping[symbol])
+            return mapping[symbol]
+    return None
+
+
+def _twelvedata_url(symbol: str) -> str:
+    if not TWELVE_API_KEY:
+        raise EnvironmentError("Missing TWELVE_API_KEY environment variable")
+    return f"https://api.twelvedata.com/fundamentals?symbol={symbol}&apikey={TWELVE_API_KEY}"
+
+
+def _parse_twelvedata(symbol: str, data: dict) -> dict:
+    """Turn a TwelveData fundamentals payload into a standardized profile."""
+    if not isinstance(data, dict) or "name" not in data:
+        raise ValueError(f"Unexpected TwelveData response format for {symbol}: {data}")
+
+    name = data.get("name", symbol)
+    sectors = data.get("sector_weights", {})
+    top_sector = (
+        max(sectors.items(), key=lambda x: x[1])[0]
+        if sectors else "Unknown"
+    )
+
+    # Basic heuristic for expected return & risk
+    sector_lower = top_sector.lower()
+    if "tech" in sector_lower:
+        expected_return, risk_score = 0.10, "high"
+    elif "bond" in sector_lower or "income" in sector_lower:
+        expected_return, risk_score = 0.04, "low"
+    elif "energy" in sector_lower or "oil" in sector_lower:
+        expected_return, risk_score = 0.07, "medium"
+    else:
+        expected_return, risk_score = 0.06, "medium"
+
+    profile = {
+        "name": name,
+        "asset_type": "ETF",
+        "top_sector": top_sector.title(),
+        "expected_return": expected_return,
+        "risk_score": risk_score
+    }
+
+    log_info(f"[get_etf_profile] ✅ Loaded profile for {symbol}: {profile}")
+    return profile
+
+
+def _fallback_after_error(symbol: str, error: Exception) -> dict:
+    log_error(f"[get_etf_profile] ⚠️ Fallback used for {symbol}: {error}")
+    fallback = _fallback_profile(symbol)
+    shared_state.cache_set(_fallback_key(symbol), fallback, ttl=ETF_FALLBACK_TTL_SEC)
+    return fallback
+
+
+def _fallback_key(symbol: str) -> str:
+    return f"fundamentals:etf_fallback:{symbol}"
+
 
 # --------------------------------------------------------------------------
 # 🧩 Helper: Fallback Profile Generator
@@ -143,11 +187,10 @@ def _fallback_profile(symbol: str) -> dict:
 # --------------------------------------------------------------------------
 # 💾 Helper: Cache and Persist Asset Profile
 # --------------------------------------------------------------------------
-def _cache_and_save_profile(symbol: str, profile: dict, memory: dict):
+def _cache_and_save_profile(symbol: str, profile: dict):
     """
     Stores the latest asset profile in persistent memory for future reuse.
     """
-    if "asset_profiles" not in memory:
-        memory["asset_profiles"] = {}
-    memory["asset_profiles"][symbol] = profile
-    save_memory(memory)
+    profiles = dict(shared_state.get_global("asset_profiles") or {})
+    profiles[symbol] = profile
+    shared_state.set_global("asset_profiles", profiles)
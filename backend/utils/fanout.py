@@ -0,0 +1,106 @@
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from threading import BoundedSemaphore, Lock, local
+from typing import Any, Callable, Iterable, List, Optional
+
+from utils.logger import log_error
+
+# Shared worker pool for network fan-out (I/O bound, so threads are fine)
+FANOUT_MAX_WORKERS = int(os.getenv("FANOUT_MAX_WORKERS", "32"))
+FANOUT_TIMEOUT_SEC = float(os.getenv("FANOUT_TIMEOUT_SEC", "15"))
+
+# Concurrent calls allowed per provider (override with FANOUT_LIMIT_<PROVIDER>)
+PROVIDER_LIMITS = {
+    "default": 8,
+    "yfinance": 8,
+    "alpha_vantage": 5,
+    "twelvedata": 4,
+    "finnhub": 5,
+    "fred": 4,
+    "newsapi": 4,
+}
+
+_executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="fanout")
+_semaphores: dict[str, BoundedSemaphore] = {}
+_semaphore_lock = Lock()
+_worker = local()
+
+
+def provider_limit(provider: str) -> int:
+    env = os.getenv(f"FANOUT_LIMIT_{provider.upper()}")
+    if env:
+        return max(1, int(env))
+    return PROVIDER_LIMITS.get(provider, PROVIDER_LIMITS["default"])
+
+
+def _semaphore(provider: str) -> BoundedSemaphore:
+    with _semaphore_lock:
+        sem = _semaphores.get(provider)
+        if sem is None:
+            sem = _semaphores[provider] = BoundedSemaphore(provider_limit(provider))
+        return sem
+
+
+def _run(fn: Callable, item: Any, sem: BoundedSemaphore):
+    _worker.active = True
+    try:
+        return fn(item)
+    finally:
+        _worker.active = False
+        sem.release()
+
+
+def fan_out(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    provider: str = "default",
+    timeout: Optional[float] = None,
+    default: Any = None,
+) -> List[Any]:
+    """
+    ⚡ Bounded Concurrent Map for Network Calls
+    ------------------------------------------------------------
+    Runs `fn(item)` for every item on the shared pool and returns
+    the results in input order.
+
+      - At most `provider_limit(provider)` calls of one provider run
+        at once, across every caller in the process
+      - Each call gets `timeout` seconds (FANOUT_TIMEOUT_SEC by
+        default); a call that fails or times out yields `default`
+      - Called from inside a fan-out task, items run inline so
+        nested fan-outs can never exhaust the pool
+    """
+    items = list(items)
+    timeout = FANOUT_TIMEOUT_SEC if timeout is None else timeout
+
+    if getattr(_worker, "active", False) or len(items) <= 1:
+        results = []
+        for item in items:
+            try:
+                results.append(fn(item))
+            except Exception as e:
+                log_error(f"[fan_out] ❌ {provider} call failed for {item}: {e}")
+                results.append(default)
+        return results
+
+    sem = _semaphore(provider)
+    futures = []
+    for item in items:
+        sem.acquire()  # back-pressure: queue no more than the provider allows
+        # Copy the caller's context so request priority etc. follow the call into the pool
+        ctx = contextvars.copy_context()
+        futures.append((item, time.monotonic() + timeout, _executor.submit(ctx.run, _run, fn, item, sem)))
+
+    results = []
+    for item, deadline, future in futures:
+        try:
+            results.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except FutureTimeout:
+            log_error(f"[fan_out] ⏱️ {provider} call timed out after {timeout}s for {item}")
+            results.append(default)
+        except Exception as e:
+            log_error(f"[fan_out] ❌ {provider} call failed for {item}: {e}")
+            results.append(default)
+    return results
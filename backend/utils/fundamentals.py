@@ -0,0 +1,94 @@
+import os
+
+import yfinance as yf
+from dotenv import load_dotenv
+
+from state.shared_state import shared_state
+from state.ttl_cache import TTLCache
+from utils.logger import log_info, log_error
+from utils.fanout import fan_out
+from utils.single_flight import single_flight
+
+load_dotenv()
+
+# yfinance `Ticker.info` changes at most daily; one fetch per symbol per TTL
+FUNDAMENTALS_TTL_SEC = float(os.getenv("FUNDAMENTALS_TTL_SEC", str(24 * 3600)))
+FUNDAMENTALS_MAX_ENTRIES = int(os.getenv("FUNDAMENTALS_MAX_ENTRIES", "1000"))
+FUNDAMENTALS_MAX_BYTES = int(os.getenv("FUNDAMENTALS_MAX_BYTES", str(32 * 1024 * 1024)))
+# Also keep entries in SharedState's TTL cache (survives restarts, shared by workers)
+FUNDAMENTALS_PERSIST = os.getenv("FUNDAMENTALS_PERSIST", "1").lower() in {"1", "true", "yes"}
+
+_cache = TTLCache(FUNDAMENTALS_MAX_ENTRIES, FUNDAMENTALS_MAX_BYTES)
+_stats = {"fetches": 0, "persisted_hits": 0, "failures": 0}
+
+
+def _cache_key(symbol: str) -> str:
+    return f"fundamentals:{symbol}"
+
+
+def get_fundamentals(symbol: str) -> dict:
+    """
+    📚 Cached `yf.Ticker(symbol).info`
+    ------------------------------------------------------------
+    Lookup order: in-process LRU → persisted SharedState cache →
+    network. Concurrent lookups of the same symbol share one fetch.
+    Failed fetches return {} and are not cached.
+    """
+    symbol = (symbol or "").upper().strip()
+    if not symbol:
+        return {}
+
+    info = _cache.get(symbol)
+    if info is not None:
+        return info
+
+    return single_flight("yfinance", "info", {"symbol": symbol}, lambda: _load(symbol))
+
+
+def _load(symbol: str) -> dict:
+    """Leader of a coalesced lookup: re-check the caches, then fetch."""
+    info = _cache.get(symbol)
+    if info is not None:
+        return info
+
+    if FUNDAMENTALS_PERSIST:
+        info = shared_state.cache_get(_cache_key(symbol))
+        if info is not None:
+            _stats["persisted_hits"] += 1
+            _cache.set(symbol, info, FUNDAMENTALS_TTL_SEC)
+            return info
+
+    try:
+        info = yf.Ticker(symbol).info or {}
+        _stats["fetches"] += 1
+    except Exception as e:
+        _stats["failures"] += 1
+        log_error(f"[Fundamentals] ❌ Info fetch failed for {symbol}: {e}")
+        return {}
+
+    if info:
+        _cache.set(symbol, info, FUNDAMENTALS_TTL_SEC)
+        if FUNDAMENTALS_PERSIST:
+            shared_state.cache_set(_cache_key(symbol), info, ttl=FUNDAMENTALS_TTL_SEC)
+        log_info(f"[Fundamentals] 📥 Cached fundamentals for {symbol}")
+    return info
+
+
+def get_many_fundamentals(symbols) -> dict[str, dict]:
+    """Fundamentals for several symbols (each cached independently, misses fetched concurrently)."""
+    symbols = list(symbols)
+    results = fan_out(get_fundamentals, symbols, provider="yfinance", default={})
+    return dict(zip(symbols, results))
+
+
+def invalidate_fundamentals(symbol: str):
+    """Drop a symbol from every cache tier."""
+    symbol = (symbol or "").upper().strip()
+    _cache.delete(symbol)
+    if FUNDAMENTALS_PERSIST:
+        shared_state.cache_delete(_cache_key(symbol))
+
+
+def fundamentals_stats() -> dict:
+    """Network fetches / persisted hits plus in-process cache counters."""
+    return {**_stats, **_cache.stats()}
@@ -0,0 +1,218 @@
+import os
+from threading import Lock
+from typing import Any, Callable, Generator, NamedTuple, TypeVar, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+from utils.fanout import provider_limit
+from utils.quota import check_quota, record_call
+from utils.rate_limiter import BudgetExhausted, acquire, penalize
+from utils.single_flight import single_flight
+
+# Per-provider request timeouts in seconds (override with HTTP_TIMEOUT_<PROVIDER>)
+PROVIDER_TIMEOUTS = {
+    "default": 10.0,
+    "alpha_vantage": 10.0,
+    "twelvedata": 10.0,
+    "iex": 8.0,
+    "newsapi": 10.0,
+    "bing": 8.0,
+    "fred": 8.0,
+    "finnhub": 5.0,
+}
+
+# Retries on 429 / 5xx with exponential backoff plus random jitter
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_SEC = float(os.getenv("HTTP_BACKOFF_SEC", "0.5"))
+HTTP_BACKOFF_MAX_SEC = float(os.getenv("HTTP_BACKOFF_MAX_SEC", "8"))
+HTTP_BACKOFF_JITTER_SEC = float(os.getenv("HTTP_BACKOFF_JITTER_SEC", "0.5"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_HEADERS = {"User-Agent": "TradingAssistant/1.0"}
+
+_sessions: dict[str, requests.Session] = {}
+_requests: dict[str, int] = {}
+_lock = Lock()
+
+
+def provider_timeout(provider: str) -> float:
+    env = os.getenv(f"HTTP_TIMEOUT_{provider.upper()}")
+    if env:
+        return float(env)
+    return PROVIDER_TIMEOUTS.get(provider, PROVIDER_TIMEOUTS["default"])
+
+
+def charge_call(provider: str):
+    """Spend one call of the provider's daily quota and rate budget (raises BudgetExhausted)."""
+    check_quota(provider)
+    acquire(provider)
+    record_call(provider)
+
+
+class BudgetedRetry(Retry):
+    """
+    urllib3 Retry that charges every re-attempt like a new call. When
+    the budget or quota is spent, retrying stops and the last response
+    (or connection error) is handed back as if retries had run out.
+    """
+
+    provider = "default"
+
+    def new(self, **kw) -> "BudgetedRetry":
+        retry = super().new(**kw)
+        retry.provider = self.provider
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        try:
+            charge_call(self.provider)
+        except BudgetExhausted as e:
+            raise MaxRetryError(_pool, url, error or e) from e
+        return retry
+
+
+def _build_session(provider: str) -> requests.Session:
+    retry = BudgetedRetry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=HTTP_MAX_RETRIES,
+        status=HTTP_MAX_RETRIES,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        backoff_factor=HTTP_BACKOFF_SEC,
+        backoff_max=HTTP_BACKOFF_MAX_SEC,
+        backoff_jitter=HTTP_BACKOFF_JITTER_SEC,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the last response back; callers raise_for_status()
+    )
+    retry.provider = provider
+    # Keep at least one idle connection per concurrent fan-out slot
+    pool_size = max(HTTP_POOL_SIZE, provider_limit(provider))
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=pool_size)
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(provider: str) -> requests.Session:
+    """
+    🔌 Pooled HTTP Session per Provider
+    ------------------------------------------------------------
+    One keep-alive `requests.Session` per provider, created on first
+    use: connections are reused across calls and threads, and
+    429 / 5xx responses are retried with jittered exponential
+    backoff (honouring Retry-After).
+    """
+    with _lock:
+        session = _sessions.get(provider)
+        if session is None:
+            session = _sessions[provider] = _build_session(provider)
+            _requests[provider] = 0
+        return session
+
+
+def retry_after_seconds(headers, default: float = 60.0) -> float:
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return default
+
+
+def http_get(provider: str, url: str, timeout: float | None = None, **kwargs) -> requests.Response:
+    """
+    GET through the provider's pooled session with its default timeout.
+    Takes a token from the provider's rate budget first (raises
+    BudgetExhausted instead of spending a round trip when none is left)
+    and counts the call against the provider's daily quota. Identical
+    concurrent GETs share one request and its (read-only) response.
+    """
+    def issue() -> requests.Response:
+        charge_call(provider)  # retries are charged by BudgetedRetry
+        session = get_session(provider)
+        with _lock:
+            _requests[provider] += 1
+        resp = session.get(url, timeout=provider_timeout(provider) if timeout is None else timeout, **kwargs)
+        if resp.status_code == 429:  # still limited after retries: stop sending for a while
+            penalize(provider, retry_after_seconds(resp.headers))
+        return resp
+
+    return single_flight(provider, url, request_identity(kwargs), issue)
+
+
+class Request(NamedTuple):
+    """One GET a fetcher generator asks its driver to issue (see `run_fetch`)."""
+    provider: str
+    url: str
+    kwargs: dict = {}
+
+
+T = TypeVar("T")
+# Yields Requests (answered with a response) or blocking callables (answered with their result)
+Fetcher = Generator[Union[Request, Callable[[], Any]], Any, T]
+
+
+def run_fetch(fetcher: Fetcher[T]) -> T:
+    """
+    Drive a fetcher with blocking IO: every yielded Request goes through
+    `http_get`, every yielded callable is called, and the result (or the
+    exception) is sent back in. The sync and async clients share one
+    fetcher body this way; `async_http.run_fetch_async` is the async driver.
+    """
+    try:
+        step = next(fetcher)
+        while True:
+            try:
+                result = http_get(step.provider, step.url, **step.kwargs) if isinstance(step, Request) else step()
+            except Exception as e:
+                step = fetcher.throw(e)
+            else:
+                step = fetcher.send(result)
+    except StopIteration as done:
+        return done.value
+
+
+def request_identity(kwargs: dict) -> dict:
+    """The parts of a GET that decide its response (coalescing key)."""
+    return {"params": kwargs.get("params"), "headers": kwargs.get("headers")}
+
+
+def http_stats() -> dict[str, dict[str, int]]:
+    """Per provider: logical requests, HTTP attempts (incl. retries), connections opened / reused."""
+    stats = {}
+    with _lock:
+        sessions = dict(_sessions)
+        counts = dict(_requests)
+    for provider, session in sessions.items():
+        attempts = opened = 0
+        for adapter in set(session.adapters.values()):
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                attempts += pool.num_requests
+                opened += pool.num_connections
+        stats[provider] = {
+            "requests": counts.get(provider, 0),
+            "attempts": attempts,
+            "retries": max(0, attempts - counts.get(provider, 0)),
+            "connections_opened": opened,
+            "connections_reused": max(0, attempts - opened),
+        }
+    return stats
+
+
+def close_sessions():
+    """Close every pooled session (e.g. on application shutdown)."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
@@ -1,34 +1,33 @@
 # utils/iex_client.py
 # Production-grade IEX Cloud integration wrapper
 
+import asyncio
 import os
-import requests
 from utils.logger import log_info, log_error
+from utils.http_client import Request, run_fetch
+from utils.async_http import run_fetch_async
 
 IEX_TOKEN = os.getenv("IEX_API_TOKEN")
 BASE_URL = "https://cloud.iexapis.com/stable"
 
 
-def get_iex_quote(symbol: str) -> dict:
+def _iex_endpoint(symbol: str, endpoint: str):
+    """Fetcher shared by the sync / async IEX calls (see `run_fetch`)."""
     try:
-        url = f"{BASE_URL}/stock/{symbol}/quote?token={IEX_TOKEN}"
-        response = requests.get(url)
+        response = yield Request("iex", f"{BASE_URL}/stock/{symbol}/{endpoint}?token={IEX_TOKEN}")
         response.raise_for_status()
         return response.json()
     except Exception as e:
-        log_error(f"[IEX] Failed to fetch quote for {symbol}: {e}")
+        log_error(f"[IEX] Failed to fetch {endpoint} for {symbol}: {e}")
         return {}
 
 
+def get_iex_quote(symbol: str) -> dict:
+    return run_fetch(_iex_endpoint(symbol, "quote"))
+
+
 def get_iex_stats(symbol: str) -> dict:
-    try:
-        url = f"{BASE_URL}/stock/{symbol}/stats?token={IEX_TOKEN}"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        log_error(f"[IEX] Failed to fetch stats for {symbol}: {e}")
-        return {}
+    return run_fetch(_iex_endpoint(symbol, "stats"))
 
 
 def get_iex_advanced(symbol: str) -> dict:
@@ -38,3 +37,20 @@ def get_iex_advanced(symbol: str) -> dict:
     quote = get_iex_quote(symbol)
     stats = get_iex_stats(symbol)
     return {"quote": quote, "stats": stats}
+
+
+# --------------------------------------------------------------------------
+# ⚡ Async variants
+# --------------------------------------------------------------------------
+async def get_iex_quote_async(symbol: str) -> dict:
+    return await run_fetch_async(_iex_endpoint(symbol, "quote"))
+
+
+async def get_iex_stats_async(symbol: str) -> dict:
+    return await run_fetch_async(_iex_endpoint(symbol, "stats"))
+
+
+async def get_iex_advanced_async(symbol: str) -> dict:
+    """Quote + stats fetched concurrently."""
+    quote, stats = await asyncio.gather(get_iex_quote_async(symbol), get_iex_stats_async(symbol))
+    return {"quote": quote, "stats": stats}
@@ -0,0 +1,274 @@
+import math
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional
+
+import numpy as np
+
+from state.shared_state import shared_state
+from utils.bar_store import bar_store
+from utils.indicators import BB_PERIOD, BB_STDDEV, MA_PERIODS, MACD_FAST, MACD_SIGNAL, MACD_SLOW, RSI_PERIOD
+from utils.logger import log_info, log_error
+
+WINDOW = max(MA_PERIODS + (BB_PERIOD,))
+A_FAST = 2.0 / (MACD_FAST + 1)
+A_SLOW = 2.0 / (MACD_SLOW + 1)
+A_SIGNAL = 2.0 / (MACD_SIGNAL + 1)
+# Sliding sums pick up rounding drift; rebuild them from the window this often
+RESYNC_EVERY = 500
+# In-process states kept hot (the rest reload from SharedState's cache)
+INDICATOR_STATE_MAX = int(os.getenv("INDICATOR_STATE_MAX", "1000"))
+# Relative close mismatch on the last committed bar that means history was rewritten
+REBUILD_TOLERANCE = 1e-6
+
+
+class IndicatorState:
+    """
+    🔁 Streaming Indicator State for one (symbol, interval)
+    ------------------------------------------------------------
+    Accumulators that advance in O(1) per bar:
+
+      - RSI       → Wilder-smoothed average gain / loss
+      - MACD      → fast / slow / signal EMA accumulators
+      - Bollinger → sliding Welford mean and M2 over BB_PERIOD bars
+      - MA 50/200 → sliding sums over a fixed ring buffer
+
+    Only complete bars are committed. The newest bar (possibly
+    still forming) is previewed on top of the committed state
+    without changing it.
+    """
+
+    def __init__(self, symbol: str, interval: str):
+        self.symbol = symbol
+        self.interval = interval
+        self.ts: Optional[int] = None     # last committed bar (ns UTC)
+        self.close: Optional[float] = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.ema_fast = self.ema_slow = self.ema_signal = math.nan
+        self.ring = np.full(WINDOW, np.nan)
+        self.head = 0                     # next ring slot to write
+        self.sums = {p: 0.0 for p in MA_PERIODS}
+        self.bb_mean = 0.0
+        self.bb_m2 = 0.0
+
+    # --------------------------------------------------------
+    # Core step (pure: returns the would-be accumulators)
+    # --------------------------------------------------------
+    def _back(self, k: int) -> float:
+        """Close committed k bars ago (1 = last committed)."""
+        return self.ring[(self.head - k) % WINDOW]
+
+    def _step(self, close: float) -> dict:
+        n = self.count + 1
+        nxt: Dict[str, object] = {"count": n}
+
+        # RSI (Wilder): simple average over the first RSI_PERIOD changes, then smoothing
+        gain = loss = 0.0
+        if self.close is not None:
+            delta = close - self.close
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        changes = n - 1
+        if changes == 0:
+            nxt["avg_gain"], nxt["avg_loss"] = 0.0, 0.0
+        elif changes <= RSI_PERIOD:
+            nxt["avg_gain"] = self.avg_gain + (gain - self.avg_gain) / changes
+            nxt["avg_loss"] = self.avg_loss + (loss - self.avg_loss) / changes
+        else:
+            nxt["avg_gain"] = (self.avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+            nxt["avg_loss"] = (self.avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+
+        # MACD EMAs (start at the first close, like pandas adjust=False)
+        if n == 1:
+            fast = slow = close
+            signal = 0.0
+        else:
+            fast = self.ema_fast + A_FAST * (close - self.ema_fast)
+            slow = self.ema_slow + A_SLOW * (close - self.ema_slow)
+            signal = self.ema_signal + A_SIGNAL * ((fast - slow) - self.ema_signal)
+        nxt["ema_fast"], nxt["ema_slow"], nxt["ema_signal"] = fast, slow, signal
+
+        # Moving-average sums: add the new close, drop the one leaving each window
+        sums = {}
+        for period, total in self.sums.items():
+            total += close
+            if n > period:
+                total -= self._back(period)
+            sums[period] = total
+        nxt["sums"] = sums
+
+        # Bollinger: Welford while filling the window, sliding Welford once full
+        if n <= BB_PERIOD:
+            delta = close - self.bb_mean
+            mean = self.bb_mean + delta / n
+            m2 = self.bb_m2 + delta * (close - mean)
+        else:
+            old = self._back(BB_PERIOD)
+            mean = self.bb_mean + (close - old) / BB_PERIOD
+            m2 = self.bb_m2 + (close - old) * (close - mean + old - self.bb_mean)
+        nxt["bb_mean"], nxt["bb_m2"] = mean, max(m2, 0.0)
+        return nxt
+
+    def push(self, ts: int, close: float):
+        """Commit one complete bar."""
+        nxt = self._step(close)
+        self.ring[self.head] = close
+        self.head = (self.head + 1) % WINDOW
+        for key, value in nxt.items():
+            setattr(self, key, value)
+        self.ts, self.close = int(ts), float(close)
+        if self.count % RESYNC_EVERY == 0:
+            self._resync()
+
+    def _resync(self):
+        for period in MA_PERIODS:
+            if self.count >= period:
+                self.sums[period] = float(sum(self._back(k) for k in range(1, period + 1)))
+        if self.count >= BB_PERIOD:
+            window = np.array([self._back(k) for k in range(1, BB_PERIOD + 1)])
+            self.bb_mean = float(window.mean())
+            self.bb_m2 = float(((window - self.bb_mean) ** 2).sum())
+
+    # --------------------------------------------------------
+    # Reading values
+    # --------------------------------------------------------
+    def values(self, close: Optional[float] = None) -> dict:
+        """Indicators after the committed bars, plus the forming bar `close` if given."""
+        if close is None:
+            if self.count == 0:
+                return {}
+            acc = {
+                "count": self.count, "avg_gain": self.avg_gain, "avg_loss": self.avg_loss,
+                "ema_fast": self.ema_fast, "ema_slow": self.ema_slow, "ema_signal": self.ema_signal,
+                "sums": self.sums, "bb_mean": self.bb_mean, "bb_m2": self.bb_m2,
+            }
+            price = self.close
+        else:
+            acc, price = self._step(close), close
+
+        n = acc["count"]
+        rsi = None
+        if n - 1 >= RSI_PERIOD:
+            gain, loss = acc["avg_gain"], acc["avg_loss"]
+            rsi = 100.0 if loss == 0 and gain > 0 else (None if loss == 0 else 100.0 - 100.0 / (1.0 + gain / loss))
+        macd = acc["ema_fast"] - acc["ema_slow"]
+        out = {
+            "price": price,
+            "rsi": rsi,
+            "macd": macd,
+            "macd_signal": acc["ema_signal"],
+            "macd_hist": macd - acc["ema_signal"],
+            "bars": n,
+        }
+        if n >= BB_PERIOD:
+            std = math.sqrt(acc["bb_m2"] / (BB_PERIOD - 1))
+            out.update(bb_mid=acc["bb_mean"], bb_upper=acc["bb_mean"] + BB_STDDEV * std,
+                       bb_lower=acc["bb_mean"] - BB_STDDEV * std)
+        else:
+            out.update(bb_mid=None, bb_upper=None, bb_lower=None)
+        for period in MA_PERIODS:
+            out[f"ma_{period}"] = acc["sums"][period] / period if n >= period else None
+        return out
+
+    # --------------------------------------------------------
+    # Persistence
+    # --------------------------------------------------------
+    def to_dict(self) -> dict:
+        ordered = [float(self._back(k)) for k in range(min(self.count, WINDOW), 0, -1)]
+        return {
+            "symbol": self.symbol, "interval": self.interval, "ts": self.ts, "close": self.close,
+            "count": self.count, "avg_gain": self.avg_gain, "avg_loss": self.avg_loss,
+            "ema": [self.ema_fast, self.ema_slow, self.ema_signal],
+            "window": ordered, "sums": {str(p): v for p, v in self.sums.items()},
+            "bb": [self.bb_mean, self.bb_m2],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndicatorState":
+        state = cls(data["symbol"], data["interval"])
+        state.ts, state.close, state.count = data["ts"], data["close"], data["count"]
+        state.avg_gain, state.avg_loss = data["avg_gain"], data["avg_loss"]
+        state.ema_fast, state.ema_slow, state.ema_signal = data["ema"]
+        window = data["window"]
+        state.ring[:len(window)] = window
+        state.head = len(window) % WINDOW
+        state.sums = {int(p): v for p, v in data["sums"].items()}
+        state.bb_mean, state.bb_m2 = data["bb"]
+        return state
+
+
+# --------------------------------------------------------
+# Store-backed states (persisted in SharedState's cache)
+# --------------------------------------------------------
+_states: "OrderedDict[tuple, IndicatorState]" = OrderedDict()
+_lock = Lock()
+_stats = {"reads": 0, "bars_pushed": 0, "rebuilds": 0}
+
+
+def _cache_key(symbol: str, interval: str) -> str:
+    return f"indicators:{interval}:{symbol}"
+
+
+def _load_state(symbol: str, interval: str) -> Optional[IndicatorState]:
+    state = _states.get((symbol, interval))
+    if state is None:
+        saved = shared_state.cache_get(_cache_key(symbol, interval))
+        if saved:
+            try:
+                state = IndicatorState.from_dict(saved)
+            except Exception as e:
+                log_error(f"[IndicatorState] Dropping unreadable state for {symbol} {interval}: {e}")
+    return state
+
+
+def latest_indicators(symbol: str, interval: str = "1d", period: str = "1y",
+                      max_age: Optional[float] = None) -> dict:
+    """
+    Latest indicator values for a symbol from its streaming state.
+    Only bars newer than the last committed one are read from the bar
+    store; the full history is replayed only on first use or when the
+    store rewrote it (split / dividend re-adjustment).
+    """
+    symbol = symbol.upper().strip()
+    bar_store.refresh(symbol, interval, period, max_age)
+    bars = bar_store.load(symbol, interval)
+    if not len(bars):
+        return {}
+
+    with _lock:
+        _stats["reads"] += 1
+        state = _load_state(symbol, interval)
+        ts = bars["ts"]
+        start = None
+        if state is not None and state.ts is not None:
+            i = int(np.searchsorted(ts, state.ts))
+            # The committed bar must still be stored (unchanged) and not be the newest one
+            if i < len(bars) - 1 and ts[i] == state.ts and \
+                    abs(bars["close"][i] - state.close) <= REBUILD_TOLERANCE * max(abs(state.close), 1.0):
+                start = i + 1
+        if start is None:
+            if state is not None:
+                log_info(f"[IndicatorState] Rebuilding {symbol} {interval} from stored history")
+            _stats["rebuilds"] += 1
+            state, start = IndicatorState(symbol, interval), 0
+
+        # Commit every complete bar; the newest one is only previewed
+        pending = bars[start:len(bars) - 1]
+        for bar_ts, close in zip(pending["ts"], pending["close"]):
+            state.push(int(bar_ts), float(close))
+        _stats["bars_pushed"] += len(pending)
+        _states[(symbol, interval)] = state
+        _states.move_to_end((symbol, interval))
+        while len(_states) > INDICATOR_STATE_MAX:
+            _states.popitem(last=False)
+        if len(pending):
+            shared_state.cache_set(_cache_key(symbol, interval), state.to_dict())
+
+        return state.values(float(bars["close"][-1]))
+
+
+def indicator_state_stats() -> dict:
+    with _lock:
+        return {**_stats, "states": len(_states)}
@@ -0,0 +1,213 @@
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Parameters used by technical_analysis_node
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BB_PERIOD, BB_STDDEV = 20, 2.0
+MA_PERIODS = (50, 200)
+
+INDICATOR_DTYPE = np.dtype([
+    ("price", "f8"),
+    ("rsi", "f8"),
+    ("macd", "f8"),
+    ("macd_signal", "f8"),
+    ("macd_hist", "f8"),
+    ("bb_mid", "f8"),
+    ("bb_upper", "f8"),
+    ("bb_lower", "f8"),
+    ("ma_50", "f8"),
+    ("ma_200", "f8"),
+    ("bars", "i8"),
+])
+
+
+def close_matrix(series: Mapping[str, object], bars: Optional[int] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    Stack per-symbol closes into a (symbols × bars) float matrix, aligned
+    on the latest bar and NaN-padded on the left for shorter histories.
+    Values may be DataFrames (uses "Close"), Series or arrays.
+    """
+    symbols, columns = [], []
+    for symbol, values in series.items():
+        if isinstance(values, pd.DataFrame):
+            values = values["Close"]
+        arr = np.asarray(values, dtype="f8")
+        symbols.append(symbol)
+        columns.append(arr[-bars:] if bars else arr)
+    width = max((len(c) for c in columns), default=0)
+    matrix = np.full((len(columns), width), np.nan)
+    for i, arr in enumerate(columns):
+        if len(arr):
+            matrix[i, width - len(arr):] = arr
+    return symbols, matrix
+
+
+def _window_mean(close: np.ndarray, period: int) -> np.ndarray:
+    """Mean of the last `period` bars per row; NaN when the window isn't full (pandas semantics)."""
+    if close.shape[1] < period:
+        return np.full(close.shape[0], np.nan)
+    return close[:, -period:].mean(axis=1)
+
+
+def moving_average(close: np.ndarray, period: int, lag: int = 0) -> np.ndarray:
+    """Simple moving average per row ending `lag` bars before the latest (NaN when the window isn't full)."""
+    close = np.atleast_2d(np.asarray(close, dtype="f8"))
+    return _window_mean(close[:, :close.shape[1] - lag], period)
+
+
+def _ema_family(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MACD line and signal at the last bar for every row, in one pass over
+    the bars (fast, slow and signal EMAs advance together, vectorized
+    across symbols). Matches pandas `ewm(span, adjust=False)`: each row's
+    EMAs start at its first valid close.
+    """
+    a_fast = 2.0 / (MACD_FAST + 1)
+    a_slow = 2.0 / (MACD_SLOW + 1)
+    a_sig = 2.0 / (MACD_SIGNAL + 1)
+    rows = close.shape[0]
+    fast = np.full(rows, np.nan)
+    slow = np.full(rows, np.nan)
+    signal = np.full(rows, np.nan)
+    for t in range(close.shape[1]):
+        x = close[:, t]
+        valid = ~np.isnan(x)
+        started = valid & ~np.isnan(fast)
+        first = valid & np.isnan(fast)
+        fast[first] = slow[first] = x[first]
+        fast[started] += a_fast * (x[started] - fast[started])
+        slow[started] += a_slow * (x[started] - slow[started])
+        macd = fast - slow
+        sig_first = first & np.isnan(signal)
+        signal[sig_first] = macd[sig_first]
+        signal[started] += a_sig * (macd[started] - signal[started])
+    return fast - slow, signal
+
+
+def _rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """Simple-average RSI over the last `period` price changes (same as the rolling-mean version)."""
+    if close.shape[1] <= period:
+        return np.full(close.shape[0], np.nan)
+    delta = np.diff(close[:, -(period + 1):], axis=1)
+    gain = np.clip(delta, 0, None).mean(axis=1)
+    loss = -np.clip(delta, None, 0).mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+        return 100.0 - 100.0 / (1.0 + rs)
+
+
+def _rsi_wilder(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder-smoothed RSI at the last bar for every row (same recurrence as
+    the streaming IndicatorState): a running mean over the first `period`
+    changes, then avg = (avg * (period - 1) + x) / period.
+    """
+    delta = np.diff(close, axis=1)
+    rows = close.shape[0]
+    gain, loss = np.zeros(rows), np.zeros(rows)
+    seen = np.zeros(rows)
+    for t in range(delta.shape[1]):
+        d = delta[:, t]
+        valid = ~np.isnan(d)
+        seen[valid] += 1
+        up, down = np.clip(d, 0, None), np.clip(-d, 0, None)
+        seed = valid & (seen <= period)
+        gain[seed] += (up[seed] - gain[seed]) / seen[seed]
+        loss[seed] += (down[seed] - loss[seed]) / seen[seed]
+        smooth = valid & (seen > period)
+        gain[smooth] = (gain[smooth] * (period - 1) + up[smooth]) / period
+        loss[smooth] = (loss[smooth] * (period - 1) + down[smooth]) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    rsi[seen < period] = np.nan
+    return rsi
+
+
+class IndicatorTable:
+    """
+    📐 Indicator Results for a Symbol Universe
+    ------------------------------------------------------------
+    One structured row per symbol (INDICATOR_DTYPE: price, rsi,
+    macd / signal / hist, Bollinger mid / upper / lower, ma_50,
+    ma_200, bars). Index by symbol, or use the column arrays
+    directly for universe-wide filters.
+    """
+
+    def __init__(self, symbols: Sequence[str], values: np.ndarray):
+        self.symbols = list(symbols)
+        self.values = values
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        """Column array for one indicator (aligned with `symbols`)."""
+        return self.values[field]
+
+    def row(self, symbol: str) -> Dict[str, Optional[float]]:
+        """Indicators for one symbol (NaN → None)."""
+        record = self.values[self._index[symbol]]
+        out = {}
+        for name in self.values.dtype.names:
+            value = record[name].item()
+            out[name] = None if isinstance(value, float) and np.isnan(value) else value
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=pd.Index(self.symbols, name="symbol"))
+
+
+def compute_indicators(close: np.ndarray, symbols: Optional[Sequence[str]] = None,
+                       wilder_rsi: bool = False) -> IndicatorTable:
+    """
+    ⚙️ Vectorized Indicator Engine
+    ------------------------------------------------------------
+    RSI(14), MACD(12/26/9), Bollinger(20, 2σ) and 50/200 moving
+    averages at the latest bar for a (symbols × bars) close matrix
+    (see `close_matrix`). Window statistics read only the trailing
+    columns they need; the three EMAs share a single pass over the
+    bars. Results match the per-symbol pandas calculations.
+    `wilder_rsi` switches RSI to Wilder smoothing (as the streaming
+    state computes it) instead of the 14-bar simple average.
+    """
+    close = np.atleast_2d(np.asarray(close, dtype="f8"))
+    rows = close.shape[0]
+    symbols = list(symbols) if symbols is not None else [str(i) for i in range(rows)]
+    out = np.zeros(rows, dtype=INDICATOR_DTYPE)
+    for name in INDICATOR_DTYPE.names[:-1]:
+        out[name] = np.nan
+    out["bars"] = (~np.isnan(close)).sum(axis=1)
+    if close.shape[1] == 0:
+        return IndicatorTable(symbols, out)
+
+    out["price"] = close[:, -1]
+    out["rsi"] = _rsi_wilder(close, RSI_PERIOD) if wilder_rsi else _rsi(close, RSI_PERIOD)
+
+    macd, signal = _ema_family(close)
+    out["macd"], out["macd_signal"], out["macd_hist"] = macd, signal, macd - signal
+
+    if close.shape[1] >= BB_PERIOD:
+        window = close[:, -BB_PERIOD:]
+        mid = window.mean(axis=1)
+        std = window.std(axis=1, ddof=1)
+        out["bb_mid"] = mid
+        out["bb_upper"] = mid + BB_STDDEV * std
+        out["bb_lower"] = mid - BB_STDDEV * std
+
+    for period in MA_PERIODS:
+        out[f"ma_{period}"] = _window_mean(close, period)
+    return IndicatorTable(symbols, out)
+
+
+def compute_for_frames(frames: Mapping[str, object], bars: Optional[int] = None,
+                       wilder_rsi: bool = False) -> IndicatorTable:
+    """`compute_indicators` over {symbol: OHLCV frame / close series}."""
+    symbols, matrix = close_matrix(frames, bars)
+    return compute_indicators(matrix, symbols, wilder_rsi)
@@ -0,0 +1,184 @@
+import os
+import time
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+
+from utils.logger import log_info, log_error
+from utils.rate_limiter import BudgetExhausted
+
+# Daily call quotas of the keyed providers (override with QUOTA_<PROVIDER>=<calls>).
+# Providers not listed here (yfinance, ...) are treated as unlimited.
+DAILY_QUOTAS: Dict[str, int] = {
+    "alpha_vantage": 25,
+    "newsapi": 100,
+    "finnhub": 1000,
+    "twelvedata": 800,
+}
+
+# Paid sources lose their "primary" slot once this share of the quota is used;
+# the rest is kept for when the free source comes back empty.
+QUOTA_SWITCH_THRESHOLD = float(os.getenv("QUOTA_SWITCH_THRESHOLD", "0.8"))
+# Share of the quota usable up front, before the trading day pacing kicks in
+QUOTA_HEADROOM = float(os.getenv("QUOTA_HEADROOM", "0.1"))
+# Trading session used for pacing, in UTC hours (default: US cash session)
+QUOTA_SESSION_START_UTC = float(os.getenv("QUOTA_SESSION_START_UTC", "13.5"))
+QUOTA_SESSION_END_UTC = float(os.getenv("QUOTA_SESSION_END_UTC", "20"))
+# Counters are written to SharedState at most this often
+QUOTA_FLUSH_SEC = float(os.getenv("QUOTA_FLUSH_SEC", "5"))
+
+_lock = Lock()
+_day: Optional[str] = None
+_used: Dict[str, int] = {}     # today's calls incl. other processes (as of last flush)
+_pending: Dict[str, int] = {}  # calls not yet written to SharedState
+_last_flush = 0.0
+
+
+def daily_quota(provider: str) -> Optional[int]:
+    env = os.getenv(f"QUOTA_{provider.upper()}")
+    if env:
+        return int(env)
+    return DAILY_QUOTAS.get(provider)
+
+
+def _memory():
+    from state.shared_state import SharedState  # imported lazily: state imports utils
+    return SharedState.get_instance()
+
+
+def _today(now: Optional[datetime] = None) -> str:
+    return (now or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+
+
+def _load_day(day: str):
+    """Start a new counting day from whatever other processes already persisted."""
+    global _day, _used, _pending
+    _day, _used, _pending = day, {}, {}
+    try:
+        memory = _memory()
+        for provider in DAILY_QUOTAS:
+            saved = memory.get_global(f"quota:{provider}") or {}
+            if saved.get("date") == day:
+                _used[provider] = int(saved.get("used", 0))
+    except Exception as e:
+        log_error(f"[Quota] Failed to load counters: {e}")
+
+
+def _flush_locked():
+    """Merge pending calls into the persisted counters (adds, so workers don't overwrite each other)."""
+    global _last_flush
+    _last_flush = time.monotonic()
+    if not _pending:
+        return
+    try:
+        memory = _memory()
+        for provider, calls in _pending.items():
+            saved = memory.get_global(f"quota:{provider}") or {}
+            base = int(saved.get("used", 0)) if saved.get("date") == _day else 0
+            _used[provider] = max(_used.get(provider, 0), base + calls)
+            memory.set_global(f"quota:{provider}", {"date": _day, "used": base + calls})
+        _pending.clear()
+    except Exception as e:
+        log_error(f"[Quota] Failed to persist counters: {e}")
+
+
+def _sync_locked():
+    day = _today()
+    if day != _day:
+        if _day is not None:
+            _flush_locked()
+        _load_day(day)
+
+
+def record_call(provider: str, calls: int = 1):
+    """Count an issued upstream call against today's quota."""
+    if daily_quota(provider) is None:
+        return
+    with _lock:
+        _sync_locked()
+        _used[provider] = _used.get(provider, 0) + calls
+        _pending[provider] = _pending.get(provider, 0) + calls
+        if time.monotonic() - _last_flush >= QUOTA_FLUSH_SEC:
+            _flush_locked()
+
+
+def flush():
+    with _lock:
+        _flush_locked()
+
+
+def used_today(provider: str) -> int:
+    with _lock:
+        _sync_locked()
+        return _used.get(provider, 0)
+
+
+def session_progress(now: Optional[datetime] = None) -> float:
+    """0.0 before the session opens → 1.0 after it closes (weekends count as closed all day)."""
+    now = now or datetime.now(timezone.utc)
+    if now.weekday() >= 5:
+        return 1.0
+    hour = now.hour + now.minute / 60 + now.second / 3600
+    span = max(QUOTA_SESSION_END_UTC - QUOTA_SESSION_START_UTC, 1e-6)
+    return min(1.0, max(0.0, (hour - QUOTA_SESSION_START_UTC) / span))
+
+
+def paced_allowance(provider: str, now: Optional[datetime] = None) -> Optional[float]:
+    """Calls the provider may have used by `now` for the quota to last the trading day."""
+    quota = daily_quota(provider)
+    if quota is None:
+        return None
+    return quota * min(1.0, QUOTA_HEADROOM + session_progress(now) * (1.0 - QUOTA_HEADROOM))
+
+
+def is_exhausted(provider: str) -> bool:
+    quota = daily_quota(provider)
+    return quota is not None and used_today(provider) >= quota
+
+
+def check_quota(provider: str):
+    """Raise BudgetExhausted once today's quota is spent (until the UTC day rolls over)."""
+    if is_exhausted(provider):
+        now = datetime.now(timezone.utc)
+        raise BudgetExhausted(provider, 86400 - (now.hour * 3600 + now.minute * 60 + now.second))
+
+
+def within_budget(provider: str, now: Optional[datetime] = None) -> bool:
+    """True while a keyed provider is under both its pace and its switch threshold."""
+    quota = daily_quota(provider)
+    if quota is None:
+        return True
+    used = used_today(provider)
+    return used < paced_allowance(provider, now) and used < quota * QUOTA_SWITCH_THRESHOLD
+
+
+def rank_sources(candidates: Iterable[str], now: Optional[datetime] = None) -> List[str]:
+    """
+    Order data sources for one fetch: keep the caller's preference among
+    sources within budget, demote paid sources that are ahead of pace or
+    past the threshold behind the free ones, and drop exhausted ones.
+    """
+    preferred, demoted = [], []
+    for provider in candidates:
+        if is_exhausted(provider):
+            continue
+        (preferred if within_budget(provider, now) else demoted).append(provider)
+    if demoted:
+        log_info(f"[Quota] Using {demoted} only as fallback (daily budget paced)")
+    return preferred + demoted
+
+
+def quota_snapshot() -> Dict[str, dict]:
+    """Used / quota / paced allowance per keyed provider for today."""
+    with _lock:
+        _sync_locked()
+        used = dict(_used)
+    return {
+        provider: {
+            "date": _day,
+            "used": used.get(provider, 0),
+            "quota": daily_quota(provider),
+            "paced_allowance": round(paced_allowance(provider), 1),
+        }
+        for provider in DAILY_QUOTAS
+    }
@@ -0,0 +1,254 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Condition, Lock
+from typing import Dict, Optional, Tuple
+
+from utils.logger import log_info
+
+# Request priorities (lower value is served first)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Per-provider token buckets: (burst capacity, calls per period, period seconds).
+# Override with RATE_LIMIT_<PROVIDER>="calls/seconds", e.g. RATE_LIMIT_ALPHA_VANTAGE=5/60
+PROVIDER_RATES: Dict[str, Tuple[int, int, float]] = {
+    "alpha_vantage": (5, 5, 60.0),
+    "finnhub": (30, 60, 60.0),
+    "twelvedata": (8, 8, 60.0),
+    "newsapi": (10, 30, 60.0),
+    "fred": (20, 120, 60.0),
+    "iex": (50, 100, 1.0),
+    "bing": (3, 3, 1.0),
+}
+
+# How long a caller may wait for a token before getting a fast "use fallback" answer
+INTERACTIVE_MAX_WAIT_SEC = float(os.getenv("RATE_LIMIT_INTERACTIVE_WAIT_SEC", "2"))
+BACKGROUND_MAX_WAIT_SEC = float(os.getenv("RATE_LIMIT_BACKGROUND_WAIT_SEC", "30"))
+# Share of each bucket that background work may not touch
+INTERACTIVE_RESERVE = float(os.getenv("RATE_LIMIT_INTERACTIVE_RESERVE", "0.2"))
+
+_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+
+class BudgetExhausted(Exception):
+    """No token within the caller's wait budget: skip the call and use a fallback."""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} rate budget exhausted (next token in {retry_after:.1f}s)")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+@contextmanager
+def priority_scope(priority: int):
+    """Run provider calls inside the block at `priority` (e.g. BACKGROUND refreshes)."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+class TokenBucket:
+    """
+    🪣 Token Bucket with Priority Waiters
+    ------------------------------------------------------------
+    Refills `rate` tokens per second up to `capacity`. Waiters are
+    served strictly by (priority, arrival); background callers may
+    not dip into the interactive reserve.
+    """
+
+    def __init__(self, name: str, capacity: int, rate: float, reserve: float = INTERACTIVE_RESERVE):
+        self.name = name
+        self.capacity = float(capacity)
+        self.rate = rate
+        self.reserve = self.capacity * reserve
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._cond = Condition(Lock())
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._stats = {"granted": 0, "denied": 0, "waited": 0}
+
+    # --------------------------------------------------------
+    # Internals (call with the condition held)
+    # --------------------------------------------------------
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _floor(self, priority: int) -> float:
+        return self.reserve if priority > INTERACTIVE else 0.0
+
+    def _wait_time(self, priority: int, now: float) -> float:
+        """Seconds until a token above this priority's floor is available."""
+        needed = 1.0 + self._floor(priority) - self._tokens
+        wait = max(0.0, needed / self.rate) if needed > 0 else 0.0
+        return max(wait, self._blocked_until - now)
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+    def try_acquire(self, priority: int = INTERACTIVE, waited: bool = False) -> float:
+        """Take a token now if nobody is queued; else return the wait estimate (0.0 = granted)."""
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._wait_time(priority, now)
+            if wait == 0.0 and not self._waiters:
+                self._tokens -= 1
+                self._stats["granted"] += 1
+                if waited:
+                    self._stats["waited"] += 1
+                return 0.0
+            return max(wait, 1e-3)
+
+    def deny(self, wait: float) -> BudgetExhausted:
+        """Count a denial made outside `acquire` (async waiters); returns the error to raise."""
+        with self._cond:
+            self._stats["denied"] += 1
+        return BudgetExhausted(self.name, wait)
+
+    def acquire(self, priority: int = INTERACTIVE, max_wait: Optional[float] = None):
+        """Block up to `max_wait` for a token; raise BudgetExhausted instead of waiting longer."""
+        if max_wait is None:
+            max_wait = INTERACTIVE_MAX_WAIT_SEC if priority <= INTERACTIVE else BACKGROUND_MAX_WAIT_SEC
+
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._wait_time(priority, now)
+            if wait == 0.0 and not self._waiters:
+                self._tokens -= 1
+                self._stats["granted"] += 1
+                return
+            if wait > max_wait:
+                self._stats["denied"] += 1
+                raise BudgetExhausted(self.name, wait)
+
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+            deadline = now + max_wait
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._wait_time(priority, now)
+                    if self._waiters[0] == ticket and wait == 0.0:
+                        self._tokens -= 1
+                        self._stats["granted"] += 1
+                        self._stats["waited"] += 1
+                        return
+                    if now + wait > deadline:
+                        self._stats["denied"] += 1
+                        raise BudgetExhausted(self.name, wait)
+                    self._cond.wait(timeout=max(min(wait, deadline - now), 1e-3))
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def block_for(self, seconds: float):
+        """Provider told us to back off (403 / 429 / quota note): deny until then."""
+        with self._cond:
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+            self._blocked_until = max(self._blocked_until, self._updated + seconds)
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "capacity": self.capacity,
+                "tokens": round(self._tokens, 2),
+                "rate_per_min": round(self.rate * 60, 2),
+                "queued": len(self._waiters),
+                "blocked_for_sec": round(max(0.0, self._blocked_until - now), 1),
+                **self._stats,
+            }
+
+
+# --------------------------------------------------------
+# Registry (one bucket per provider)
+# --------------------------------------------------------
+_buckets: Dict[str, TokenBucket] = {}
+_registry_lock = Lock()
+
+
+def _rate_for(provider: str) -> Optional[Tuple[int, float]]:
+    env = os.getenv(f"RATE_LIMIT_{provider.upper()}")
+    if env:
+        calls, _, seconds = env.partition("/")
+        calls, seconds = int(calls), float(seconds or 60)
+        return calls, calls / seconds
+    if provider not in PROVIDER_RATES:
+        return None
+    capacity, calls, seconds = PROVIDER_RATES[provider]
+    return capacity, calls / seconds
+
+
+def get_bucket(provider: str) -> Optional[TokenBucket]:
+    """Bucket for `provider` (each is used with one configured key); None without a configured limit."""
+    with _registry_lock:
+        bucket = _buckets.get(provider)
+        if bucket is None:
+            rate = _rate_for(provider)
+            if rate is None:
+                return None
+            bucket = _buckets[provider] = TokenBucket(provider, *rate)
+        return bucket
+
+
+def acquire(provider: str, priority: Optional[int] = None, max_wait: Optional[float] = None):
+    """Take one call from the provider's budget or raise BudgetExhausted."""
+    bucket = get_bucket(provider)
+    if bucket is not None:
+        bucket.acquire(current_priority() if priority is None else priority, max_wait)
+
+
+async def acquire_async(provider: str, priority: Optional[int] = None, max_wait: Optional[float] = None):
+    """Async `acquire`: sleeps on the event loop instead of blocking a thread."""
+    bucket = get_bucket(provider)
+    if bucket is None:
+        return
+    priority = current_priority() if priority is None else priority
+    if max_wait is None:
+        max_wait = INTERACTIVE_MAX_WAIT_SEC if priority <= INTERACTIVE else BACKGROUND_MAX_WAIT_SEC
+    deadline = time.monotonic() + max_wait
+    waited = False
+    while True:
+        wait = bucket.try_acquire(priority, waited)
+        if wait == 0.0:
+            return
+        if time.monotonic() + wait > deadline:
+            raise bucket.deny(wait)
+        await asyncio.sleep(wait)
+        waited = True
+
+
+def penalize(provider: str, seconds: float = 60.0):
+    """Stop issuing calls to `provider` for `seconds` after it signalled a limit."""
+    bucket = get_bucket(provider)
+    if bucket is not None:
+        bucket.block_for(seconds)
+        log_info(f"[RateLimiter] ⏸️ {provider} paused for {seconds:.0f}s after a limit response")
+
+
+def budget_snapshot() -> Dict[str, dict]:
+    """Current tokens, queue length and granted / denied / waited counts per bucket."""
+    with _registry_lock:
+        buckets = dict(_buckets)
+    return {name: bucket.snapshot() for name, bucket in buckets.items()}
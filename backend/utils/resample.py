@@ -0,0 +1,117 @@
+import re
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.bar_store import BAR_DTYPE, bar_store, bars_to_frame, period_to_timedelta
+
+# Timeframes derived from finer stored bars, with their length in days (for source lookbacks)
+RESAMPLE_RULES = {"1d": 1, "1wk": 7, "1mo": 31}
+# Finest stored interval each timeframe is usually built from
+DEFAULT_SOURCE = {"1d": "1h", "1wk": "1d", "1mo": "1d"}
+# Intervals never downloaded on their own: always derived from stored daily bars
+RESAMPLED_INTERVALS = ("1wk", "1mo")
+
+DAY_NS = 86_400 * 10 ** 9
+_INTRADAY_RE = re.compile(r"^\d+(m|h)$")
+
+
+def _day_numbers(ts: np.ndarray, intraday: bool) -> np.ndarray:
+    """
+    Trading day of each bar as days since epoch. Intraday sessions of
+    the major exchanges fall inside one UTC day, so they are floored;
+    daily bars are stamped at exchange-local midnight (e.g. 15:00 UTC
+    the day before for Tokyo), so they are rounded to the nearest day.
+    """
+    return (ts if intraday else ts + DAY_NS // 2) // DAY_NS
+
+
+def bucket_ids(ts: np.ndarray, rule: str, intraday: bool = False) -> np.ndarray:
+    """Period id of each bar for `rule` (epoch day number of the day / its Monday, or month number)."""
+    days = _day_numbers(np.asarray(ts, dtype="i8"), intraday)
+    if rule == "1d":
+        return days
+    if rule == "1wk":
+        return days - (days + 3) % 7  # 1970-01-01 was a Thursday
+    if rule == "1mo":
+        return days.astype("M8[D]").astype("M8[M]").astype("i8")
+    raise ValueError(f"Unsupported resample rule: {rule}")
+
+
+def resample_many(bars: Mapping[str, np.ndarray], rule: str,
+                  intraday: bool = False) -> Dict[str, np.ndarray]:
+    """
+    📆 Vectorized OHLCV Resampling
+    ------------------------------------------------------------
+    {symbol: structured bars} → {symbol: coarser bars} in one pass
+    over every symbol's bars concatenated:
+
+      open   → first bar's open      high   → max of highs
+      close  → last bar's close      low    → min of lows
+      volume → sum of volumes        ts     → first bar's timestamp
+
+    `intraday` tells how to assign source bars to trading days
+    (see `_day_numbers`). Inputs must be sorted by time.
+    """
+    symbols = list(bars)
+    if not symbols:
+        return {}
+    arrays = [np.asarray(bars[s]) for s in symbols]
+    sizes = np.array([len(a) for a in arrays])
+    flat = np.concatenate(arrays) if sizes.sum() else np.empty(0, dtype=BAR_DTYPE)
+    if not len(flat):
+        return {s: np.empty(0, dtype=BAR_DTYPE) for s in symbols}
+
+    owner = np.repeat(np.arange(len(symbols)), sizes)
+    bucket = bucket_ids(flat["ts"], rule, intraday)
+    boundary = np.empty(len(flat), dtype=bool)
+    boundary[0] = True
+    boundary[1:] = (owner[1:] != owner[:-1]) | (bucket[1:] != bucket[:-1])
+    starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:], len(flat)) - 1
+
+    out = np.empty(len(starts), dtype=BAR_DTYPE)
+    out["ts"] = flat["ts"][starts]
+    out["open"] = flat["open"][starts]
+    out["close"] = flat["close"][ends]
+    out["high"] = np.fmax.reduceat(flat["high"], starts)
+    out["low"] = np.fmin.reduceat(flat["low"], starts)
+    out["volume"] = np.add.reduceat(np.nan_to_num(flat["volume"]), starts)
+
+    counts = np.bincount(owner[starts], minlength=len(symbols))
+    return dict(zip(symbols, np.split(out, np.cumsum(counts)[:-1])))
+
+
+def resample(bars: np.ndarray, rule: str, intraday: bool = False) -> np.ndarray:
+    """`resample_many` for one symbol."""
+    return resample_many({"_": bars}, rule, intraday)["_"]
+
+
+def period_buckets(period: str, rule: str) -> Optional[int]:
+    """How many `rule` buckets a yfinance-style period spans ("1wk" of "1wk" → 1); None = all."""
+    unit = {"1d": "d", "1wk": "wk", "1mo": "mo"}[rule]
+    match = re.match(rf"^(\d+){unit}$", period)
+    if match:
+        return int(match.group(1))
+    lookback = period_to_timedelta(period)
+    return None if lookback is None else max(1, int(np.ceil(lookback.days / RESAMPLE_RULES[rule])))
+
+
+def get_resampled(symbols: Iterable[str], rule: str, period: str = "1y", source: Optional[str] = None,
+                  max_age: Optional[float] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Coarser OHLCV frames for a universe, built from stored `source`
+    bars (one bulk refresh of stale symbols, no per-timeframe
+    download). The last `period` worth of buckets is returned; the
+    newest one is the period to date (e.g. this week so far).
+    """
+    source = source or DEFAULT_SOURCE[rule]
+    buckets = period_buckets(period, rule)
+    # One extra bucket of source history so the oldest returned bucket is complete
+    source_period = "max" if buckets is None else f"{(buckets + 1) * RESAMPLE_RULES[rule]}d"
+    symbols = bar_store.refresh_many(symbols, source, source_period, max_age)
+
+    stored = {s: bar_store.load(s, source) for s in symbols}
+    coarse = resample_many(stored, rule, intraday=bool(_INTRADAY_RE.match(source)))
+    return {s: bars_to_frame(b if buckets is None else b[-buckets:]) for s, b in coarse.items()}
@@ -0,0 +1,213 @@
+import os
+from statistics import NormalDist
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import close_matrix
+
+TRADING_DAYS = 252
+RISK_FREE_RATE = float(os.getenv("RISK_FREE_RATE", "0.03"))
+VAR_CONFIDENCE = float(os.getenv("VAR_CONFIDENCE", "0.95"))
+# Fewer prices than this give NaN metrics (as the old per-symbol helpers returned 0.0)
+MIN_OBSERVATIONS = 30
+
+RISK_DTYPE = np.dtype([
+    ("annual_return", "f8"),
+    ("volatility", "f8"),
+    ("sharpe_ratio", "f8"),
+    ("sortino_ratio", "f8"),
+    ("max_drawdown", "f8"),
+    ("drawdown_duration", "i8"),
+    ("var_historical", "f8"),
+    ("cvar_historical", "f8"),
+    ("var_parametric", "f8"),
+    ("cvar_parametric", "f8"),
+    ("observations", "i8"),
+])
+
+
+class RiskTable:
+    """
+    ⚖️ Risk Metrics for a Symbol Universe
+    ------------------------------------------------------------
+    One structured row per symbol (RISK_DTYPE). Returns are daily
+    log returns; volatility / Sharpe / Sortino / return are
+    annualized, drawdown is a fraction of the peak with its
+    longest underwater stretch in bars, and VaR / CVaR are one-day
+    losses (positive numbers) at `confidence`.
+    """
+
+    def __init__(self, symbols: Sequence[str], values: np.ndarray, confidence: float):
+        self.symbols = list(symbols)
+        self.values = values
+        self.confidence = confidence
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.values[field]
+
+    def row(self, symbol: str) -> Dict[str, Optional[float]]:
+        """Metrics for one symbol (NaN → None)."""
+        record = self.values[self._index[symbol]]
+        out = {}
+        for name in RISK_DTYPE.names:
+            value = record[name].item()
+            out[name] = None if isinstance(value, float) and np.isnan(value) else value
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=pd.Index(self.symbols, name="symbol"))
+
+
+def log_returns(close: np.ndarray) -> np.ndarray:
+    """Daily log returns of a (symbols × bars) close matrix (NaN where either close is missing)."""
+    close = np.atleast_2d(np.asarray(close, dtype="f8"))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.log(np.where(close > 0, close, np.nan))
+    return np.diff(logs, axis=1)
+
+
+def _drawdowns(close: np.ndarray):
+    """Maximum drawdown (fraction of peak) and longest run of bars below a prior peak, per row."""
+    peak = np.fmax.accumulate(close, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = close / peak - 1.0
+    worst = -np.nanmin(np.where(np.isnan(drawdown), 0.0, drawdown), axis=1)
+
+    underwater = drawdown < 0
+    bars = np.arange(close.shape[1])
+    last_high = np.maximum.accumulate(np.where(underwater, -1, bars), axis=1)
+    duration = np.where(underwater, bars - last_high, 0).max(axis=1, initial=0)
+    return worst, duration
+
+
+def compute_risk(close: np.ndarray, symbols: Optional[Sequence[str]] = None,
+                 risk_free_rate: float = RISK_FREE_RATE, confidence: float = VAR_CONFIDENCE) -> RiskTable:
+    """
+    📉 Vectorized Risk Engine
+    ------------------------------------------------------------
+    Volatility, Sharpe and Sortino ratios, maximum drawdown and
+    its duration, and historical / parametric (normal) VaR and
+    CVaR for a (symbols × bars) close matrix (see `close_matrix`).
+    Log returns are computed once and every metric is a column
+    reduction over that matrix, so all symbols go through together.
+    """
+    close = np.atleast_2d(np.asarray(close, dtype="f8"))
+    rows = close.shape[0]
+    symbols = list(symbols) if symbols is not None else [str(i) for i in range(rows)]
+    out = np.zeros(rows, dtype=RISK_DTYPE)
+    for name in RISK_DTYPE.names:
+        if RISK_DTYPE[name].kind == "f":
+            out[name] = np.nan
+
+    returns = log_returns(close) if close.shape[1] > 1 else np.empty((rows, 0))
+    valid = ~np.isnan(returns)
+    n = valid.sum(axis=1)
+    out["observations"] = n
+    ok = n + 1 >= MIN_OBSERVATIONS
+    if not ok.any():
+        return RiskTable(symbols, out, confidence)
+
+    r, n = returns[ok], n[ok]
+    zeroed = np.where(valid[ok], r, 0.0)
+    mu = zeroed.sum(axis=1) / n
+    centered = np.where(valid[ok], r - mu[:, None], 0.0)
+    sigma = np.sqrt((centered ** 2).sum(axis=1) / (n - 1))
+
+    rf_daily = risk_free_rate / TRADING_DAYS
+    shortfall = np.where(valid[ok], np.minimum(r - rf_daily, 0.0), 0.0)
+    downside = np.sqrt((shortfall ** 2).sum(axis=1) / n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["sharpe_ratio"][ok] = (mu - rf_daily) / sigma * np.sqrt(TRADING_DAYS)
+        out["sortino_ratio"][ok] = (mu - rf_daily) / downside * np.sqrt(TRADING_DAYS)
+    out["annual_return"][ok] = mu * TRADING_DAYS
+    out["volatility"][ok] = sigma * np.sqrt(TRADING_DAYS)
+
+    worst, duration = _drawdowns(close[ok])
+    out["max_drawdown"][ok] = worst
+    out["drawdown_duration"][ok] = duration
+
+    # Historical: empirical (1 - confidence) quantile and the mean of the tail beyond it
+    # (np.nanquantile is ~10x slower than np.quantile; only padded rows need it)
+    complete = valid[ok].all(axis=1)
+    q = np.empty(len(r))
+    q[complete] = np.quantile(r[complete], 1.0 - confidence, axis=1)
+    if not complete.all():
+        q[~complete] = np.nanquantile(r[~complete], 1.0 - confidence, axis=1)
+    tail = valid[ok] & (r <= q[:, None])
+    out["var_historical"][ok] = -q
+    out["cvar_historical"][ok] = -np.where(tail, r, 0.0).sum(axis=1) / np.maximum(tail.sum(axis=1), 1)
+
+    # Parametric: normal returns with the sample mean / deviation
+    z = NormalDist().inv_cdf(confidence)
+    out["var_parametric"][ok] = -(mu - z * sigma)
+    out["cvar_parametric"][ok] = -(mu - sigma * NormalDist().pdf(z) / (1.0 - confidence))
+    return RiskTable(symbols, out, confidence)
+
+
+def compute_risk_for_frames(frames: Mapping[str, object], bars: Optional[int] = None,
+                            **kwargs) -> RiskTable:
+    """`compute_risk` over {symbol: OHLCV frame / close series}."""
+    symbols, matrix = close_matrix(frames, bars)
+    return compute_risk(matrix, symbols, **kwargs)
+
+
+MARKET_DTYPE = np.dtype([
+    ("beta", "f8"),
+    ("alpha", "f8"),
+    ("correlation", "f8"),
+    ("r_squared", "f8"),
+    ("observations", "i8"),
+])
+
+
+def compute_market_stats(returns: np.ndarray, benchmark: np.ndarray,
+                         risk_free_rate: float = RISK_FREE_RATE) -> np.ndarray:
+    """
+    📈 Beta / Alpha / Correlation vs. a Benchmark
+    ------------------------------------------------------------
+    OLS of each row of a (symbols × days) log-return matrix on the
+    benchmark's returns for the same days, using only days where
+    both are known. Alpha is Jensen's alpha, annualized. Returns a
+    MARKET_DTYPE row per symbol (NaN below MIN_OBSERVATIONS).
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype="f8"))
+    benchmark = np.broadcast_to(np.asarray(benchmark, dtype="f8"), returns.shape)
+    out = np.zeros(len(returns), dtype=MARKET_DTYPE)
+    for name in ("beta", "alpha", "correlation", "r_squared"):
+        out[name] = np.nan
+
+    both = ~np.isnan(returns) & ~np.isnan(benchmark)
+    n = both.sum(axis=1)
+    out["observations"] = n
+    ok = n + 1 >= MIN_OBSERVATIONS
+    if not ok.any():
+        return out
+
+    a = np.where(both, returns, 0.0)[ok]
+    b = np.where(both, benchmark, 0.0)[ok]
+    mask, n = both[ok], n[ok]
+    mean_a, mean_b = a.sum(axis=1) / n, b.sum(axis=1) / n
+    da = np.where(mask, a - mean_a[:, None], 0.0)
+    db = np.where(mask, b - mean_b[:, None], 0.0)
+    cov = (da * db).sum(axis=1) / (n - 1)
+    var_a = (da ** 2).sum(axis=1) / (n - 1)
+    var_b = (db ** 2).sum(axis=1) / (n - 1)
+
+    rf_daily = risk_free_rate / TRADING_DAYS
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = cov / var_b
+        corr = cov / np.sqrt(var_a * var_b)
+    out["beta"][ok] = beta
+    out["correlation"][ok] = corr
+    out["r_squared"][ok] = corr ** 2
+    out["alpha"][ok] = ((mean_a - rf_daily) - beta * (mean_b - rf_daily)) * TRADING_DAYS
+    return out
@@ -0,0 +1,167 @@
+import math
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.schemas import ScanMatch
+from utils.bar_store import bar_store
+from utils.indicators import (
+    INDICATOR_DTYPE,
+    MA_PERIODS,
+    IndicatorTable,
+    close_matrix,
+    compute_indicators,
+    moving_average,
+)
+from utils.logger import log_info
+from utils.rate_limiter import BACKGROUND, priority_scope
+
+# Symbols scanned when none are given (override with SCAN_UNIVERSE="AAPL,MSFT,..." or SCAN_UNIVERSE_FILE)
+DEFAULT_UNIVERSE = [
+    "AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META", "TSLA", "AVGO", "BRK-B", "JPM",
+    "V", "MA", "UNH", "XOM", "JNJ", "PG", "HD", "COST", "ABBV", "MRK",
+    "NFLX", "AMD", "CRM", "ADBE", "ORCL", "INTC", "CSCO", "PEP", "KO", "WMT",
+    "DIS", "BAC", "WFC", "CVX", "PFE", "T", "VZ", "NKE", "BA", "CAT",
+    "F", "GM", "PLTR", "SOFI", "UBER", "SHOP", "BABA", "PYPL", "QCOM", "IBM",
+]
+# Trailing daily bars read per symbol: enough for MA-200 and fully converged EMAs
+SCAN_BARS = int(os.getenv("SCAN_BARS", "300"))
+# History refreshed per symbol: whole years holding SCAN_BARS trading days (~250 a year, less holidays)
+SCAN_PERIOD = f"{max(1, math.ceil(SCAN_BARS / 245))}y"
+SCAN_MAX_RESULTS = int(os.getenv("SCAN_MAX_RESULTS", "20"))
+SCAN_REFRESH_SEC = float(os.getenv("SCAN_REFRESH_SEC", "900"))
+
+Condition = Callable[[IndicatorTable], Tuple[np.ndarray, np.ndarray]]
+
+# Scan rows also carry the moving averages one bar back, so crosses can be told from trends
+SCAN_DTYPE = np.dtype(INDICATOR_DTYPE.descr + [(f"ma_{p}_prev", "f8") for p in MA_PERIODS])
+
+
+def _pct(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """a as a percentage of b."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return a / np.abs(b) * 100
+
+
+# name → (description, table → (match mask, score)). Scores are in comparable units
+# (RSI points or percent of price past the threshold); larger ranks first.
+CONDITIONS: Dict[str, Tuple[str, Condition]] = {
+    "oversold": ("RSI(14) < 30", lambda t: (t["rsi"] < 30, 30 - t["rsi"])),
+    "overbought": ("RSI(14) > 70", lambda t: (t["rsi"] > 70, t["rsi"] - 70)),
+    "macd_bullish": ("MACD above signal", lambda t: (t["macd_hist"] > 0, _pct(t["macd_hist"], t["price"]))),
+    "macd_bearish": ("MACD below signal", lambda t: (t["macd_hist"] < 0, _pct(-t["macd_hist"], t["price"]))),
+    "golden_cross": ("50MA crossed above 200MA on the latest bar",
+                     lambda t: ((t["ma_50"] > t["ma_200"]) & (t["ma_50_prev"] <= t["ma_200_prev"]),
+                                _pct(t["ma_50"] - t["ma_200"], t["ma_200"]))),
+    "death_cross": ("50MA crossed below 200MA on the latest bar",
+                    lambda t: ((t["ma_50"] < t["ma_200"]) & (t["ma_50_prev"] >= t["ma_200_prev"]),
+                               _pct(t["ma_200"] - t["ma_50"], t["ma_200"]))),
+    "ma50_above_ma200": ("50MA > 200MA", lambda t: (t["ma_50"] > t["ma_200"], _pct(t["ma_50"] - t["ma_200"], t["ma_200"]))),
+    "ma50_below_ma200": ("50MA < 200MA", lambda t: (t["ma_50"] < t["ma_200"], _pct(t["ma_200"] - t["ma_50"], t["ma_200"]))),
+    "below_lower_band": ("Price below lower Bollinger band",
+                         lambda t: (t["price"] < t["bb_lower"], _pct(t["bb_lower"] - t["price"], t["price"]))),
+    "above_upper_band": ("Price above upper Bollinger band",
+                         lambda t: (t["price"] > t["bb_upper"], _pct(t["price"] - t["bb_upper"], t["price"]))),
+}
+
+# Phrases that select a condition from a chat query
+CONDITION_KEYWORDS = {
+    "oversold": ["oversold", "rsi below 30", "rsi under 30"],
+    "overbought": ["overbought", "rsi above 70", "rsi over 70"],
+    "macd_bullish": ["bullish macd", "macd bullish", "macd crossover", "bullish momentum"],
+    "macd_bearish": ["bearish macd", "macd bearish", "bearish momentum"],
+    "golden_cross": ["golden cross"],
+    "death_cross": ["death cross"],
+    "ma50_above_ma200": ["50ma above 200ma", "50 day above 200 day", "above the 200 day"],
+    "ma50_below_ma200": ["50ma below 200ma", "50 day below 200 day", "below the 200 day"],
+    "below_lower_band": ["below the lower band", "below lower band", "below bollinger", "lower bollinger"],
+    "above_upper_band": ["above the upper band", "above upper band", "above bollinger", "upper bollinger"],
+}
+
+
+def scan_universe() -> List[str]:
+    """Configured scan universe (SCAN_UNIVERSE list, else SCAN_UNIVERSE_FILE, else the defaults)."""
+    listed = os.getenv("SCAN_UNIVERSE")
+    if listed:
+        return [s.strip().upper() for s in listed.split(",") if s.strip()]
+    path = os.getenv("SCAN_UNIVERSE_FILE")
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip().upper() for line in f if line.strip() and not line.startswith("#")]
+    return list(DEFAULT_UNIVERSE)
+
+
+def conditions_from_text(text: str) -> List[str]:
+    """Scan conditions mentioned in a free-text query (in CONDITIONS order)."""
+    lowered = (text or "").lower()
+    return [name for name, phrases in CONDITION_KEYWORDS.items() if any(p in lowered for p in phrases)]
+
+
+def load_indicators(symbols: Sequence[str], refresh: bool = True,
+                    max_age: Optional[float] = None) -> IndicatorTable:
+    """
+    Indicators for every symbol from its stored daily bars (stale
+    symbols refreshed in bulk first), plus the previous bar's MAs.
+    """
+    symbols = list(dict.fromkeys(s.upper().strip() for s in symbols))
+    if refresh:
+        bar_store.refresh_many(symbols, "1d", SCAN_PERIOD, SCAN_REFRESH_SEC if max_age is None else max_age)
+    closes = {s: bar_store.load(s, "1d")["close"] for s in symbols}
+    names, matrix = close_matrix(closes, SCAN_BARS)
+    table = compute_indicators(matrix, names, wilder_rsi=True)
+    values = np.zeros(len(names), dtype=SCAN_DTYPE)
+    for name in INDICATOR_DTYPE.names:
+        values[name] = table.values[name]
+    for period in MA_PERIODS:
+        values[f"ma_{period}_prev"] = moving_average(matrix, period, lag=1)
+    return IndicatorTable(names, values)
+
+
+def scan(conditions: Iterable[str], symbols: Optional[Sequence[str]] = None,
+         limit: int = SCAN_MAX_RESULTS, refresh: bool = True,
+         max_age: Optional[float] = None) -> List[ScanMatch]:
+    """
+    🔭 Universe-Wide Technical Scan
+    ------------------------------------------------------------
+    Evaluates every condition (all must hold) over the whole
+    universe's indicator table at once and returns the best
+    `limit` matches, ranked by the summed condition scores
+    (how far past each threshold a symbol is).
+    """
+    conditions = list(dict.fromkeys(conditions))
+    unknown = [c for c in conditions if c not in CONDITIONS]
+    if unknown or not conditions:
+        raise ValueError(f"Unknown scan condition(s): {unknown or 'none given'}; "
+                         f"expected any of {sorted(CONDITIONS)}")
+
+    started = time.perf_counter()
+    with priority_scope(BACKGROUND):
+        table = load_indicators(symbols or scan_universe(), refresh, max_age)
+    if not len(table):
+        return []
+
+    matched = np.ones(len(table), dtype=bool)  # NaN indicators (short histories) never match
+    score = np.zeros(len(table))
+    for name in conditions:
+        mask, points = CONDITIONS[name][1](table)
+        matched &= mask
+        score += np.nan_to_num(points)
+
+    hits = np.flatnonzero(matched)
+    if 0 < limit < len(hits):
+        hits = hits[np.argpartition(-score[hits], limit - 1)[:limit]]
+    hits = hits[np.argsort(-score[hits], kind="stable")]
+
+    results = []
+    for i in hits:
+        row = {k: (None if v is None else round(v, 2)) for k, v in table.row(table.symbols[i]).items()}
+        results.append(ScanMatch(
+            symbol=table.symbols[i], score=round(float(score[i]), 4), conditions=conditions,
+            price=row["price"], rsi=row["rsi"], macd_val=row["macd"], macd_signal=row["macd_signal"],
+            ma_50=row["ma_50"], ma_200=row["ma_200"], bb_upper=row["bb_upper"], bb_lower=row["bb_lower"],
+        ))
+    log_info(f"[Scanner] {len(table)} symbols, {int(matched.sum())} matches for {conditions} "
+             f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return results
@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import json
+from collections import defaultdict
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+Key = Tuple[str, str, str]
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+_inflight: Dict[Key, _Call] = {}
+_lock = Lock()
+# Async calls are coalesced per event loop (futures are bound to their loop)
+_async_inflight: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Key, asyncio.Future]]" = WeakKeyDictionary()
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"issued": 0, "coalesced": 0, "errors": 0})
+
+
+def flight_key(provider: str, endpoint: str, params: Any = None) -> Key:
+    """(provider, endpoint, digest of params); params may be any JSON-like value."""
+    blob = json.dumps(params, sort_keys=True, default=str) if params is not None else ""
+    return provider, endpoint, hashlib.sha1(blob.encode()).hexdigest()
+
+
+def single_flight(provider: str, endpoint: str, params: Any, fn: Callable[[], Any]) -> Any:
+    """
+    🛫 Request Coalescing
+    ------------------------------------------------------------
+    Runs `fn()` once for concurrent callers with the same
+    (provider, endpoint, params); the others block on the in-flight
+    call and get its result (or its exception). Nothing is cached
+    once the call finishes.
+    """
+    key = flight_key(provider, endpoint, params)
+    with _lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _Call()
+            _stats[provider]["issued"] += 1
+        else:
+            _stats[provider]["coalesced"] += 1
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = fn()
+        return call.result
+    except BaseException as e:
+        call.error = e
+        with _lock:
+            _stats[provider]["errors"] += 1
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+        call.done.set()
+
+
+async def single_flight_async(provider: str, endpoint: str, params: Any,
+                              fn: Callable[[], Awaitable[Any]]) -> Any:
+    """Async `single_flight`: followers await the leader's future on the same loop."""
+    key = flight_key(provider, endpoint, params)
+    loop = asyncio.get_running_loop()
+    inflight = _async_inflight.setdefault(loop, {})
+    future = inflight.get(key)
+    if future is not None:
+        with _lock:
+            _stats[provider]["coalesced"] += 1
+        return await asyncio.shield(future)
+
+    future = inflight[key] = loop.create_future()
+    with _lock:
+        _stats[provider]["issued"] += 1
+    try:
+        result = await fn()
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved when nobody else was waiting
+        with _lock:
+            _stats[provider]["errors"] += 1
+        raise
+    finally:
+        inflight.pop(key, None)
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Issued vs coalesced call counts per provider."""
+    with _lock:
+        stats = {provider: dict(counts) for provider, counts in _stats.items()}
+        in_flight = len(_inflight)
+    for counts in stats.values():
+        total = counts["issued"] + counts["coalesced"]
+        counts["coalesced_ratio"] = round(counts["coalesced"] / total, 3) if total else 0.0
+    return {"providers": stats, "in_flight": in_flight}